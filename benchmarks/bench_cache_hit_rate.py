@@ -0,0 +1,145 @@
+# MODULO: bench_cache_hit_rate.py
+"""
+Informe de tasa de aciertos de la caché de resultados.
+
+Reproduce una carga de trabajo (el historial guardado en ``history_results``
+o una carga sintética) sobre dos cachés de igual capacidad: una con claves
+conmutativas normalizadas y otra sin normalizar. Muestra aciertos, fallos,
+desalojos y cuántas claves distintas necesita cada una (la capacidad que
+haría falta para no desalojar nunca), para medir cuánta capacidad libera la
+normalización de ``a+b`` / ``b+a`` y ``a*b`` / ``b*a``.
+
+Uso::
+
+    python benchmarks/bench_cache_hit_rate.py               # historial
+    python benchmarks/bench_cache_hit_rate.py --synthetic 100000
+"""
+import argparse
+import random
+import sys
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.calculator import Calculator  # noqa: E402
+from core.result_cache import ResultCache, cached_operation  # noqa: E402
+
+Workload = List[Tuple[str, Decimal, Decimal]]
+
+OPERATION_NAMES = {
+    "+": "add",
+    "-": "subtract",
+    "*": "multiply",
+    "/": "divide",
+    "%": "percent",
+}
+
+
+def history_workload(limit: int) -> Workload:
+    """
+    Lee las ecuaciones del historial en orden cronológico.
+
+    Las ecuaciones se guardan como ``"<valor_1> <operador> <valor_2>"``.
+
+    :param limit: Número máximo de registros a leer.
+    :type limit: int
+    :returns: Lista de operaciones ``(operador, valor_1, valor_2)``.
+    :rtype: Workload
+    """
+    from database.history_manager_db import HistoryManager
+
+    workload: Workload = []
+    records = HistoryManager().get_last_records(limit) or []
+    for record in reversed(records):
+        parts = record.equation.split(" ")
+        if len(parts) != 3 or parts[1] not in OPERATION_NAMES:
+            continue
+        try:
+            workload.append((parts[1], Decimal(parts[0]), Decimal(parts[2])))
+        except InvalidOperation:
+            continue
+    return workload
+
+
+def synthetic_workload(count: int, seed: int = 3) -> Workload:
+    """
+    Genera una carga con operandos repetidos en ambos órdenes.
+
+    :param count: Número de operaciones.
+    :type count: int
+    :param seed: Semilla del generador aleatorio.
+    :type seed: int
+    :returns: Lista de operaciones ``(operador, valor_1, valor_2)``.
+    :rtype: Workload
+    """
+    rnd = random.Random(seed)
+    pool = [Decimal(rnd.randint(1, 2000)).scaleb(-rnd.choice((0, 1, 2)))
+            for _ in range(60)]
+    workload: Workload = []
+    for _ in range(count):
+        value_1, value_2 = rnd.choice(pool), rnd.choice(pool)
+        if rnd.random() < 0.5:
+            value_1, value_2 = value_2, value_1
+        workload.append((rnd.choice("++**-/%"), value_1, value_2))
+    return workload
+
+
+def replay(workload: Workload, cache: ResultCache) -> None:
+    """
+    Ejecuta la carga con las operaciones de Calculator sobre ``cache``.
+
+    :param workload: Operaciones a reproducir.
+    :type workload: Workload
+    :param cache: Caché sobre la que se reproduce la carga.
+    :type cache: ResultCache
+    """
+    operations = {
+        operator: cached_operation(operator, cache)(
+            getattr(Calculator, name).__wrapped__)
+        for operator, name in OPERATION_NAMES.items()
+    }
+    for operator, value_1, value_2 in workload:
+        try:
+            operations[operator](value_1, value_2)
+        except ZeroDivisionError:
+            continue
+
+
+def main() -> None:
+    """
+    Ejecuta el informe e imprime la comparación.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--capacity", type=int, default=1000,
+                        help="entradas máximas de cada caché")
+    parser.add_argument("--limit", type=int, default=1_000_000,
+                        help="registros del historial a reproducir")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="usar una carga sintética de N operaciones")
+    args = parser.parse_args()
+
+    workload = (synthetic_workload(args.synthetic) if args.synthetic
+                else history_workload(args.limit))
+    if not workload:
+        print("El historial está vacío; use --synthetic N.")
+        return
+
+    print(f"{len(workload)} operaciones, capacidad {args.capacity}")
+    print(f"{'claves':>14} {'aciertos':>9} {'fallos':>8} {'desalojos':>10} "
+          f"{'distintas':>10} {'tasa':>7}")
+    variants = (("normalizadas", True), ("sin normalizar", False))
+    for label, normalize in variants:
+        cache = ResultCache(max_entries=args.capacity,
+                            normalize_commutative=normalize)
+        replay(workload, cache)
+        stats = cache.stats()
+        distinct = len({cache.make_key(*operation) for operation in workload})
+        print(f"{label:>14} {stats.hits:9} {stats.misses:8} "
+              f"{stats.evictions:10} {distinct:10} "
+              f"{stats.hit_rate:7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# MODULO: bench_concurrent_writers.py
+"""
+Benchmark de varios procesos escribiendo en el mismo historial.
+
+Cada proceso abre su ``HistoryManager`` sobre el mismo archivo temporal y
+escribe su parte de los registros con ``new_history`` (una transacción por
+registro, máxima contención) o con ``queue_history`` (por lotes). Los
+procesos esperan en una barrera antes de empezar, así que el tiempo no
+incluye su arranque.
+
+Para cada número de procesos imprime las inserciones por segundo
+agregadas, los registros que acabaron en la base de datos (deben ser
+todos: los que no se pudieron escribir tras los reintentos pasan por el
+archivo de desbordamiento y se vuelcan después) y si queda ese archivo.
+
+Uso::
+
+    python benchmarks/bench_concurrent_writers.py [inserciones]
+"""
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.history_manager_db import HistoryManager  # noqa: E402
+
+PROCESSES = (1, 2, 4, 8)
+
+
+def writer(db_path: str, worker: int, number: int, queued: bool,
+           barrier) -> None:
+    """
+    Proceso escritor: escribe ``number`` registros y cierra el gestor.
+    """
+    HistoryManager._db_path = db_path
+    manager = HistoryManager()
+    manager.create_table()
+    write = manager.queue_history if queued else manager.new_history
+    barrier.wait()
+    for index in range(number):
+        write(f"{worker} + {index}", Decimal(worker + index))
+    manager.close()
+
+
+def run(db_path: Path, processes: int, number: int, queued: bool) -> float:
+    """
+    Reparte ``number`` registros entre ``processes`` procesos. Devuelve los
+    segundos desde que todos empiezan hasta que termina el último.
+
+    :rtype: float
+    """
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(processes + 1)
+    workers = [context.Process(target=writer,
+                               args=(str(db_path), worker,
+                                     number // processes, queued, barrier))
+               for worker in range(processes)]
+    for process in workers:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for process in workers:
+        process.join()
+    return time.perf_counter() - start
+
+
+def main(number: int = 4000) -> None:
+    """
+    Ejecuta el benchmark e imprime las inserciones por segundo.
+
+    :param number: Número total de inserciones por prueba.
+    :type number: int
+    """
+    for queued in (False, True):
+        name = "queue_history" if queued else "new_history"
+        for processes in PROCESSES:
+            with tempfile.TemporaryDirectory() as directory:
+                db_path = Path(directory) / "history.db"
+                elapsed = run(db_path, processes, number, queued)
+                with sqlite3.connect(db_path) as connection:
+                    stored = connection.execute(
+                        "SELECT COUNT(*) FROM history_results").fetchone()[0]
+                connection.close()
+                spill = Path(f"{db_path}.spill.jsonl").exists()
+            expected = number // processes * processes
+            print(f"  {name:14} {processes} procesos "
+                  f"{expected / elapsed:9.0f} inserciones/s  "
+                  f"{stored}/{expected} guardados"
+                  f"{'  (queda spill)' if spill else ''}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4000)
@@ -0,0 +1,100 @@
+# MODULO: bench_fixed_point.py
+"""
+Benchmark del motor de punto fijo frente al camino Decimal.
+
+Compara, para cada operador, el coste de
+``Calculator.<operación>(v1, v2).quantize(Decimal("0.00"))`` (lo que hace
+hoy ``ButtonsCreator.calculate_result``) con ``FixedPointCalculator`` en sus
+dos formas: operandos Decimal (``apply``) y enteros ya escalados
+(``apply_scaled``). También verifica que los resultados coinciden.
+
+Uso::
+
+    python benchmarks/bench_fixed_point.py [n_pares]
+"""
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.calculator import Calculator  # noqa: E402
+from core.fixed_point import FixedPointCalculator  # noqa: E402
+
+OPERATIONS = {
+    "+": Calculator.add,
+    "-": Calculator.subtract,
+    "*": Calculator.multiply,
+    "/": Calculator.divide,
+    "%": Calculator.percent,
+}
+CENT = Decimal("0.00")
+
+
+def make_operands(count: int, seed: int = 7) -> list:
+    """
+    Genera operandos con dos decimales, como los que escribe un usuario.
+
+    Se generan valores distintos para que la caché de ``Calculator`` no
+    enmascare el coste real de la operación.
+
+    :param count: Número de operandos.
+    :type count: int
+    :param seed: Semilla del generador aleatorio.
+    :type seed: int
+    :returns: Lista de Decimals.
+    :rtype: list
+    """
+    rnd = random.Random(seed)
+    return [Decimal(rnd.randint(1, 10_000_000)).scaleb(-2)
+            for _ in range(count)]
+
+
+def timed(func, *args) -> tuple:
+    """
+    Ejecuta una función y mide su duración.
+
+    :returns: Tupla ``(resultado, segundos)``.
+    :rtype: tuple
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(count: int = 200_000) -> None:
+    """
+    Ejecuta el benchmark e imprime una tabla de resultados.
+
+    :param count: Número de pares por operador.
+    :type count: int
+    """
+    values_1 = make_operands(count, seed=1)
+    values_2 = make_operands(count, seed=2)
+    engine = FixedPointCalculator()
+    raws_1 = [engine.to_scaled(value) for value in values_1]
+    raws_2 = [engine.to_scaled(value) for value in values_2]
+
+    print(f"{count} pares por operador")
+    print(f"{'op':>3} {'decimal (s)':>12} {'fixed (s)':>10} "
+          f"{'scaled (s)':>11} {'x fixed':>8} {'x scaled':>9}")
+    for operator, operation in OPERATIONS.items():
+        expected, decimal_time = timed(
+            lambda: [operation(v1, v2).quantize(CENT)
+                     for v1, v2 in zip(values_1, values_2)])
+        fixed, fixed_time = timed(engine.apply, operator, values_1, values_2)
+        scaled, scaled_time = timed(
+            engine.apply_scaled, operator, raws_1, raws_2)
+
+        assert fixed.results == expected
+        assert [engine.from_scaled(raw) for raw in scaled] == expected
+
+        print(f"{operator:>3} {decimal_time:12.3f} {fixed_time:10.3f} "
+              f"{scaled_time:11.3f} {decimal_time / fixed_time:8.2f} "
+              f"{decimal_time / scaled_time:9.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
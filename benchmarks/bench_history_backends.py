@@ -0,0 +1,75 @@
+# MODULO: bench_history_backends.py
+"""
+Benchmark de los backends de almacenamiento del historial.
+
+Para cada backend (``sqlite``, ``memory`` y ``log``) mide la latencia media
+de ``new_history`` (una escritura por operación), las inserciones por
+segundo de ``queue_history`` (por lotes) y el tiempo de leer los últimos
+registros con la caché en memoria invalidada.
+
+Uso::
+
+    python benchmarks/bench_history_backends.py [inserciones]
+"""
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.history_manager_db import (  # noqa: E402
+    STORAGES, HistoryManager
+)
+
+
+def open_manager(storage: str, directory: str) -> HistoryManager:
+    """
+    Abre un ``HistoryManager`` nuevo con el backend indicado.
+
+    :rtype: HistoryManager
+    """
+    HistoryManager._instance = None
+    HistoryManager._db_path = Path(directory) / "history.db"
+    HistoryManager.storage = storage
+    manager = HistoryManager()
+    manager.create_table()
+    return manager
+
+
+def main(number: int = 2000) -> None:
+    """
+    Ejecuta el benchmark e imprime los tiempos de cada backend.
+
+    :param number: Número de inserciones por prueba.
+    :type number: int
+    """
+    for storage in STORAGES:
+        with tempfile.TemporaryDirectory() as directory:
+            manager = open_manager(storage, directory)
+            start = time.perf_counter()
+            for index in range(number):
+                manager.new_history(f"{index} + 1", Decimal(index + 1))
+            single = (time.perf_counter() - start) / number
+
+            start = time.perf_counter()
+            for index in range(number):
+                manager.queue_history(f"{index} * 2", Decimal(index * 2))
+            manager.writer.flush()
+            queued = number / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(100):
+                manager.recent.invalidate()
+                manager.get_last_records(50)
+            read = (time.perf_counter() - start) / 100
+            manager.close()
+        print(f"  {storage:7} new_history {single * 1e6:8.1f} µs  "
+              f"queue_history {queued:9.0f} inserciones/s  "
+              f"últimos 50 {read * 1e6:8.1f} µs")
+    HistoryManager._instance = None
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,113 @@
+# MODULO: bench_history_inserts.py
+"""
+Benchmark de inserciones en el historial (inserciones por segundo).
+
+Compara, sobre un archivo temporal:
+
+- una conexión nueva por operación, como hacía ``gestor_database`` antes
+  (``sqlite3.connect`` + INSERT + commit en cada llamada);
+- ``HistoryManager.new_history`` con las conexiones de larga duración de
+  ``ConnectionPool`` (WAL, ``synchronous=NORMAL``);
+- ``HistoryManager.queue_history``, que escribe por lotes con
+  ``executemany`` (``HistoryWriter``); el tiempo incluye el ``close`` que
+  escribe lo pendiente.
+
+Uso::
+
+    python benchmarks/bench_history_inserts.py [inserciones]
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.history_manager_db import HistoryManager  # noqa: E402
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS history_results (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        EQUATION CHAR(50),
+        RESULT CHAR(50)
+    );
+"""
+
+
+def connect_per_insert(db_path: Path, number: int) -> float:
+    """
+    Inserta abriendo una conexión por registro. Devuelve los segundos.
+
+    :rtype: float
+    """
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(CREATE_TABLE)
+    start = time.perf_counter()
+    for index in range(number):
+        connection = sqlite3.connect(db_path)
+        with connection:
+            connection.execute(
+                "INSERT INTO history_results (EQUATION, RESULT) VALUES (?,?)",
+                (f"{index} + 1", str(index + 1)))
+        connection.close()
+    return time.perf_counter() - start
+
+
+def pooled(db_path: Path, number: int) -> float:
+    """
+    Inserta con ``HistoryManager`` y su pool. Devuelve los segundos.
+
+    :rtype: float
+    """
+    HistoryManager._instance = None
+    HistoryManager._db_path = db_path
+    manager = HistoryManager()
+    manager.create_table()
+    start = time.perf_counter()
+    for index in range(number):
+        manager.new_history(f"{index} + 1", Decimal(index + 1))
+    elapsed = time.perf_counter() - start
+    manager.close()
+    return elapsed
+
+
+def batched(db_path: Path, number: int) -> float:
+    """
+    Encola con ``queue_history`` y cierra. Devuelve los segundos.
+
+    :rtype: float
+    """
+    HistoryManager._instance = None
+    HistoryManager._db_path = db_path
+    manager = HistoryManager()
+    manager.create_table()
+    start = time.perf_counter()
+    for index in range(number):
+        manager.queue_history(f"{index} + 1", Decimal(index + 1))
+    manager.close()
+    return time.perf_counter() - start
+
+
+def main(number: int = 2000) -> None:
+    """
+    Ejecuta el benchmark e imprime las inserciones por segundo.
+
+    :param number: Número de inserciones por variante.
+    :type number: int
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        before = connect_per_insert(Path(directory) / "before.db", number)
+        after = pooled(Path(directory) / "after.db", number)
+        batch = batched(Path(directory) / "batch.db", number)
+    print(f"{number} inserciones")
+    print(f"  conexión por operación {number / before:10.0f} inserciones/s")
+    print(f"  pool (WAL)             {number / after:10.0f} inserciones/s  "
+          f"x{before / after:.1f}")
+    print(f"  por lotes              {number / batch:10.0f} inserciones/s  "
+          f"x{before / batch:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
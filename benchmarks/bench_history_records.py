@@ -0,0 +1,120 @@
+# MODULO: bench_history_records.py
+"""
+Benchmark del coste por registro en las rutas calientes del historial.
+
+Compara, sin base de datos (solo el trabajo de Python por registro):
+
+- escritura: crear un ``HistoryTableDB`` de Pydantic por registro y llamar
+  a ``to_row`` (como hacían ``new_history`` y ``HistoryWriter``), frente a
+  ``to_history_row``, que solo valida con el modelo lo que no es
+  ``(str, Decimal)``;
+- lectura: un diccionario por fila (como devolvía ``get_last_records``)
+  frente a ``HistoryEntry._make`` (tupla con nombre, sin ``__dict__``);
+- lectura desde memoria (``RecentHistory``): copiar cada diccionario del
+  búfer (para que quien llama no lo altere) frente a devolver los
+  ``HistoryEntry``, que son inmutables.
+
+Para cada variante mide los microsegundos por registro y los bytes que
+ocupan los registros resultantes (``tracemalloc``, memoria retenida tras
+crear todos).
+
+Las tuplas las sigue el recolector de basura (los diccionarios que solo
+contienen cadenas, no), así que crear un millón de ``HistoryEntry`` de una
+vez dispara recolecciones y tarda más que crear los diccionarios; en las
+páginas pequeñas de las lecturas reales domina el ahorro de memoria y de
+copias.
+
+Uso::
+
+    python benchmarks/bench_history_records.py [registros]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.history_db import (  # noqa: E402
+    HistoryEntry, HistoryTableDB, to_history_row
+)
+
+
+def measure(build: Callable[[], list]) -> Tuple[float, float]:
+    """
+    Ejecuta ``build`` y devuelve ``(segundos, bytes retenidos)``. El tiempo
+    se mide sin ``tracemalloc`` (que lo distorsiona).
+
+    :rtype: Tuple[float, float]
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def inputs(number: int) -> List[Tuple[str, Decimal]]:
+    """
+    Registros de entrada como los de la calculadora.
+
+    :rtype: List[Tuple[str, Decimal]]
+    """
+    return [(f"{index} + 1", Decimal(index + 1)) for index in range(number)]
+
+
+def main(number: int = 1_000_000) -> None:
+    """
+    Ejecuta el benchmark e imprime el coste por registro.
+
+    :param number: Número de registros por variante.
+    :type number: int
+    """
+    records = inputs(number)
+    rows = [(index, equation, str(result))
+            for index, (equation, result) in enumerate(records, 1)]
+    dicts = [{"equation": row[1], "result": row[2]} for row in rows]
+    entries = list(map(HistoryEntry._make, rows))
+    variants = {
+        "escritura: HistoryTableDB.to_row": lambda: [
+            HistoryTableDB(equation=equation, result=result).to_row()
+            for equation, result in records],
+        "escritura: to_history_row": lambda: [
+            to_history_row(equation, result)
+            for equation, result in records],
+        "lectura: dict por fila": lambda: [
+            {"equation": row[1], "result": row[2]} for row in rows],
+        "lectura: HistoryEntry._make": lambda: list(
+            map(HistoryEntry._make, rows)),
+        "búfer: copia de dict": lambda: [dict(record) for record in dicts],
+        "búfer: HistoryEntry": lambda: list(entries),
+    }
+    print(f"{number} registros")
+    results = {name: measure(build) for name, build in variants.items()}
+    for name, (elapsed, retained) in results.items():
+        print(f"  {name:34} {elapsed / number * 1e6:7.2f} µs/registro  "
+              f"{retained / number:7.1f} bytes/registro")
+    for before, after in (("escritura: HistoryTableDB.to_row",
+                           "escritura: to_history_row"),
+                          ("lectura: dict por fila",
+                           "lectura: HistoryEntry._make"),
+                          ("búfer: copia de dict", "búfer: HistoryEntry")):
+        saved = results[before][0] - results[after][0]
+        print(f"  ahorro {after.split(':')[0]:10} "
+              f"{saved / number * 1e6:7.2f} µs/registro  "
+              f"{(results[before][1] - results[after][1]) / number:7.1f} "
+              f"bytes/registro")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,66 @@
+# MODULO: bench_integer_fast_path.py
+"""
+Micro-benchmark del atajo para operandos enteros de ``Calculator``.
+
+Compara, con operandos enteros, el coste de cada operación:
+
+- con la caché de resultados y sin atajo, como antes (todas las llamadas
+  son aciertos de caché tras la primera);
+- a través de ``Calculator.<operación>``, que calcula directamente;
+- convirtiendo a ``int`` y de vuelta a ``Decimal``, como referencia.
+
+Uso::
+
+    python benchmarks/bench_integer_fast_path.py [iteraciones]
+"""
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.calculator import Calculator  # noqa: E402
+from core.result_cache import ResultCache, cached_operation  # noqa: E402
+
+CASES = (
+    ("add", "+", Decimal(123456), Decimal(987)),
+    ("multiply", "*", Decimal(12345678901234), Decimal(98765)),
+    ("divide", "/", Decimal(1234500), Decimal(25)),
+    ("percent", "%", Decimal(2500), Decimal(16)),
+)
+
+NATIVE = {
+    "+": lambda value_1, value_2: Decimal(int(value_1) + int(value_2)),
+    "*": lambda value_1, value_2: Decimal(int(value_1) * int(value_2)),
+    "/": lambda value_1, value_2: Decimal(int(value_1) // int(value_2)),
+    "%": lambda value_1, value_2: Decimal(
+        int(value_1) * int(value_2) // 100),
+}
+
+
+def main(number: int = 300_000) -> None:
+    """
+    Ejecuta el micro-benchmark e imprime el coste por operación.
+
+    :param number: Número de llamadas por variante.
+    :type number: int
+    """
+    print(f"{number} llamadas por variante (ns por operación)")
+    for name, operator, value_1, value_2 in CASES:
+        public = getattr(Calculator, name)
+        cached = cached_operation(operator, ResultCache())(public.__wrapped__)
+        native = NATIVE[operator]
+        assert str(public(value_1, value_2)) == str(cached(value_1, value_2))
+        assert str(native(value_1, value_2)) == str(public(value_1, value_2))
+        timings = [
+            timeit.timeit(lambda func=func: func(value_1, value_2),
+                          number=number) / number * 1e9
+            for func in (cached, public, native)
+        ]
+        print(f"{name:>9}: caché {timings[0]:6.0f}  "
+              f"Calculator {timings[1]:6.0f}  int nativo {timings[2]:6.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
@@ -0,0 +1,76 @@
+# MODULO: bench_precision.py
+"""
+Micro-benchmark de la caché de contextos decimales.
+
+Compara el coste de una operación con operandos pequeños ejecutada:
+
+- con el decorador ``use_precision`` (abre un ``localcontext()`` y fija
+  ``ctx.prec`` en cada llamada), como hacía ``Calculator`` antes;
+- llamando directamente al método del contexto precalculado por
+  ``get_context`` (lo que hace ahora ``Calculator``).
+
+Ninguna de las dos variantes pasa por ``lru_cache``, para medir solo el
+coste del contexto.
+
+Uso::
+
+    python benchmarks/bench_precision.py [iteraciones]
+"""
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.calculator import use_precision  # noqa: E402
+from core.precision import get_context  # noqa: E402
+
+
+@use_precision(28)
+def add_localcontext(value_1: Decimal, value_2: Decimal) -> Decimal:
+    """Suma con el decorador use_precision."""
+    return value_1 + value_2
+
+
+@use_precision(28)
+def divide_localcontext(value_1: Decimal, value_2: Decimal) -> Decimal:
+    """División con el decorador use_precision."""
+    return value_1 / value_2
+
+
+def add_cached_context(value_1: Decimal, value_2: Decimal) -> Decimal:
+    """Suma con el contexto precalculado."""
+    return get_context(28).add(value_1, value_2)
+
+
+def divide_cached_context(value_1: Decimal, value_2: Decimal) -> Decimal:
+    """División con el contexto precalculado."""
+    return get_context(28).divide(value_1, value_2)
+
+
+def main(number: int = 500_000) -> None:
+    """
+    Ejecuta el micro-benchmark e imprime el coste por operación.
+
+    :param number: Número de llamadas por variante.
+    :type number: int
+    """
+    value_1 = Decimal("12.5")
+    value_2 = Decimal("3")
+    cases = (
+        ("suma", add_localcontext, add_cached_context),
+        ("división", divide_localcontext, divide_cached_context),
+    )
+    print(f"{number} llamadas por variante (ns por operación)")
+    for name, old, new in cases:
+        assert old(value_1, value_2) == new(value_1, value_2)
+        old_time = timeit.timeit(lambda: old(value_1, value_2), number=number)
+        new_time = timeit.timeit(lambda: new(value_1, value_2), number=number)
+        print(f"{name:>9}: localcontext {old_time / number * 1e9:7.0f}  "
+              f"contexto en caché {new_time / number * 1e9:7.0f}  "
+              f"x{old_time / new_time:.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,96 @@
+# MODULO: bench_transcendental.py
+"""
+Benchmark de las funciones trascendentes de ``core/transcendental.py``.
+
+Para cada precisión mide:
+
+- el cálculo de las constantes (``pi``, ``ln 2``, ``ln 10``), que se hace
+  una vez por precisión;
+- cada función con las constantes ya en caché, por los algoritmos propios
+  (reducción de argumento y series);
+- con ``--compare``, los métodos equivalentes del contexto decimal
+  (``exp``, ``ln``, ``log10``, ``power``), lentos a partir de unos miles de
+  dígitos.
+
+Uso::
+
+    python benchmarks/bench_transcendental.py
+    python benchmarks/bench_transcendental.py --precisions 28 1000 --compare
+"""
+import argparse
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core import transcendental  # noqa: E402
+from core.precision import get_context  # noqa: E402
+
+VALUE = Decimal("2.718281828459045")
+EXPONENT = Decimal("1.5")
+
+FUNCTIONS = (
+    ("sqrt", lambda p: transcendental.sqrt(VALUE, p)),
+    ("exp", lambda p: transcendental.exp(VALUE, p)),
+    ("ln", lambda p: transcendental.ln(VALUE, p)),
+    ("log10", lambda p: transcendental.log10(VALUE, p)),
+    ("power", lambda p: transcendental.power(VALUE, EXPONENT, p)),
+    ("sin", lambda p: transcendental.sin(VALUE, p)),
+    ("cos", lambda p: transcendental.cos(VALUE, p)),
+    ("tan", lambda p: transcendental.tan(VALUE, p)),
+)
+
+DECIMAL_METHODS = (
+    ("exp", lambda p: get_context(p).exp(VALUE)),
+    ("ln", lambda p: get_context(p).ln(VALUE)),
+    ("log10", lambda p: get_context(p).log10(VALUE)),
+    ("power", lambda p: get_context(p).power(VALUE, EXPONENT)),
+)
+
+
+def elapsed(func: Callable[[int], Decimal], precision: int) -> float:
+    """
+    Tiempo en segundos de una llamada.
+
+    :param func: Función a medir.
+    :type func: Callable[[int], Decimal]
+    :param precision: Precisión de la llamada.
+    :type precision: int
+    :rtype: float
+    """
+    start = time.perf_counter()
+    func(precision)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """
+    Ejecuta el benchmark e imprime los tiempos en milisegundos.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--precisions", type=int, nargs="+",
+                        default=[28, 100, 1000, 10000])
+    parser.add_argument("--compare", action="store_true",
+                        help="medir también los métodos de decimal")
+    args = parser.parse_args()
+
+    # Fuerza los algoritmos propios a cualquier precisión.
+    transcendental.LIBMPDEC_PRECISION = 0
+    for precision in args.precisions:
+        constants = sum(elapsed(func, precision) for func in (
+            transcendental.pi, transcendental.ln2, transcendental.ln10))
+        print(f"\n{precision} dígitos (ms)  constantes {constants * 1e3:.1f}")
+        for name, func in FUNCTIONS:
+            func(precision)    # coeficientes de las series en caché
+            print(f"  {name:>6} {elapsed(func, precision) * 1e3:10.2f}")
+        if args.compare:
+            for name, func in DECIMAL_METHODS:
+                print(f"  {name:>6} {elapsed(func, precision) * 1e3:10.2f}"
+                      "  (decimal)")
+
+
+if __name__ == "__main__":
+    main()
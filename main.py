@@ -11,7 +11,9 @@ básicos como:
 - Modularización del proyecto y uso de módulos externos.
 """
 from src.ui.ui_interface_creator import InterfaceCreator
-from src.database.history_manager_db import HistoryManager
+from database.history_manager_db import HistoryManager
+from core.calculator import Calculator
+from database.memo_store import MemoStore
 
 
 class AppCalculator:
@@ -28,6 +30,9 @@ class AppCalculator:
             calculadora.
         history_db (HistoryManager): Instancia del gestor de la base de datos 
             del historial.
+        persistent_cache (bool): Si es True, los resultados de Calculator se
+            guardan en disco (``MemoStore``) y se reutilizan en la siguiente
+            ejecución.
 
     :Example:
         Para iniciar la aplicación:
@@ -37,6 +42,7 @@ class AppCalculator:
 
     interface = InterfaceCreator()
     history_db = HistoryManager()
+    persistent_cache = True
 
     def main(self) -> None:
         """
@@ -51,7 +57,19 @@ class AppCalculator:
         :rtype: None
         """
         self.history_db.create_table()
-        self.interface.run()
+        memo_store = None
+        if self.persistent_cache:
+            # La tabla se lee en segundo plano: las consultas de la caché
+            # desde la interfaz nunca esperan a la base de datos.
+            memo_store = MemoStore()
+            memo_store.preload()
+            Calculator.result_cache.attach_store(memo_store)
+        try:
+            self.interface.run()
+        finally:
+            if memo_store is not None:
+                memo_store.close()
+            self.history_db.close()
 
 
 if __name__ == "__main__":
@@ -9,13 +9,38 @@ Decimal para garantizar alta precisión en los cálculos.
 Las operaciones son:
 - Stateless (sin mantener estado)
 - Thread-safe (seguras para uso concurrente)
-- Optimizadas con caché para mejorar el rendimiento en cálculos repetitivos
+- Optimizadas con una caché compartida (``core/result_cache.py``) para
+  mejorar el rendimiento en cálculos repetitivos
 
 La precisión decimal está configurada a 28 dígitos para mantener la exactitud
-en cálculos financieros y científicos.
+en cálculos financieros y científicos. Cada operación acepta además una
+precisión propia (``precision=50``) sin modificar ``Calculator._PRECISION``;
+los contextos decimales se reutilizan desde ``core/precision.py``.
+
+Las operaciones con dos operandos enteros, incluso muy grandes, se calculan
+directamente sin pasar por la caché (en la división y el porcentaje, solo
+cuando el cociente es un entero exacto).
+
+Además de las cinco operaciones básicas ofrece potencia, raíz cuadrada,
+exponencial, logaritmos y funciones trigonométricas con cualquier precisión
+(``core/transcendental.py``).
+
+Para trabajos con muchos pares de operandos se ofrece una API por lotes
+(``Calculator.apply`` y ``Calculator.<operación>_many``) que prepara el
+contexto decimal una sola vez por lote.
 """
-from functools import lru_cache, wraps
-from decimal import Decimal, localcontext
+from functools import wraps
+from decimal import Context, Decimal, InvalidOperation, localcontext
+from itertools import zip_longest
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple
+from typing import Optional, Tuple
+from . import transcendental
+from .precision import get_context
+from .result_cache import RESULT_CACHE, FastPath, cached_operation
+
+_ZERO = Decimal(0)
+_ONE = Decimal(1)
+_HUNDRED = Decimal(100)
 
 
 def use_precision(precision: int):
@@ -29,6 +54,10 @@ def use_precision(precision: int):
     Esto asegura que los cálculos se realicen con la precisión especificada sin
     alterar el contexto de precisión global, evitando efectos secundarios.
 
+    ``Calculator`` ya no la utiliza, ya que usa los contextos precalculados de
+    ``core/precision.py``. Se mantiene para funciones propias que necesiten
+    los operadores de Decimal con precisión local.
+
     :param precision: El número de dígitos de precisión para el contexto local.
     :type precision: int
     :returns: Un decorador listo para ser aplicado a una función.
@@ -44,6 +73,193 @@ def use_precision(precision: int):
     return decorator
 
 
+# -------------------------------------------------------- class -> BatchResult
+class BatchResult(NamedTuple):
+    """
+    Resultado de una operación por lotes.
+
+    :ivar results: Resultados en el mismo orden que los operandos. Las
+        posiciones que produjeron un error contienen ``None``.
+    :vartype results: List[Optional[Decimal]]
+    :ivar errors: Mensaje de error de cada posición fallida, por índice.
+    :vartype errors: Dict[int, str]
+    """
+    results: List[Optional[Decimal]]
+    errors: Dict[int, str]
+
+
+def _to_decimal(value: Any) -> Decimal:
+    """
+    Convierte un operando de un lote a Decimal.
+
+    Los valores que no son ``Decimal`` ni ``int`` (floats, escalares de
+    arrays, cadenas) se convierten a partir de su representación en texto,
+    igual que hace la interfaz con lo que escribe el usuario.
+
+    :param value: Operando a convertir.
+    :type value: Any
+    :returns: Operando como Decimal.
+    :rtype: Decimal
+    """
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def _pairs(
+        values_1: Iterable[Any],
+        values_2: Iterable[Any]) -> Iterator[Tuple[Any, Any]]:
+    """
+    Recorre dos secuencias de operandos por pares.
+
+    :param values_1: Primeros operandos.
+    :type values_1: Iterable[Any]
+    :param values_2: Segundos operandos.
+    :type values_2: Iterable[Any]
+    :returns: Iterador de pares ``(value_1, value_2)``.
+    :rtype: Iterator[Tuple[Any, Any]]
+    :raises ValueError: Si las secuencias tienen distinta longitud.
+    """
+    missing = object()
+    for value_1, value_2 in zip_longest(values_1, values_2, fillvalue=missing):
+        if value_1 is missing or value_2 is missing:
+            raise ValueError("Las secuencias de operandos deben tener la "
+                             "misma longitud")
+        yield value_1, value_2
+
+
+def _divide(context: Context, value_1: Decimal, value_2: Decimal) -> Decimal:
+    """
+    Divide dos valores decimales con el contexto indicado.
+
+    :param context: Contexto decimal de la operación.
+    :type context: Context
+    :param value_1: Dividendo.
+    :type value_1: Decimal
+    :param value_2: Divisor.
+    :type value_2: Decimal
+    :returns: Resultado de la división.
+    :rtype: Decimal
+    :raises ZeroDivisionError: Si el divisor es cero.
+    """
+    if value_2 == _ZERO:
+        raise ZeroDivisionError("No se puede dividir por cero")
+    return context.divide(value_1, value_2)
+
+
+def _percent(context: Context, value_1: Decimal, value_2: Decimal) -> Decimal:
+    """
+    Calcula ``(value_1 * value_2) / 100`` con el contexto indicado.
+
+    :param context: Contexto decimal de la operación.
+    :type context: Context
+    :param value_1: Valor base.
+    :type value_1: Decimal
+    :param value_2: Porcentaje a aplicar.
+    :type value_2: Decimal
+    :returns: Resultado del porcentaje aplicado.
+    :rtype: Decimal
+    """
+    return context.divide(context.multiply(value_1, value_2), _HUNDRED)
+
+
+# Operaciones sin caché que reciben el contexto decimal, usadas por lotes.
+_OPERATIONS: Dict[str, Callable[[Context, Decimal, Decimal], Decimal]] = {
+    "+": Context.add,
+    "-": Context.subtract,
+    "*": Context.multiply,
+    "/": _divide,
+    "%": _percent,
+}
+
+
+def _resolve_precision(precision: Optional[int]) -> int:
+    """
+    Devuelve la precisión de una operación: ``Calculator._PRECISION`` si es
+    ``None``.
+
+    :param precision: Precisión pedida.
+    :type precision: Optional[int]
+    :rtype: int
+    :raises ValueError: Si la precisión no es positiva.
+    """
+    if precision is None:
+        return Calculator._PRECISION
+    if precision < 1:
+        raise ValueError(f"Precisión no válida: {precision}")
+    return precision
+
+
+def _exact_quotient(
+        operator: str,
+        value_1: Decimal,
+        value_2: Decimal,
+        precision: int) -> bool:
+    """
+    Indica si ``/`` o ``%`` de dos enteros es un entero exacto de como mucho
+    ``precision`` dígitos, con un resto entero y sin calcular el cociente.
+
+    Los exponentes (``adjusted``) descartan antes los cocientes demasiado
+    grandes, de modo que el resto es exacto con ``precision`` más unos
+    pocos dígitos.
+
+    :rtype: bool
+    """
+    if operator == "%":
+        if value_1.adjusted() + value_2.adjusted() > precision + 1:
+            return False
+        # El producto tiene como mucho precision + 3 dígitos: es exacto.
+        context = get_context(precision + 4)
+        dividend = context.multiply(value_1, value_2)
+        divisor = _HUNDRED
+    else:
+        if not value_2 or \
+                value_1.adjusted() - value_2.adjusted() > precision:
+            return False
+        context = get_context(precision + 1)
+        dividend, divisor = value_1, value_2
+    return not context.remainder(dividend, divisor)
+
+
+def _integer_fast_path(operator: str) -> FastPath:
+    """
+    Crea el atajo de ``cached_operation`` para operandos enteros.
+
+    Con dos operandos de exponente 0 (``same_quantum(1)``; falso para NaN,
+    infinitos, ``2.0`` o ``1E+2``) la operación se calcula directamente con
+    el contexto decimal, sin construir la clave de la caché. Para ``/`` y
+    ``%`` solo se aceptan los cocientes exactos enteros, que se comprueban
+    con un resto antes de dividir; el resto vuelve al camino con caché sin
+    haber calculado la división, y allí un cociente periódico a mucha
+    precisión sí compensa guardarse.
+
+    :param operator: Operador de ``_OPERATIONS``.
+    :type operator: str
+    :returns: Atajo con la firma ``(value_1, value_2, precision)``; recibe
+        la precisión ya resuelta (``_resolve_precision``).
+    :rtype: FastPath
+    """
+    operation = _OPERATIONS[operator]
+    integral_only = operator in ("/", "%")
+
+    def fast_path(
+            value_1: Decimal,
+            value_2: Decimal,
+            precision: int) -> Optional[Decimal]:
+        if not (value_1.same_quantum(_ONE) and value_2.same_quantum(_ONE)):
+            return None
+        if integral_only and not _exact_quotient(
+                operator, value_1, value_2, precision):
+            return None
+        result = operation(get_context(precision), value_1, value_2)
+        if integral_only and not result.same_quantum(_ONE):
+            return None
+        return result
+    return fast_path
+
+
 # --------------------------------------------------------- class -> Calculator
 class Calculator:
     """
@@ -51,21 +267,34 @@ class Calculator:
 
     Esta clase proporciona métodos estáticos para realizar operaciones
     aritméticas básicas utilizando el tipo Decimal del módulo decimal.
-    Todos los métodos están decorados con ``lru_cache`` para optimizar cálculos
-    repetitivos y con ``use_precision`` para dar precision al cálculo.
+    Todos los métodos están decorados con ``cached_operation``, que guarda
+    los resultados en la caché compartida ``result_cache`` (claves con
+    exponente, límites globales y contadores), y operan con un contexto
+    decimal precalculado de ``_PRECISION`` dígitos, o de ``precision``
+    dígitos si se indica. Con operandos enteros (exponente 0) el resultado
+    se calcula directamente, sin pasar por la caché.
+
+    Los métodos por lotes (``apply`` y ``*_many``) evalúan secuencias de
+    pares con un único contexto decimal y sin pasar por la caché.
 
     :cvar _PRECISION: La precisión decimal (número de dígitos) utilizada
         para todos los cálculos de la clase.
 
     :vartype _PRECISION: int
+    :cvar result_cache: Caché compartida de resultados de las operaciones.
+    :vartype result_cache: ResultCache
     """
 
     _PRECISION = 28
+    result_cache = RESULT_CACHE
 
     @staticmethod
-    @lru_cache(maxsize=1000)
-    @use_precision(_PRECISION)
-    def add(value_1: Decimal, value_2: Decimal) -> Decimal:
+    @cached_operation("+", fast_path=_integer_fast_path("+"),
+                      resolve_precision=_resolve_precision)
+    def add(
+            value_1: Decimal,
+            value_2: Decimal,
+            precision: Optional[int] = None) -> Decimal:
         """
         Suma dos valores decimales.
 
@@ -73,15 +302,22 @@ class Calculator:
         :type value_1: Decimal
         :param value_2: Segundo valor a sumar.
         :type value_2: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
         :returns: Resultado de la suma.
         :rtype: Decimal
         """
-        return value_1 + value_2
+        return get_context(_resolve_precision(precision)).add(
+            value_1, value_2)
 
     @staticmethod
-    @lru_cache(maxsize=1000)
-    @use_precision(_PRECISION)
-    def subtract(value_1: Decimal, value_2: Decimal) -> Decimal:
+    @cached_operation("-", fast_path=_integer_fast_path("-"),
+                      resolve_precision=_resolve_precision)
+    def subtract(
+            value_1: Decimal,
+            value_2: Decimal,
+            precision: Optional[int] = None) -> Decimal:
         """
         Resta dos valores decimales.
 
@@ -89,15 +325,22 @@ class Calculator:
         :type value_1: Decimal
         :param value_2: Sustraendo.
         :type value_2: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
         :returns: Resultado de la resta.
         :rtype: Decimal
         """
-        return value_1 - value_2
+        return get_context(_resolve_precision(precision)).subtract(
+            value_1, value_2)
 
     @staticmethod
-    @lru_cache(maxsize=1000)
-    @use_precision(_PRECISION)
-    def multiply(value_1: Decimal, value_2: Decimal) -> Decimal:
+    @cached_operation("*", fast_path=_integer_fast_path("*"),
+                      resolve_precision=_resolve_precision)
+    def multiply(
+            value_1: Decimal,
+            value_2: Decimal,
+            precision: Optional[int] = None) -> Decimal:
         """
         Multiplica dos valores decimales.
 
@@ -105,15 +348,22 @@ class Calculator:
         :type value_1: Decimal
         :param value_2: Segundo factor.
         :type value_2: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
         :returns: Resultado de la multiplicación.
         :rtype: Decimal
         """
-        return value_1 * value_2
+        return get_context(_resolve_precision(precision)).multiply(
+            value_1, value_2)
 
     @staticmethod
-    @lru_cache(maxsize=1000)
-    @use_precision(_PRECISION)
-    def divide(value_1: Decimal, value_2: Decimal) -> Decimal:
+    @cached_operation("/", fast_path=_integer_fast_path("/"),
+                      resolve_precision=_resolve_precision)
+    def divide(
+            value_1: Decimal,
+            value_2: Decimal,
+            precision: Optional[int] = None) -> Decimal:
         """
         Divide dos valores decimales.
 
@@ -121,18 +371,23 @@ class Calculator:
         :type value_1: Decimal
         :param value_2: Divisor.
         :type value_2: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
         :returns: Resultado de la división.
         :rtype: Decimal
         :raises ZeroDivisionError: Si el divisor es cero.
         """
-        if value_2 == Decimal(0):
-            raise ZeroDivisionError("No se puede dividir por cero")
-        return value_1 / value_2
+        return _divide(
+            get_context(_resolve_precision(precision)), value_1, value_2)
 
     @staticmethod
-    @lru_cache(maxsize=1000)
-    @use_precision(_PRECISION)
-    def percent(value_1: Decimal, value_2: Decimal) -> Decimal:
+    @cached_operation("%", fast_path=_integer_fast_path("%"),
+                      resolve_precision=_resolve_precision)
+    def percent(
+            value_1: Decimal,
+            value_2: Decimal,
+            precision: Optional[int] = None) -> Decimal:
         """
         Calcula el porcentaje de un valor respecto a otro.
 
@@ -140,7 +395,242 @@ class Calculator:
         :type value_1: Decimal
         :param value_2: Porcentaje a aplicar.
         :type value_2: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
         :returns: Resultado del porcentaje aplicado.
         :rtype: Decimal
         """
-        return (value_1 * value_2) / Decimal(100)
+        return _percent(
+            get_context(_resolve_precision(precision)), value_1, value_2)
+
+    @staticmethod
+    @cached_operation("^", resolve_precision=_resolve_precision)
+    def power(
+            value_1: Decimal,
+            value_2: Decimal,
+            precision: Optional[int] = None) -> Decimal:
+        """
+        Eleva un valor a una potencia (exponente entero o decimal).
+
+        :param value_1: Base.
+        :type value_1: Decimal
+        :param value_2: Exponente.
+        :type value_2: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :returns: Resultado de la potencia.
+        :rtype: Decimal
+        :raises ValueError: Si la base es negativa y el exponente no es
+            entero.
+        :raises ZeroDivisionError: Si la base es cero y el exponente es
+            negativo.
+        """
+        return transcendental.power(
+            value_1, value_2, _resolve_precision(precision))
+
+    @staticmethod
+    def sqrt(value: Decimal, precision: Optional[int] = None) -> Decimal:
+        """
+        Calcula la raíz cuadrada de un valor.
+
+        :param value: Valor no negativo.
+        :type value: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :rtype: Decimal
+        :raises ValueError: Si el valor es negativo.
+        """
+        return transcendental.sqrt(value, _resolve_precision(precision))
+
+    @staticmethod
+    def exp(value: Decimal, precision: Optional[int] = None) -> Decimal:
+        """
+        Calcula ``e`` elevado a un valor.
+
+        :param value: Exponente.
+        :type value: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :rtype: Decimal
+        """
+        return transcendental.exp(value, _resolve_precision(precision))
+
+    @staticmethod
+    def ln(value: Decimal, precision: Optional[int] = None) -> Decimal:
+        """
+        Calcula el logaritmo natural de un valor.
+
+        :param value: Valor positivo.
+        :type value: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :rtype: Decimal
+        :raises ValueError: Si el valor no es positivo.
+        """
+        return transcendental.ln(value, _resolve_precision(precision))
+
+    @staticmethod
+    def log10(value: Decimal, precision: Optional[int] = None) -> Decimal:
+        """
+        Calcula el logaritmo en base 10 de un valor.
+
+        :param value: Valor positivo.
+        :type value: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :rtype: Decimal
+        :raises ValueError: Si el valor no es positivo.
+        """
+        return transcendental.log10(
+            value, _resolve_precision(precision))
+
+    @staticmethod
+    def sin(value: Decimal, precision: Optional[int] = None) -> Decimal:
+        """
+        Calcula el seno de un ángulo en radianes.
+
+        :param value: Ángulo en radianes.
+        :type value: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :rtype: Decimal
+        """
+        return transcendental.sin(value, _resolve_precision(precision))
+
+    @staticmethod
+    def cos(value: Decimal, precision: Optional[int] = None) -> Decimal:
+        """
+        Calcula el coseno de un ángulo en radianes.
+
+        :param value: Ángulo en radianes.
+        :type value: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :rtype: Decimal
+        """
+        return transcendental.cos(value, _resolve_precision(precision))
+
+    @staticmethod
+    def tan(value: Decimal, precision: Optional[int] = None) -> Decimal:
+        """
+        Calcula la tangente de un ángulo en radianes.
+
+        :param value: Ángulo en radianes.
+        :type value: Decimal
+        :param precision: Precisión de la operación. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :rtype: Decimal
+        """
+        return transcendental.tan(value, _resolve_precision(precision))
+
+    @staticmethod
+    def apply(
+            operator: str,
+            values_1: Iterable[Any],
+            values_2: Iterable[Any],
+            precision: Optional[int] = None) -> BatchResult:
+        """
+        Aplica una operación a cada par de operandos de dos secuencias.
+
+        El contexto de precisión se obtiene una sola vez para todo el lote.
+        Un error en un elemento (por ejemplo, una división por cero) no
+        detiene el lote: se registra en ``BatchResult.errors`` y su posición
+        en ``BatchResult.results`` queda en ``None``.
+
+        :param operator: Operador a aplicar: ``+``, ``-``, ``*``, ``/`` o
+            ``%``.
+        :type operator: str
+        :param values_1: Primeros operandos (iterable, lista o array).
+        :type values_1: Iterable[Any]
+        :param values_2: Segundos operandos, de la misma longitud.
+        :type values_2: Iterable[Any]
+        :param precision: Precisión del lote. Por defecto,
+            ``Calculator._PRECISION``.
+        :type precision: Optional[int]
+        :returns: Resultados y errores por posición.
+        :rtype: BatchResult
+        :raises ValueError: Si el operador no existe o las secuencias tienen
+            distinta longitud.
+        """
+        if operator not in _OPERATIONS:
+            raise ValueError(f"Operador no soportado: {operator}")
+        operation = _OPERATIONS[operator]
+        context = get_context(_resolve_precision(precision))
+        results: List[Optional[Decimal]] = []
+        errors: Dict[int, str] = {}
+
+        for index, (value_1, value_2) in enumerate(
+                _pairs(values_1, values_2)):
+            try:
+                results.append(operation(
+                    context, _to_decimal(value_1), _to_decimal(value_2)))
+            except (ZeroDivisionError, InvalidOperation) as error:
+                results.append(None)
+                errors[index] = str(error)
+
+        return BatchResult(results, errors)
+
+    @staticmethod
+    def add_many(
+            values_1: Iterable[Any],
+            values_2: Iterable[Any]) -> BatchResult:
+        """
+        Suma por lotes. Ver :meth:`Calculator.apply`.
+
+        :rtype: BatchResult
+        """
+        return Calculator.apply("+", values_1, values_2)
+
+    @staticmethod
+    def subtract_many(
+            values_1: Iterable[Any],
+            values_2: Iterable[Any]) -> BatchResult:
+        """
+        Resta por lotes. Ver :meth:`Calculator.apply`.
+
+        :rtype: BatchResult
+        """
+        return Calculator.apply("-", values_1, values_2)
+
+    @staticmethod
+    def multiply_many(
+            values_1: Iterable[Any],
+            values_2: Iterable[Any]) -> BatchResult:
+        """
+        Multiplicación por lotes. Ver :meth:`Calculator.apply`.
+
+        :rtype: BatchResult
+        """
+        return Calculator.apply("*", values_1, values_2)
+
+    @staticmethod
+    def divide_many(
+            values_1: Iterable[Any],
+            values_2: Iterable[Any]) -> BatchResult:
+        """
+        División por lotes. Los divisores cero se informan por posición.
+        Ver :meth:`Calculator.apply`.
+
+        :rtype: BatchResult
+        """
+        return Calculator.apply("/", values_1, values_2)
+
+    @staticmethod
+    def percent_many(
+            values_1: Iterable[Any],
+            values_2: Iterable[Any]) -> BatchResult:
+        """
+        Porcentaje por lotes. Ver :meth:`Calculator.apply`.
+
+        :rtype: BatchResult
+        """
+        return Calculator.apply("%", values_1, values_2)
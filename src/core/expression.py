@@ -0,0 +1,391 @@
+# MODULO: expression.py
+"""
+Compilador de expresiones aritméticas completas.
+
+El núcleo de la calculadora evalúa una sola operación binaria
+(``value_1 op value_2``). Este módulo permite evaluar expresiones completas
+como ``12.5*(3+4)/7 - 10%`` en tres fases:
+
+1. Análisis: el texto se convierte en un árbol sintáctico (AST) respetando
+   la precedencia de operadores y los paréntesis.
+2. Plegado de constantes: los subárboles sin variables se calculan en tiempo
+   de compilación.
+3. Compilación: el árbol se traduce a un plan plano de instrucciones para
+   una pila, que se evalúa con las operaciones de ``Calculator`` para que la
+   semántica de precisión sea la misma.
+
+Los planes se guardan en una caché LRU indexada por el texto de la
+expresión, de modo que una expresión repetida no vuelve a analizarse.
+
+Semántica del porcentaje (postfijo ``%``):
+
+- ``a + b%`` y ``a - b%`` aplican el porcentaje sobre ``a``:
+  ``a ± Calculator.percent(a, b)``.
+- En cualquier otra posición ``b%`` equivale a ``Calculator.percent(b, 1)``,
+  es decir, ``b / 100``.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple, Union
+from .calculator import Calculator, _to_decimal
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<number>\d+(?:\.\d*)?|\.\d+)"
+    r"|(?P<name>[A-Za-z_]\w*)"
+    r"|(?P<symbol>[-+*/%()]))"
+)
+
+_BINARY_OPERATIONS = {
+    "+": Calculator.add,
+    "-": Calculator.subtract,
+    "*": Calculator.multiply,
+    "/": Calculator.divide,
+}
+
+
+# ....................................................... nodos del árbol (AST)
+class Number(NamedTuple):
+    """
+    Literal numérico.
+
+    :ivar value: Valor del literal.
+    :vartype value: Decimal
+    """
+    value: Decimal
+
+
+class Variable(NamedTuple):
+    """
+    Variable cuyo valor se proporciona al evaluar el plan.
+
+    :ivar name: Nombre de la variable.
+    :vartype name: str
+    """
+    name: str
+
+
+class Negate(NamedTuple):
+    """
+    Cambio de signo (``-x``).
+
+    :ivar operand: Subárbol a negar.
+    """
+    operand: "Node"
+
+
+class Percent(NamedTuple):
+    """
+    Porcentaje postfijo (``x%``).
+
+    :ivar operand: Subárbol al que se aplica el porcentaje.
+    """
+    operand: "Node"
+
+
+class Binary(NamedTuple):
+    """
+    Operación binaria.
+
+    :ivar operator: Operador: ``+``, ``-``, ``*`` o ``/``.
+    :vartype operator: str
+    :ivar left: Subárbol izquierdo.
+    :ivar right: Subárbol derecho.
+    """
+    operator: str
+    left: "Node"
+    right: "Node"
+
+
+Node = Union[Number, Variable, Negate, Percent, Binary]
+Instruction = Tuple[str, Union[Decimal, str, None]]
+
+
+# ------------------------------------------------------------------ análisis
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """
+    Divide el texto de una expresión en tokens.
+
+    :param text: Expresión a analizar.
+    :type text: str
+    :returns: Lista de tuplas ``(tipo, texto)`` con tipo ``number``,
+        ``name`` o ``symbol``.
+    :rtype: List[Tuple[str, str]]
+    :raises ValueError: Si aparece un carácter no válido.
+    """
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise ValueError(
+                f"Expresión inválida: carácter inesperado en la posición "
+                f"{position}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Analizador descendente recursivo.
+
+    Gramática::
+
+        expression := term (("+" | "-") term)*
+        term       := unary (("*" | "/") unary)*
+        unary      := ("+" | "-") unary | postfix
+        postfix    := primary "%"*
+        primary    := number | name | "(" expression ")"
+    """
+
+    def __init__(self, text: str) -> None:
+        """
+        Constructor del analizador.
+
+        :param text: Expresión a analizar.
+        :type text: str
+        """
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def _peek(self) -> str:
+        """Devuelve el texto del token actual sin consumirlo."""
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][1]
+        return ""
+
+    def _next(self) -> Tuple[str, str]:
+        """Consume y devuelve el token actual."""
+        if self.position >= len(self.tokens):
+            raise ValueError("Expresión inválida: final inesperado")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self) -> Node:
+        """
+        Analiza la expresión completa.
+
+        :returns: Raíz del árbol sintáctico.
+        :rtype: Node
+        :raises ValueError: Si la expresión está mal formada.
+        """
+        node = self._expression()
+        if self.position != len(self.tokens):
+            raise ValueError(
+                f"Expresión inválida: token inesperado '{self._peek()}'")
+        return node
+
+    def _expression(self) -> Node:
+        """Analiza sumas y restas."""
+        node = self._term()
+        while self._peek() in ("+", "-"):
+            operator = self._next()[1]
+            node = Binary(operator, node, self._term())
+        return node
+
+    def _term(self) -> Node:
+        """Analiza multiplicaciones y divisiones."""
+        node = self._unary()
+        while self._peek() in ("*", "/"):
+            operator = self._next()[1]
+            node = Binary(operator, node, self._unary())
+        return node
+
+    def _unary(self) -> Node:
+        """Analiza los signos unarios."""
+        if self._peek() == "-":
+            self._next()
+            return Negate(self._unary())
+        if self._peek() == "+":
+            self._next()
+            return self._unary()
+        return self._postfix()
+
+    def _postfix(self) -> Node:
+        """Analiza los porcentajes postfijos."""
+        node = self._primary()
+        while self._peek() == "%":
+            self._next()
+            node = Percent(node)
+        return node
+
+    def _primary(self) -> Node:
+        """Analiza números, variables y paréntesis."""
+        kind, text = self._next()
+        if kind == "number":
+            return Number(Decimal(text))
+        if kind == "name":
+            return Variable(text)
+        if text == "(":
+            node = self._expression()
+            if self._next()[1] != ")":
+                raise ValueError("Expresión inválida: falta ')'")
+            return node
+        raise ValueError(f"Expresión inválida: token inesperado '{text}'")
+
+
+def parse(text: str) -> Node:
+    """
+    Convierte el texto de una expresión en su árbol sintáctico.
+
+    :param text: Expresión a analizar.
+    :type text: str
+    :returns: Raíz del árbol sintáctico.
+    :rtype: Node
+    :raises ValueError: Si la expresión está mal formada.
+    """
+    return _Parser(text).parse()
+
+
+# ------------------------------------------------------- plegado de constantes
+def fold_constants(node: Node) -> Node:
+    """
+    Calcula en tiempo de compilación los subárboles sin variables.
+
+    Los subárboles cuyo cálculo falla (por ejemplo, una división por cero)
+    se dejan sin plegar para que el error aparezca al evaluar.
+
+    :param node: Raíz del árbol sintáctico.
+    :type node: Node
+    :returns: Árbol equivalente con las constantes plegadas.
+    :rtype: Node
+    """
+    if isinstance(node, (Number, Variable)):
+        return node
+    if isinstance(node, (Negate, Percent)):
+        folded = type(node)(fold_constants(node.operand))
+        children = (folded.operand,)
+    elif node.operator in ("+", "-") and isinstance(node.right, Percent):
+        # El porcentaje relativo se conserva para no perder su semántica.
+        rate = fold_constants(node.right.operand)
+        folded = Binary(node.operator, fold_constants(node.left),
+                        Percent(rate))
+        children = (folded.left, rate)
+    else:
+        folded = Binary(node.operator, fold_constants(node.left),
+                        fold_constants(node.right))
+        children = (folded.left, folded.right)
+
+    if not all(isinstance(child, Number) for child in children):
+        return folded
+    try:
+        return Number(CompiledPlan(tuple(_emit(folded))).evaluate())
+    except (ZeroDivisionError, InvalidOperation):
+        return folded
+
+
+# ------------------------------------------------------------- compilación
+def _emit(node: Node) -> List[Instruction]:
+    """
+    Traduce un árbol a instrucciones de pila en orden postfijo.
+
+    :param node: Raíz del árbol sintáctico.
+    :type node: Node
+    :returns: Lista de instrucciones ``(código, argumento)``.
+    :rtype: List[Instruction]
+    """
+    if isinstance(node, Number):
+        return [("push", node.value)]
+    if isinstance(node, Variable):
+        return [("load", node.name)]
+    if isinstance(node, Negate):
+        return _emit(node.operand) + [("negate", None)]
+    if isinstance(node, Percent):
+        return _emit(node.operand) + [("percent", None)]
+    if node.operator in ("+", "-") and isinstance(node.right, Percent):
+        # ``a ± b%``: el porcentaje se calcula sobre el operando izquierdo.
+        return (_emit(node.left) + _emit(node.right.operand)
+                + [("relative", node.operator)])
+    return _emit(node.left) + _emit(node.right) + [("binary", node.operator)]
+
+
+# --------------------------------------------------- class -> CompiledPlan
+class CompiledPlan(NamedTuple):
+    """
+    Plan de evaluación plano de una expresión.
+
+    :ivar instructions: Instrucciones de pila en orden postfijo.
+    :vartype instructions: Tuple[Instruction, ...]
+    """
+    instructions: Tuple[Instruction, ...]
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """
+        Nombres de las variables que necesita el plan, sin repetir.
+
+        :rtype: Tuple[str, ...]
+        """
+        names = [arg for code, arg in self.instructions if code == "load"]
+        return tuple(dict.fromkeys(names))
+
+    def evaluate(self, **variables: Decimal) -> Decimal:
+        """
+        Evalúa el plan con las operaciones de ``Calculator``.
+
+        :param variables: Valor de cada variable de la expresión. Los que no
+            son ``Decimal`` ni ``int`` se convierten desde su texto, como en
+            los lotes de ``Calculator`` (``0.1`` es ``Decimal("0.1")``).
+        :type variables: Decimal
+        :returns: Resultado de la expresión.
+        :rtype: Decimal
+        :raises ZeroDivisionError: Si se divide por cero.
+        :raises KeyError: Si falta el valor de una variable.
+        """
+        stack: List[Decimal] = []
+        push = stack.append
+        pop = stack.pop
+        for code, arg in self.instructions:
+            if code == "push":
+                push(arg)
+            elif code == "load":
+                push(_to_decimal(variables[arg]))
+            elif code == "binary":
+                right = pop()
+                push(_BINARY_OPERATIONS[arg](pop(), right))
+            elif code == "relative":
+                rate = pop()
+                base = pop()
+                push(_BINARY_OPERATIONS[arg](
+                    base, Calculator.percent(base, rate)))
+            elif code == "negate":
+                push(pop().copy_negate())
+            else:
+                push(Calculator.percent(pop(), Decimal(1)))
+        return stack[0]
+
+
+@lru_cache(maxsize=1000)
+def compile_expression(text: str) -> CompiledPlan:
+    """
+    Analiza, pliega y compila una expresión a un plan de evaluación.
+
+    El resultado se guarda en una caché LRU indexada por el texto, por lo
+    que las expresiones repetidas no vuelven a analizarse.
+
+    :param text: Expresión a compilar.
+    :type text: str
+    :returns: Plan de evaluación.
+    :rtype: CompiledPlan
+    :raises ValueError: Si la expresión está mal formada.
+    """
+    return CompiledPlan(tuple(_emit(fold_constants(parse(text)))))
+
+
+def evaluate(text: str, **variables: Decimal) -> Decimal:
+    """
+    Evalúa una expresión completa.
+
+    :param text: Expresión a evaluar, por ejemplo ``12.5*(3+4)/7 - 10%``.
+    :type text: str
+    :param variables: Valor de cada variable de la expresión.
+    :type variables: Decimal
+    :returns: Resultado de la expresión.
+    :rtype: Decimal
+    :raises ValueError: Si la expresión está mal formada.
+    :raises ZeroDivisionError: Si se divide por cero.
+    """
+    return compile_expression(text).evaluate(**variables)
@@ -0,0 +1,509 @@
+# MODULO: fixed_point.py
+"""
+Motor de punto fijo basado en enteros escalados.
+
+La interfaz guarda siempre el resultado cuantizado a dos decimales
+(``quantize(Decimal("0.00"))``), por lo que la mayor parte del trabajo solo
+necesita precisión de céntimos. Este módulo implementa la clase
+FixedPointCalculator, que realiza las mismas operaciones que ``Calculator``
+con aritmética entera de Python:
+
+- Los operandos se convierten a fracciones exactas ``numerador/denominador``.
+- El resultado exacto se redondea a la precisión de ``Calculator`` (28
+  dígitos) y después a la escala pedida, reproduciendo el doble redondeo que
+  hace hoy ``Calculator.<operación>(...).quantize(...)``.
+
+El resultado es idéntico al del camino Decimal, incluido el signo de los
+ceros (``-0.00``) y las excepciones (``ZeroDivisionError`` al dividir por
+cero e ``InvalidOperation`` cuando el resultado no cabe en la precisión).
+"""
+from decimal import (
+    Context,
+    Decimal,
+    InvalidOperation,
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+)
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .calculator import BatchResult, Calculator, _pairs, _to_decimal
+
+_ROUNDING_MODES = (
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+)
+
+_HALF_ROUNDINGS = (ROUND_HALF_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP)
+
+# log10(2): estimación del orden de magnitud a partir de bit_length().
+_LOG10_2 = 0.30102999566398120
+
+# Dígitos de margen entre la precisión y la escala para redondear una sola
+# vez: por debajo de ``10 ** (precision - _GUARD_DIGITS)`` el redondeo a
+# ``precision`` dígitos solo puede alterar valores casi empatados.
+_GUARD_DIGITS = 9
+_GUARD = 10 ** _GUARD_DIGITS
+
+
+def _round_quotient(
+        quotient: int,
+        remainder: int,
+        denominator: int,
+        negative: bool,
+        rounding: str) -> int:
+    """
+    Redondea un cociente entero a partir de su resto.
+
+    :param quotient: Cociente por defecto (suelo) de la división.
+    :type quotient: int
+    :param remainder: Resto no negativo de la división.
+    :type remainder: int
+    :param denominator: Denominador, siempre positivo.
+    :type denominator: int
+    :param negative: Indica si el valor dividido es negativo.
+    :type negative: bool
+    :param rounding: Modo de redondeo del módulo ``decimal``.
+    :type rounding: str
+    :returns: Cociente redondeado.
+    :rtype: int
+    """
+    if remainder == 0:
+        return quotient
+
+    # ``quotient`` es el suelo; el único otro candidato es ``quotient + 1``.
+    if rounding == ROUND_FLOOR:
+        return quotient
+    if rounding == ROUND_CEILING:
+        return quotient + 1
+    if rounding == ROUND_DOWN:
+        return quotient + 1 if negative else quotient
+    if rounding == ROUND_UP:
+        return quotient if negative else quotient + 1
+
+    twice = 2 * remainder
+    if twice < denominator:
+        return quotient
+    if twice > denominator:
+        return quotient + 1
+    if rounding == ROUND_HALF_EVEN:
+        return quotient + (quotient & 1)
+    if rounding == ROUND_HALF_UP:
+        return quotient if negative else quotient + 1
+    return quotient + 1 if negative else quotient
+
+
+def _round_div(numerator: int, denominator: int, rounding: str) -> int:
+    """
+    Divide dos enteros redondeando el cociente con el modo indicado.
+
+    :param numerator: Numerador (con signo).
+    :type numerator: int
+    :param denominator: Denominador, siempre positivo.
+    :type denominator: int
+    :param rounding: Modo de redondeo del módulo ``decimal``.
+    :type rounding: str
+    :returns: Cociente redondeado.
+    :rtype: int
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    return _round_quotient(quotient, remainder, denominator, numerator < 0,
+                           rounding)
+
+
+def _is_at_least_pow10(value: int, denominator: int, exponent: int) -> bool:
+    """
+    Indica si ``value / denominator >= 10 ** exponent``.
+
+    :param value: Numerador positivo.
+    :type value: int
+    :param denominator: Denominador positivo.
+    :type denominator: int
+    :param exponent: Exponente de la potencia de diez.
+    :type exponent: int
+    :rtype: bool
+    """
+    if exponent >= 0:
+        return value >= denominator * 10 ** exponent
+    return value * 10 ** -exponent >= denominator
+
+
+# ---------------------------------------------- class -> FixedPointCalculator
+class FixedPointCalculator:
+    """
+    Calculadora de punto fijo sobre enteros escalados.
+
+    Un valor escalado ``raw`` representa ``raw / 10 ** scale``. Los métodos
+    ``add``, ``subtract``, ``multiply``, ``divide`` y ``percent`` reciben
+    Decimals y devuelven el mismo Decimal que
+    ``Calculator.<operación>(v1, v2).quantize(Decimal(10) ** -scale)`` con
+    ``rounding`` como modo de redondeo del contexto.
+
+    ``apply_scaled`` trabaja directamente con enteros escalados, sin crear
+    Decimals, para lotes que ya se almacenan en céntimos.
+
+    :ivar scale: Número de decimales del resultado.
+    :vartype scale: int
+    :ivar rounding: Modo de redondeo del módulo ``decimal``.
+    :vartype rounding: str
+    :ivar precision: Dígitos significativos de la operación intermedia.
+    :vartype precision: int
+    """
+
+    def __init__(
+            self,
+            scale: int = 2,
+            rounding: str = ROUND_HALF_EVEN,
+            precision: Optional[int] = None) -> None:
+        """
+        Constructor de la clase FixedPointCalculator.
+
+        :param scale: Número de decimales del resultado (por defecto 2).
+        :type scale: int
+        :param rounding: Modo de redondeo (por defecto ``ROUND_HALF_EVEN``,
+            el del contexto decimal por defecto).
+        :type rounding: str
+        :param precision: Dígitos significativos de la operación intermedia.
+            Por defecto, la precisión de ``Calculator``.
+        :type precision: Optional[int]
+        :raises ValueError: Si la escala es negativa o el modo de redondeo
+            no está soportado.
+        """
+        if scale < 0:
+            raise ValueError("La escala no puede ser negativa")
+        if rounding not in _ROUNDING_MODES:
+            raise ValueError(f"Modo de redondeo no soportado: {rounding}")
+        self.scale = scale
+        self.rounding = rounding
+        self.precision = precision or Calculator._PRECISION
+        self._factor = 10 ** scale
+        self._limit = 10 ** self.precision
+        self._single_rounding_limit = 10 ** (self.precision - _GUARD_DIGITS)
+        self._directed = rounding not in _HALF_ROUNDINGS
+        self._context = Context(prec=self.precision + 1)
+
+    # ............................................ conversión de valores
+    def to_scaled(self, value: Any) -> int:
+        """
+        Convierte un valor a entero escalado, redondeando a ``scale``.
+
+        :param value: Valor a convertir (Decimal, int, float o str).
+        :type value: Any
+        :returns: Entero escalado.
+        :rtype: int
+        """
+        numerator, denominator = _to_decimal(value).as_integer_ratio()
+        return _round_div(numerator * self._factor, denominator,
+                          self.rounding)
+
+    def from_scaled(self, raw: int, negative: bool = False) -> Decimal:
+        """
+        Convierte un entero escalado a Decimal con ``scale`` decimales.
+
+        :param raw: Entero escalado.
+        :type raw: int
+        :param negative: Si ``raw`` es cero, indica que el cero es negativo.
+        :type negative: bool
+        :returns: Valor como Decimal.
+        :rtype: Decimal
+        """
+        result = Decimal(raw).scaleb(-self.scale, self._context)
+        if negative and raw == 0:
+            return result.copy_negate()
+        return result
+
+    # ................................................... núcleo entero
+    def _quantize(self, numerator: int, denominator: int) -> int:
+        """
+        Redondea la fracción exacta como lo hace el camino Decimal.
+
+        Primero redondea a ``precision`` dígitos significativos (la
+        operación de ``Calculator``) y después a ``scale`` decimales (el
+        ``quantize`` de la interfaz).
+
+        :param numerator: Numerador del resultado exacto.
+        :type numerator: int
+        :param denominator: Denominador positivo del resultado exacto.
+        :type denominator: int
+        :returns: Resultado como entero escalado.
+        :rtype: int
+        :raises InvalidOperation: Si el resultado no cabe en ``precision``
+            dígitos con ``scale`` decimales.
+        """
+        scaled, remainder = divmod(numerator * self._factor, denominator)
+        if remainder == 0:
+            if -self._limit < scaled < self._limit:
+                return scaled
+        elif (-self._single_rounding_limit < scaled
+              < self._single_rounding_limit
+              and (self._directed
+                   or abs(2 * remainder - denominator) * _GUARD
+                   > denominator)):
+            # Lejos de la precisión y de un empate el doble redondeo
+            # coincide con redondear una sola vez.
+            return _round_quotient(scaled, remainder, denominator,
+                                   numerator < 0, self.rounding)
+        if numerator == 0:
+            return 0
+
+        magnitude = abs(numerator)
+        adjusted = int(
+            (magnitude.bit_length() - denominator.bit_length()) * _LOG10_2)
+        while not _is_at_least_pow10(magnitude, denominator, adjusted):
+            adjusted -= 1
+        while _is_at_least_pow10(magnitude, denominator, adjusted + 1):
+            adjusted += 1
+
+        shift = self.precision - 1 - adjusted
+        if shift >= 0:
+            coefficient = _round_div(numerator * 10 ** shift, denominator,
+                                     self.rounding)
+        else:
+            coefficient = _round_div(numerator, denominator * 10 ** -shift,
+                                     self.rounding)
+
+        if shift <= self.scale:
+            raw = coefficient * 10 ** (self.scale - shift)
+        else:
+            raw = _round_div(coefficient, 10 ** (shift - self.scale),
+                             self.rounding)
+
+        if not -self._limit < raw < self._limit:
+            raise InvalidOperation(
+                "El resultado excede la precisión de la calculadora")
+        return raw
+
+    def _zero_sign(
+            self,
+            operator: str,
+            value_1: Decimal,
+            value_2: Decimal) -> bool:
+        """
+        Signo de un resultado exactamente cero, según las reglas Decimal.
+
+        :param operator: Operador de la operación.
+        :type operator: str
+        :param value_1: Primer operando.
+        :type value_1: Decimal
+        :param value_2: Segundo operando.
+        :type value_2: Decimal
+        :returns: True si el cero resultante es negativo.
+        :rtype: bool
+        """
+        sign_1 = value_1.is_signed()
+        sign_2 = value_2.is_signed()
+        if operator in ("*", "/", "%"):
+            return sign_1 != sign_2
+        if operator == "-":
+            sign_2 = not sign_2
+        if sign_1 == sign_2:
+            return sign_1
+        return self.rounding == ROUND_FLOOR
+
+    def _compute(
+            self,
+            operator: str,
+            value_1: Decimal,
+            value_2: Decimal) -> Tuple[int, bool]:
+        """
+        Calcula una operación y devuelve el entero escalado y su signo.
+
+        :param operator: Operador: ``+``, ``-``, ``*``, ``/`` o ``%``.
+        :type operator: str
+        :param value_1: Primer operando.
+        :type value_1: Decimal
+        :param value_2: Segundo operando.
+        :type value_2: Decimal
+        :returns: Tupla ``(raw, negative)``.
+        :rtype: Tuple[int, bool]
+        :raises ZeroDivisionError: Si se divide por cero.
+        :raises ValueError: Si el operador no existe.
+        """
+        numerator_1, denominator_1 = value_1.as_integer_ratio()
+        numerator_2, denominator_2 = value_2.as_integer_ratio()
+
+        if operator in ("+", "-"):
+            if operator == "-":
+                numerator_2 = -numerator_2
+            if denominator_1 == denominator_2:
+                numerator = numerator_1 + numerator_2
+                denominator = denominator_1
+            else:
+                numerator = (numerator_1 * denominator_2
+                             + numerator_2 * denominator_1)
+                denominator = denominator_1 * denominator_2
+        elif operator == "*":
+            numerator = numerator_1 * numerator_2
+            denominator = denominator_1 * denominator_2
+        elif operator == "%":
+            numerator = numerator_1 * numerator_2
+            denominator = denominator_1 * denominator_2 * 100
+        elif operator == "/":
+            if numerator_2 == 0:
+                raise ZeroDivisionError("No se puede dividir por cero")
+            numerator = numerator_1 * denominator_2
+            denominator = denominator_1 * numerator_2
+            if denominator < 0:
+                numerator, denominator = -numerator, -denominator
+        else:
+            raise ValueError(f"Operador no soportado: {operator}")
+
+        raw = self._quantize(numerator, denominator)
+        if numerator == 0:
+            return raw, self._zero_sign(operator, value_1, value_2)
+        return raw, numerator < 0
+
+    def calculate(self, operator: str, value_1: Any, value_2: Any) -> Decimal:
+        """
+        Calcula ``value_1 <operator> value_2`` con ``scale`` decimales.
+
+        :param operator: Operador: ``+``, ``-``, ``*``, ``/`` o ``%``.
+        :type operator: str
+        :param value_1: Primer operando.
+        :type value_1: Any
+        :param value_2: Segundo operando.
+        :type value_2: Any
+        :returns: Resultado con ``scale`` decimales.
+        :rtype: Decimal
+        """
+        raw, negative = self._compute(
+            operator, _to_decimal(value_1), _to_decimal(value_2))
+        return self.from_scaled(raw, negative)
+
+    # ............................................. operaciones públicas
+    def add(self, value_1: Decimal, value_2: Decimal) -> Decimal:
+        """
+        Suma dos valores.
+
+        :rtype: Decimal
+        """
+        return self.calculate("+", value_1, value_2)
+
+    def subtract(self, value_1: Decimal, value_2: Decimal) -> Decimal:
+        """
+        Resta dos valores.
+
+        :rtype: Decimal
+        """
+        return self.calculate("-", value_1, value_2)
+
+    def multiply(self, value_1: Decimal, value_2: Decimal) -> Decimal:
+        """
+        Multiplica dos valores.
+
+        :rtype: Decimal
+        """
+        return self.calculate("*", value_1, value_2)
+
+    def divide(self, value_1: Decimal, value_2: Decimal) -> Decimal:
+        """
+        Divide dos valores.
+
+        :rtype: Decimal
+        :raises ZeroDivisionError: Si el divisor es cero.
+        """
+        return self.calculate("/", value_1, value_2)
+
+    def percent(self, value_1: Decimal, value_2: Decimal) -> Decimal:
+        """
+        Calcula el porcentaje ``value_2`` de ``value_1``.
+
+        :rtype: Decimal
+        """
+        return self.calculate("%", value_1, value_2)
+
+    # .......................................................... lotes
+    def apply(
+            self,
+            operator: str,
+            values_1: Iterable[Any],
+            values_2: Iterable[Any]) -> BatchResult:
+        """
+        Aplica una operación a cada par de operandos.
+
+        Mismo contrato que :meth:`Calculator.apply`, con los resultados ya
+        cuantizados a ``scale`` decimales.
+
+        :param operator: Operador: ``+``, ``-``, ``*``, ``/`` o ``%``.
+        :type operator: str
+        :param values_1: Primeros operandos.
+        :type values_1: Iterable[Any]
+        :param values_2: Segundos operandos, de la misma longitud.
+        :type values_2: Iterable[Any]
+        :returns: Resultados y errores por posición.
+        :rtype: BatchResult
+        :raises ValueError: Si el operador no existe o las secuencias tienen
+            distinta longitud.
+        """
+        if operator not in ("+", "-", "*", "/", "%"):
+            raise ValueError(f"Operador no soportado: {operator}")
+        results: List[Optional[Decimal]] = []
+        errors: Dict[int, str] = {}
+
+        for index, (value_1, value_2) in enumerate(
+                _pairs(values_1, values_2)):
+            try:
+                results.append(self.calculate(operator, value_1, value_2))
+            except (ZeroDivisionError, InvalidOperation) as error:
+                results.append(None)
+                errors[index] = str(error)
+
+        return BatchResult(results, errors)
+
+    def apply_scaled(
+            self,
+            operator: str,
+            raws_1: Iterable[int],
+            raws_2: Iterable[int]) -> List[Optional[int]]:
+        """
+        Aplica una operación a enteros ya escalados a ``scale`` decimales.
+
+        Es el camino más rápido: no crea Decimals. Los enteros no guardan el
+        signo de un cero negativo; si ese detalle importa, usar ``apply``.
+        Las divisiones por cero devuelven ``None`` en su posición.
+
+        :param operator: Operador: ``+``, ``-``, ``*``, ``/`` o ``%``.
+        :type operator: str
+        :param raws_1: Primeros operandos escalados.
+        :type raws_1: Iterable[int]
+        :param raws_2: Segundos operandos escalados.
+        :type raws_2: Iterable[int]
+        :returns: Resultados escalados.
+        :rtype: List[Optional[int]]
+        :raises InvalidOperation: Si un resultado no cabe en ``precision``.
+        :raises ValueError: Si el operador no existe o las secuencias tienen
+            distinta longitud.
+        """
+        factor = self._factor
+        quantize = self._quantize
+        pairs = _pairs(raws_1, raws_2)
+
+        if operator == "+":
+            return [quantize(raw_1 + raw_2, factor) for raw_1, raw_2 in pairs]
+        if operator == "-":
+            return [quantize(raw_1 - raw_2, factor) for raw_1, raw_2 in pairs]
+        if operator == "*":
+            square = factor * factor
+            return [quantize(raw_1 * raw_2, square) for raw_1, raw_2 in pairs]
+        if operator == "%":
+            square = factor * factor * 100
+            return [quantize(raw_1 * raw_2, square) for raw_1, raw_2 in pairs]
+        if operator == "/":
+            results: List[Optional[int]] = []
+            for raw_1, raw_2 in pairs:
+                if raw_2 == 0:
+                    results.append(None)
+                elif raw_2 < 0:
+                    results.append(quantize(-raw_1, -raw_2))
+                else:
+                    results.append(quantize(raw_1, raw_2))
+            return results
+        raise ValueError(f"Operador no soportado: {operator}")
@@ -0,0 +1,212 @@
+# MODULO: float_fast_path.py
+"""
+Modo rápido opcional en float64 (NumPy) con recálculo Decimal.
+
+Para lotes analíticos grandes, la clase FloatFastPath calcula las
+operaciones de ``Calculator`` de forma vectorizada en float64 y acota el
+error de cada elemento. Solo los elementos cuya cota podría cambiar el
+resultado cuantizado a ``0.00`` se recalculan con los métodos Decimal de
+``Calculator``:
+
+- Resultados cercanos a un empate de redondeo (``x.xx5``).
+- Resultados cercanos a cero, donde el signo de ``-0.00`` es incierto.
+- Resultados fuera del rango exacto de float64 o no finitos.
+
+Así, los valores devueltos son idénticos a los que guarda hoy
+``ButtonsCreator.calculate_result``. NumPy es una dependencia opcional
+(``pip install .[fast]``).
+"""
+import sys
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .calculator import BatchResult, Calculator, _to_decimal
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+# Error relativo de redondeo de float64 y mitad del menor subnormal.
+_UNIT_ROUNDOFF = sys.float_info.epsilon / 2
+_TINY = 5e-324 / 2
+# Error relativo del redondeo de Decimal a 28 dígitos, con margen.
+_DECIMAL_ROUNDOFF = 1e-27
+# Multiplicador de seguridad sobre la cota teórica.
+_SAFETY = 4.0
+# Por encima de 2**52 float64 ya no distingue los céntimos.
+_EXACT_LIMIT = 2.0 ** 52
+
+_DECIMAL_OPERATIONS: Dict[str, Callable[[Decimal, Decimal], Decimal]] = {
+    "+": Calculator.add,
+    "-": Calculator.subtract,
+    "*": Calculator.multiply,
+    "/": Calculator.divide,
+    "%": Calculator.percent,
+}
+
+
+# ----------------------------------------------------- class -> FloatFastPath
+class FloatFastPath:
+    """
+    Evalúa lotes en float64 y recurre a Decimal solo cuando es necesario.
+
+    :ivar scale: Número de decimales del resultado cuantizado.
+    :vartype scale: int
+    :ivar stats: Contadores acumulados de elementos resueltos en float
+        (``fast``) y recalculados con Decimal (``fallback``).
+    :vartype stats: Dict[str, int]
+    """
+
+    def __init__(self, scale: int = 2) -> None:
+        """
+        Constructor de la clase FloatFastPath.
+
+        :param scale: Número de decimales del resultado (por defecto 2).
+        :type scale: int
+        :raises ImportError: Si NumPy no está instalado.
+        """
+        if np is None:
+            raise ImportError(
+                "El modo rápido requiere NumPy: pip install numpy")
+        self.scale = scale
+        self._quantum = Decimal(1).scaleb(-scale)
+        self.stats: Dict[str, int] = {"fast": 0, "fallback": 0}
+
+    @staticmethod
+    def _as_floats(values: Any) -> tuple:
+        """
+        Convierte los operandos a un array float64.
+
+        Los arrays de floats se usan tal cual; su valor Decimal equivalente
+        es el de su representación en texto, como en ``Calculator.apply``.
+        El resto de valores se convierte primero a Decimal.
+
+        :param values: Operandos (iterable o array).
+        :type values: Any
+        :returns: Tupla ``(floats, decimals)``; ``decimals`` es ``None``
+            si se recibió un array de floats.
+        :rtype: tuple
+        """
+        if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+            return values.astype(np.float64, copy=False), None
+        decimals = [_to_decimal(value) for value in values]
+        return np.array([float(value) for value in decimals],
+                        dtype=np.float64), decimals
+
+    @staticmethod
+    def _error_bound(operator: str, floats_1, floats_2, result):
+        """
+        Cota superior del error absoluto de ``result`` frente al valor que
+        calcularía ``Calculator`` con Decimal.
+
+        :returns: Array con la cota de cada elemento.
+        """
+        abs_1 = np.abs(floats_1)
+        abs_2 = np.abs(floats_2)
+        abs_result = np.abs(result)
+        # Error de convertir cada operando Decimal a float64.
+        error_1 = abs_1 * _UNIT_ROUNDOFF + _TINY
+        error_2 = abs_2 * _UNIT_ROUNDOFF + _TINY
+        rounding = abs_result * (_UNIT_ROUNDOFF + _DECIMAL_ROUNDOFF) + _TINY
+
+        if operator in ("+", "-"):
+            bound = error_1 + error_2 + rounding
+        elif operator in ("*", "%"):
+            bound = abs_1 * error_2 + abs_2 * error_1 + error_1 * error_2
+            if operator == "%":
+                bound = bound / 100 + 2 * rounding
+            else:
+                bound = bound + rounding
+        else:
+            margin = abs_2 - error_2
+            bound = np.where(
+                margin > 0,
+                (error_1 + abs_result * error_2) / np.where(
+                    margin > 0, margin, 1.0),
+                np.inf,
+            ) + rounding
+        return bound * _SAFETY
+
+    def apply(
+            self,
+            operator: str,
+            values_1: Iterable[Any],
+            values_2: Iterable[Any]) -> BatchResult:
+        """
+        Aplica una operación a cada par y cuantiza el resultado a ``scale``.
+
+        Devuelve lo mismo que
+        ``Calculator.<operación>(v1, v2).quantize(Decimal("0.00"))``
+        elemento a elemento, con el contrato de errores de
+        :meth:`Calculator.apply`.
+
+        :param operator: Operador: ``+``, ``-``, ``*``, ``/`` o ``%``.
+        :type operator: str
+        :param values_1: Primeros operandos (iterable o array).
+        :type values_1: Iterable[Any]
+        :param values_2: Segundos operandos, de la misma longitud.
+        :type values_2: Iterable[Any]
+        :returns: Resultados cuantizados y errores por posición.
+        :rtype: BatchResult
+        :raises ValueError: Si el operador no existe o las secuencias tienen
+            distinta longitud.
+        """
+        if operator not in _DECIMAL_OPERATIONS:
+            raise ValueError(f"Operador no soportado: {operator}")
+        floats_1, decimals_1 = self._as_floats(values_1)
+        floats_2, decimals_2 = self._as_floats(values_2)
+        if floats_1.shape != floats_2.shape:
+            raise ValueError("Las secuencias de operandos deben tener la "
+                             "misma longitud")
+
+        with np.errstate(all="ignore"):
+            if operator == "+":
+                result = floats_1 + floats_2
+            elif operator == "-":
+                result = floats_1 - floats_2
+            elif operator == "*":
+                result = floats_1 * floats_2
+            elif operator == "/":
+                result = floats_1 / floats_2
+            else:
+                result = (floats_1 * floats_2) / 100
+            factor = 10.0 ** self.scale
+            scaled = result * factor
+            bound = (self._error_bound(operator, floats_1, floats_2, result)
+                     * factor + np.abs(scaled) * _UNIT_ROUNDOFF) * 2
+            distance_to_tie = np.abs(scaled - np.floor(scaled) - 0.5)
+            needs_decimal = ~(
+                np.isfinite(scaled)
+                & np.isfinite(bound)
+                & (np.abs(scaled) < _EXACT_LIMIT)
+                & (np.abs(scaled) > bound)
+                & (distance_to_tie > bound)
+            )
+            rounded = np.rint(scaled)
+
+        results: List[Optional[Decimal]] = []
+        errors: Dict[int, str] = {}
+        operation = _DECIMAL_OPERATIONS[operator]
+        for index, (fallback, raw, negative) in enumerate(zip(
+                needs_decimal.tolist(), rounded.tolist(),
+                np.signbit(scaled).tolist())):
+            if not fallback:
+                value = Decimal(int(raw)).scaleb(-self.scale)
+                results.append(value.copy_negate()
+                               if negative and raw == 0 else value)
+                continue
+            value_1 = (decimals_1[index] if decimals_1 is not None
+                       else _to_decimal(float(floats_1[index])))
+            value_2 = (decimals_2[index] if decimals_2 is not None
+                       else _to_decimal(float(floats_2[index])))
+            try:
+                results.append(
+                    operation(value_1, value_2).quantize(self._quantum))
+            except (ZeroDivisionError, InvalidOperation) as error:
+                results.append(None)
+                errors[index] = str(error)
+
+        fallbacks = int(needs_decimal.sum())
+        self.stats["fallback"] += fallbacks
+        self.stats["fast"] += len(results) - fallbacks
+        return BatchResult(results, errors)
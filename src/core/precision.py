@@ -0,0 +1,38 @@
+# MODULO: precision.py
+"""
+Caché de contextos decimales por precisión y modo de redondeo.
+
+Abrir un ``localcontext()`` y fijar ``ctx.prec`` en cada operación supone
+una parte importante del coste de operar con Decimals pequeños. Este módulo
+construye una sola vez cada ``decimal.Context`` necesario, indexado por
+``(precision, rounding)``, para que las operaciones llamen directamente a
+sus métodos (``context.add``, ``context.divide``, ...), sin tocar el
+contexto del hilo.
+
+Los contextos creados no se modifican después; solo acumulan banderas
+(``Inexact``, ``Rounded``), que no afectan a los resultados.
+"""
+from decimal import Context, ROUND_HALF_EVEN
+from functools import lru_cache
+
+DEFAULT_ROUNDING = ROUND_HALF_EVEN
+
+
+@lru_cache(maxsize=128)
+def get_context(precision: int, rounding: str = DEFAULT_ROUNDING) -> Context:
+    """
+    Devuelve el contexto decimal para una precisión y un redondeo.
+
+    Cada combinación se construye una sola vez y se reutiliza en las
+    llamadas siguientes.
+
+    :param precision: Número de dígitos significativos.
+    :type precision: int
+    :param rounding: Modo de redondeo del módulo ``decimal`` (por defecto
+        ``ROUND_HALF_EVEN``, el del contexto por defecto).
+    :type rounding: str
+    :returns: Contexto compartido para esa combinación.
+    :rtype: Context
+    :raises ValueError: Si la precisión no es válida.
+    """
+    return Context(prec=precision, rounding=rounding)
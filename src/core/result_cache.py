@@ -0,0 +1,451 @@
+# MODULO: result_cache.py
+"""
+Caché de resultados compartida e instrumentada para ``Calculator``.
+
+Sustituye a los ``lru_cache(maxsize=1000)`` independientes de cada
+operación por una única caché que:
+
+- Usa claves canónicas que incluyen el exponente y el signo de cada operando
+  (``str(Decimal)``), de modo que ``Decimal('2.0')`` y ``Decimal('2')``, o
+  ``Decimal('-0')`` y ``Decimal('0')``, no comparten entrada.
+- Tiene un límite global por número de entradas y por tamaño aproximado en
+  bytes, para que Decimals enormes no retengan memoria.
+- Permite elegir la política de desalojo: ``lru``, ``lfu`` o ``fifo``.
+- Normaliza el orden de los operandos de las operaciones conmutativas
+  (``+`` y ``*``), de modo que ``a+b`` y ``b+a`` comparten entrada.
+- Expone contadores de aciertos, fallos y desalojos.
+- Admite un almacén persistente opcional (``attach_store``) que se consulta
+  cuando falla la memoria y recibe cada resultado nuevo, de modo que los
+  cálculos repetidos entre ejecuciones sean consultas
+  (``database/memo_store.py``).
+
+Es segura para uso concurrente (protegida con un ``threading.Lock``).
+"""
+import sys
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from functools import wraps
+from typing import Any, Callable, Dict, NamedTuple, Optional, Protocol, Tuple
+
+POLICIES = ("lru", "lfu", "fifo")
+
+# Operadores cuyo resultado Decimal no depende del orden de los operandos
+# (incluidos el exponente y el signo de los ceros).
+COMMUTATIVE_OPERATORS = frozenset(("+", "*"))
+
+# Coste fijo aproximado de una entrada: tupla de clave y registro del dict.
+_ENTRY_OVERHEAD = 200
+
+CacheKey = Tuple[str, Optional[int], str, str]
+FastPath = Callable[[Decimal, Decimal, Optional[int]], Optional[Decimal]]
+
+
+# -------------------------------------------------------- class -> ResultStore
+class ResultStore(Protocol):
+    """
+    Interfaz de un almacén persistente de resultados para ``ResultCache``.
+    """
+
+    def get(self, key: CacheKey) -> Optional[Decimal]:
+        """Devuelve el resultado guardado o ``None``."""
+
+    def put(self, key: CacheKey, result: Decimal) -> None:
+        """Guarda un resultado."""
+
+
+# --------------------------------------------------------- class -> CacheStats
+class CacheStats(NamedTuple):
+    """
+    Fotografía de los contadores de la caché.
+
+    :ivar hits: Consultas resueltas desde la caché.
+    :ivar misses: Consultas que tuvieron que calcularse.
+    :ivar evictions: Entradas desalojadas por los límites.
+    :ivar entries: Entradas almacenadas.
+    :ivar bytes: Tamaño aproximado de las entradas almacenadas.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Proporción de aciertos sobre el total de consultas.
+
+        :rtype: float
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# -------------------------------------------------------- class -> ResultCache
+class ResultCache:
+    """
+    Caché acotada de resultados de operaciones binarias.
+
+    :ivar max_entries: Número máximo de entradas.
+    :vartype max_entries: int
+    :ivar max_bytes: Tamaño máximo aproximado en bytes.
+    :vartype max_bytes: int
+    :ivar policy: Política de desalojo (``lru``, ``lfu`` o ``fifo``).
+    :vartype policy: str
+    :ivar normalize_commutative: Si es True, ``a+b`` y ``b+a`` (y ``a*b`` y
+        ``b*a``) comparten entrada.
+    :vartype normalize_commutative: bool
+    :ivar store: Almacén persistente opcional (ver :meth:`attach_store`).
+    :vartype store: Optional[ResultStore]
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 5000,
+            max_bytes: int = 4 * 1024 * 1024,
+            policy: str = "lru",
+            normalize_commutative: bool = True) -> None:
+        """
+        Constructor de la clase ResultCache.
+
+        :param max_entries: Número máximo de entradas (por defecto 5000, el
+            total de las cinco cachés ``lru_cache`` anteriores).
+        :type max_entries: int
+        :param max_bytes: Tamaño máximo aproximado en bytes.
+        :type max_bytes: int
+        :param policy: Política de desalojo.
+        :type policy: str
+        :param normalize_commutative: Normaliza el orden de los operandos de
+            ``+`` y ``*`` en las claves.
+        :type normalize_commutative: bool
+        :raises ValueError: Si la política no existe.
+        """
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[Decimal, int]]" = (
+            OrderedDict())
+        # LFU: frecuencia de cada clave y, por frecuencia, sus claves en
+        # orden de llegada, para desalojar sin recorrer todas las entradas.
+        self._frequencies: Dict[CacheKey, int] = {}
+        self._buckets: "Dict[int, OrderedDict[CacheKey, None]]" = {}
+        self._min_frequency = 0
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.normalize_commutative = normalize_commutative
+        self.store: Optional[ResultStore] = None
+        self.configure(max_entries, max_bytes, policy)
+
+    # ................................................... configuración
+    def configure(
+            self,
+            max_entries: Optional[int] = None,
+            max_bytes: Optional[int] = None,
+            policy: Optional[str] = None) -> None:
+        """
+        Cambia los límites o la política en tiempo de ejecución.
+
+        Si los nuevos límites son menores, se desalojan entradas hasta
+        cumplirlos.
+
+        :param max_entries: Nuevo número máximo de entradas.
+        :type max_entries: Optional[int]
+        :param max_bytes: Nuevo tamaño máximo aproximado en bytes.
+        :type max_bytes: Optional[int]
+        :param policy: Nueva política de desalojo.
+        :type policy: Optional[str]
+        :raises ValueError: Si la política no existe o un límite es negativo.
+        """
+        if policy is not None and policy not in POLICIES:
+            raise ValueError(f"Política de caché no soportada: {policy}")
+        if (max_entries is not None and max_entries < 0) or (
+                max_bytes is not None and max_bytes < 0):
+            raise ValueError("Los límites de la caché no pueden ser "
+                             "negativos")
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if policy is not None and policy != self.policy:
+                self.policy = policy
+                self._frequencies = dict.fromkeys(self._entries, 1)
+                self._buckets = ({1: OrderedDict.fromkeys(self._entries)}
+                                 if self._entries else {})
+                self._min_frequency = 1 if self._entries else 0
+            self._evict()
+
+    def attach_store(self, store: Optional[ResultStore]) -> None:
+        """
+        Conecta (o, con ``None``, desconecta) un almacén persistente.
+
+        Con un almacén conectado, una consulta que falla en memoria se busca
+        en el almacén (y cuenta como acierto si está allí), y cada resultado
+        nuevo se guarda también en él.
+
+        :param store: Almacén con métodos ``get(key)`` y ``put(key, result)``.
+        :type store: Optional[ResultStore]
+        """
+        self.store = store
+
+    # ........................................................ consultas
+    def make_key(
+            self,
+            operator: str,
+            value_1: Decimal,
+            value_2: Decimal,
+            precision: Optional[int] = None) -> CacheKey:
+        """
+        Construye la clave canónica de una operación.
+
+        ``str(Decimal)`` distingue signo, coeficiente y exponente, por lo que
+        dos operandos iguales en valor pero con distinto exponente generan
+        claves distintas. Con ``normalize_commutative`` los operandos de
+        ``+`` y ``*`` se ordenan.
+
+        :param operator: Operador de la operación.
+        :type operator: str
+        :param value_1: Primer operando.
+        :type value_1: Decimal
+        :param value_2: Segundo operando.
+        :type value_2: Decimal
+        :param precision: Precisión pedida para la operación.
+        :type precision: Optional[int]
+        :returns: Clave de la caché.
+        :rtype: CacheKey
+        """
+        text_1 = str(value_1)
+        text_2 = str(value_2)
+        if (self.normalize_commutative and text_2 < text_1
+                and operator in COMMUTATIVE_OPERATORS):
+            text_1, text_2 = text_2, text_1
+        return (operator, precision, text_1, text_2)
+
+    def get(self, key: CacheKey) -> Optional[Decimal]:
+        """
+        Busca un resultado y actualiza los contadores.
+
+        :param key: Clave canónica de la operación.
+        :type key: CacheKey
+        :returns: Resultado almacenado o ``None`` si no existe.
+        :rtype: Optional[Decimal]
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            store = self.store
+            if entry is not None:
+                self._hits += 1
+                if self.policy == "lru":
+                    self._entries.move_to_end(key)
+                elif self.policy == "lfu":
+                    self._touch(key)
+                return entry[0]
+            if store is None:
+                self._misses += 1
+                return None
+
+        # La consulta al almacén puede tocar el disco: fuera del cerrojo.
+        result = store.get(key)
+        if result is not None:
+            self._insert(key, result)
+        with self._lock:
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return result
+
+    def put(self, key: CacheKey, result: Decimal) -> None:
+        """
+        Almacena un resultado, desalojando entradas si es necesario.
+
+        Los resultados que por sí solos superan ``max_bytes`` no se guardan.
+
+        :param key: Clave canónica de la operación.
+        :type key: CacheKey
+        :param result: Resultado de la operación.
+        :type result: Decimal
+        """
+        self._insert(key, result)
+        store = self.store
+        if store is not None:
+            store.put(key, result)
+
+    def _insert(self, key: CacheKey, result: Decimal) -> None:
+        """
+        Almacena un resultado en memoria (sin pasar por el almacén).
+
+        :param key: Clave canónica de la operación.
+        :type key: CacheKey
+        :param result: Resultado de la operación.
+        :type result: Decimal
+        """
+        # sys.getsizeof() de un Decimal no incluye su coeficiente; se estima
+        # a partir de su número de cifras (algo menos de medio byte cada una).
+        size = (_ENTRY_OVERHEAD + sys.getsizeof(key[2])
+                + sys.getsizeof(key[3]) + sys.getsizeof(result)
+                + len(str(result)) // 2)
+        with self._lock:
+            if size > self.max_bytes or self.max_entries == 0:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self._touch(key)
+            self._bytes += size
+            self._evict()
+
+    def _touch(self, key: CacheKey) -> None:
+        """
+        Suma un uso a una clave y la pasa al grupo de su nueva frecuencia.
+        Requiere el cerrojo.
+
+        :param key: Clave canónica de la operación.
+        :type key: CacheKey
+        """
+        frequency = self._frequencies.get(key, 0)
+        if frequency:
+            bucket = self._buckets[frequency]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[frequency]
+                if self._min_frequency == frequency:
+                    self._min_frequency = frequency + 1
+        else:
+            self._min_frequency = 1
+        self._frequencies[key] = frequency + 1
+        self._buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def _forget(self, key: CacheKey) -> None:
+        """
+        Elimina una clave de las frecuencias. Requiere el cerrojo.
+
+        :param key: Clave canónica de la operación.
+        :type key: CacheKey
+        """
+        frequency = self._frequencies.pop(key)
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                # Solo se recorren las frecuencias distintas, no las entradas.
+                self._min_frequency = min(self._buckets, default=0)
+
+    def _evict(self) -> None:
+        """
+        Desaloja entradas hasta cumplir los límites. Requiere el cerrojo.
+        """
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            if self.policy == "lfu":
+                # La menor frecuencia y, a igualdad, la que llegó antes a
+                # esa frecuencia.
+                key = next(iter(self._buckets[self._min_frequency]))
+                _, size = self._entries.pop(key)
+            else:
+                key, (_, size) = self._entries.popitem(last=False)
+            self._forget(key)
+            self._bytes -= size
+            self._evictions += 1
+
+    # ................................................... mantenimiento
+    def clear(self) -> None:
+        """
+        Elimina todas las entradas (no reinicia los contadores).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._frequencies.clear()
+            self._buckets.clear()
+            self._min_frequency = 0
+            self._bytes = 0
+
+    def reset_stats(self) -> None:
+        """
+        Pone a cero los contadores de aciertos, fallos y desalojos.
+        """
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Devuelve los contadores actuales de la caché.
+
+        :rtype: CacheStats
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions,
+                              len(self._entries), self._bytes)
+
+    def __len__(self) -> int:
+        """
+        Número de entradas almacenadas.
+
+        :rtype: int
+        """
+        return len(self._entries)
+
+
+RESULT_CACHE = ResultCache()
+
+
+def cached_operation(
+        operator: str,
+        cache: ResultCache = RESULT_CACHE,
+        fast_path: Optional[FastPath] = None,
+        resolve_precision: Optional[Callable[[Optional[int]], int]] = None
+) -> Callable[..., Any]:
+    """
+    Crea un decorador que cachea una operación binaria en ``cache``.
+
+    La función decorada debe tener la firma
+    ``func(value_1, value_2, precision=None)``. Solo se cachean las llamadas
+    con dos operandos ``Decimal``; el resto se calcula directamente. Las
+    excepciones no se cachean.
+
+    Si se indica ``fast_path``, se prueba antes de consultar la caché con la
+    misma firma; cuando devuelve un resultado distinto de ``None`` se usa
+    tal cual, sin consultar ni actualizar la caché (ni sus contadores).
+
+    Si se indica ``resolve_precision``, la precisión se resuelve una sola
+    vez al principio (por ejemplo, ``None`` a la precisión por defecto) y
+    el valor resuelto llega al atajo, a la clave y a la función, de modo
+    que ``None`` y la precisión por defecto comparten entrada.
+
+    :param operator: Operador que identifica la operación en la clave.
+    :type operator: str
+    :param cache: Caché a utilizar (por defecto, la compartida).
+    :type cache: ResultCache
+    :param fast_path: Atajo opcional que resuelve algunos operandos sin
+        pasar por la caché.
+    :type fast_path: Optional[FastPath]
+    :param resolve_precision: Normaliza la precisión pedida (y valida).
+    :type resolve_precision: Optional[Callable[[Optional[int]], int]]
+    :returns: Un decorador listo para ser aplicado a una función.
+    :rtype: Callable
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(value_1, value_2, precision=None):
+            if resolve_precision is not None:
+                precision = resolve_precision(precision)
+            if type(value_1) is not Decimal or type(value_2) is not Decimal:
+                return func(value_1, value_2, precision)
+            if fast_path is not None:
+                result = fast_path(value_1, value_2, precision)
+                if result is not None:
+                    return result
+            key = cache.make_key(operator, value_1, value_2, precision)
+            result = cache.get(key)
+            if result is None:
+                result = func(value_1, value_2, precision)
+                cache.put(key, result)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,529 @@
+# MODULO: transcendental.py
+"""
+Funciones trascendentes con precisión arbitraria.
+
+Implementa raíz cuadrada, potencia, exponencial, logaritmos natural y
+decimal, y seno, coseno y tangente para ``Decimal`` con cualquier número de
+dígitos, sobre los contextos precalculados de ``core/precision.py``.
+
+- Las constantes (``pi``, ``ln 2`` y ``ln 10``) y los coeficientes de las
+  series (``1/n!``) se calculan una sola vez por precisión y se guardan en
+  caché.
+- ``pi`` se obtiene con la serie de Chudnovsky (división binaria con enteros
+  de Python) y ``ln 2`` y ``ln 10`` con fórmulas de tipo Machin de
+  ``atanh(1/n)``.
+- La exponencial reduce el argumento con ``x = k·ln 2 + r`` y divide ``r``
+  entre ``2**m`` antes de sumar la serie de Taylor; después eleva al
+  cuadrado ``m`` veces. El seno y el coseno reducen módulo ``pi/2`` y usan
+  las fórmulas del ángulo doble. Con ``m`` del orden de la raíz de la
+  precisión, 1000 o 10000 dígitos necesitan unos cientos de productos.
+- El logaritmo resuelve ``exp(y) = x`` con la iteración de Halley, triplicando
+  la precisión en cada paso.
+
+Hasta ``LIBMPDEC_PRECISION`` dígitos, ``exp``, ``ln``, ``log10`` y ``power``
+usan directamente los métodos del contexto (correctamente redondeados y más
+rápidos a poca precisión); por encima, los algoritmos anteriores, con
+dígitos de guarda para que el error no supere una unidad en la última cifra.
+
+Todas las funciones reciben la precisión de forma explícita; ``Calculator``
+les pasa ``Calculator._PRECISION`` por defecto.
+"""
+import math
+from decimal import Context, Decimal, ROUND_HALF_EVEN
+from functools import lru_cache
+from typing import Tuple
+from .precision import get_context
+
+# Precisión hasta la que se usan los métodos de decimal (ver bench).
+LIBMPDEC_PRECISION = 200
+
+# Dígitos de guarda de los cálculos intermedios.
+_GUARD_DIGITS = 10
+
+# Cota de |r| tras la reducción (pi/4 en trigonometría, ln(2)/2 en exp).
+_MAX_REDUCED = 0.8
+
+_ZERO = Decimal(0)
+_ONE = Decimal(1)
+_TWO = Decimal(2)
+_TEN = Decimal(10)
+
+# Constantes de la serie de Chudnovsky.
+_CHUDNOVSKY_C3_24 = 640320 ** 3 // 24
+_CHUDNOVSKY_DIGITS_PER_TERM = 14.18
+
+# Contexto de pocos dígitos para estimar órdenes de magnitud.
+_ESTIMATE = Context(prec=12)
+
+
+# ................................................................ constantes
+def _chudnovsky(start: int, end: int) -> Tuple[int, int, int]:
+    """
+    División binaria de los términos ``[start, end)`` de Chudnovsky.
+
+    :returns: Los enteros ``(P, Q, T)`` del intervalo.
+    :rtype: Tuple[int, int, int]
+    """
+    if end - start == 1:
+        if start == 0:
+            p_value = q_value = 1
+        else:
+            p_value = (6 * start - 5) * (2 * start - 1) * (6 * start - 1)
+            q_value = start * start * start * _CHUDNOVSKY_C3_24
+        t_value = p_value * (13591409 + 545140134 * start)
+        return p_value, q_value, -t_value if start & 1 else t_value
+    middle = (start + end) // 2
+    p_1, q_1, t_1 = _chudnovsky(start, middle)
+    p_2, q_2, t_2 = _chudnovsky(middle, end)
+    return p_1 * p_2, q_1 * q_2, q_2 * t_1 + p_1 * t_2
+
+
+@lru_cache(maxsize=32)
+def pi(precision: int) -> Decimal:
+    """
+    Devuelve ``pi`` con ``precision`` dígitos (calculado una vez).
+
+    :param precision: Número de dígitos significativos.
+    :type precision: int
+    :rtype: Decimal
+    """
+    context = get_context(precision + _GUARD_DIGITS)
+    terms = int(context.prec / _CHUDNOVSKY_DIGITS_PER_TERM) + 2
+    _, q_value, t_value = _chudnovsky(0, terms)
+    numerator = context.multiply(
+        context.multiply(Decimal(426880), context.sqrt(Decimal(10005))),
+        Decimal(q_value))
+    return get_context(precision).divide(numerator, Decimal(t_value))
+
+
+def _atanh_inverse(number: int, context: Context) -> Decimal:
+    """
+    Calcula ``atanh(1/number)`` con la serie de potencias de ``1/number``.
+
+    :param number: Entero mayor que 1.
+    :type number: int
+    :param context: Contexto de trabajo.
+    :type context: Context
+    :rtype: Decimal
+    """
+    square = number * number
+    power = context.divide(_ONE, number)
+    total = power
+    limit = total.adjusted() - context.prec - 1
+    odd = 3
+    while True:
+        power = context.divide(power, square)
+        term = context.divide(power, odd)
+        if term.adjusted() < limit:
+            return total
+        total = context.add(total, term)
+        odd += 2
+
+
+def _machin(precision: int, formula: Tuple[Tuple[int, int], ...]) -> Decimal:
+    """
+    Suma ``coeficiente * atanh(1/n)`` para cada par de la fórmula.
+
+    :rtype: Decimal
+    """
+    context = get_context(precision + _GUARD_DIGITS)
+    total = _ZERO
+    for coefficient, number in formula:
+        total = context.add(total, context.multiply(
+            coefficient, _atanh_inverse(number, context)))
+    return get_context(precision).plus(total)
+
+
+@lru_cache(maxsize=32)
+def ln2(precision: int) -> Decimal:
+    """
+    Devuelve ``ln 2`` con ``precision`` dígitos (calculado una vez).
+
+    ``ln 2 = 18·atanh(1/26) - 2·atanh(1/4801) + 8·atanh(1/8749)``.
+
+    :param precision: Número de dígitos significativos.
+    :type precision: int
+    :rtype: Decimal
+    """
+    return _machin(precision, ((18, 26), (-2, 4801), (8, 8749)))
+
+
+@lru_cache(maxsize=32)
+def ln10(precision: int) -> Decimal:
+    """
+    Devuelve ``ln 10`` con ``precision`` dígitos (calculado una vez).
+
+    ``ln 10 = 46·atanh(1/31) + 34·atanh(1/49) + 20·atanh(1/161)``.
+
+    :param precision: Número de dígitos significativos.
+    :type precision: int
+    :rtype: Decimal
+    """
+    return _machin(precision, ((46, 31), (34, 49), (20, 161)))
+
+
+# ................................................................... series
+def _halvings(precision: int) -> int:
+    """
+    Número de veces que se divide el argumento reducido entre 2.
+
+    :rtype: int
+    """
+    return math.isqrt(precision)
+
+
+@lru_cache(maxsize=32)
+def _inverse_factorials(precision: int) -> Tuple[Decimal, ...]:
+    """
+    Coeficientes ``1/n!`` suficientes para la serie de Taylor con
+    ``|r| <= _MAX_REDUCED / 2**_halvings(precision)`` (calculados una vez).
+
+    :param precision: Precisión de trabajo.
+    :type precision: int
+    :rtype: Tuple[Decimal, ...]
+    """
+    log_r = math.log10(_MAX_REDUCED) - _halvings(precision) * math.log10(2)
+    terms = 1
+    while terms * log_r - math.lgamma(terms + 1) / math.log(10) > -precision:
+        terms += 1
+    context = get_context(precision)
+    coefficients = [_ONE]
+    for number in range(1, terms + 1):
+        coefficients.append(context.divide(coefficients[-1], number))
+    return tuple(coefficients)
+
+
+def _series_guard(precision: int) -> int:
+    """
+    Dígitos que se pierden al elevar al cuadrado o duplicar el ángulo
+    ``_halvings`` veces (unos 0.3 por paso), más la guarda habitual.
+
+    :rtype: int
+    """
+    return _halvings(precision) // 3 + _GUARD_DIGITS
+
+
+# ............................................................... exponencial
+def _exp(value: Decimal, precision: int) -> Decimal:
+    """
+    ``exp(value)`` con unos ``precision`` dígitos, sin redondeo final.
+
+    :rtype: Decimal
+    """
+    if not value:
+        return _ONE
+    # k = round(value / ln 2); |k| no supera unos pocos millones antes del
+    # desbordamiento del contexto.
+    k = int(_ESTIMATE.divide(value, ln2(12)).to_integral_value(
+        rounding=ROUND_HALF_EVEN))
+    working = precision + _series_guard(precision) + len(str(abs(k)))
+    context = get_context(working)
+    halvings = _halvings(working)
+    coefficients = _inverse_factorials(working)
+
+    reduced = context.subtract(value, context.multiply(k, ln2(working)))
+    reduced = context.divide(reduced, 2 ** halvings)
+    total = coefficients[-1]
+    for coefficient in reversed(coefficients[:-1]):
+        total = context.fma(total, reduced, coefficient)
+    for _ in range(halvings):
+        total = context.multiply(total, total)
+    if k:
+        total = context.multiply(total, context.power(_TWO, k))
+    return total
+
+
+def exp(value: Decimal, precision: int) -> Decimal:
+    """
+    Calcula ``e**value``.
+
+    :param value: Exponente.
+    :type value: Decimal
+    :param precision: Número de dígitos significativos del resultado.
+    :type precision: int
+    :returns: Resultado redondeado a ``precision`` dígitos.
+    :rtype: Decimal
+    """
+    context = get_context(precision)
+    # Los exponentes enormes desbordan (o se anulan): decimal lo señala.
+    if precision <= LIBMPDEC_PRECISION or not value.is_finite() or \
+            value.adjusted() > 7:
+        return context.exp(value)
+    return context.plus(_exp(value, precision))
+
+
+# ............................................................... logaritmos
+def _ln(value: Decimal, precision: int) -> Decimal:
+    """
+    ``ln(value)`` para ``value > 0`` con unos ``precision`` dígitos.
+
+    :rtype: Decimal
+    """
+    # value = mantissa · 10**exponent con mantissa en [0.316, 3.16), para
+    # que ln(mantissa) y exponent·ln 10 no se cancelen.
+    exponent = value.adjusted()
+    mantissa = value.scaleb(-exponent)
+    if mantissa > 3:
+        exponent += 1
+        mantissa = mantissa.scaleb(-1)
+    # Cerca de 1, ln(mantissa) ~ mantissa - 1 necesita más dígitos.
+    distance = mantissa - _ONE
+    if distance:
+        precision += max(0, -distance.adjusted())
+
+    # Iteración de Halley: y += 2·(a - e**y) / (a + e**y), que triplica los
+    # dígitos correctos; cada paso trabaja solo con los que necesita.
+    levels = [precision + _GUARD_DIGITS]
+    while levels[-1] > 45:
+        levels.append(levels[-1] // 3 + _GUARD_DIGITS)
+    result = Decimal(math.log(float(mantissa)))
+    for level in reversed(levels):
+        context = get_context(level)
+        power = _exp(result, level)
+        result = context.add(result, context.divide(
+            context.multiply(_TWO, context.subtract(mantissa, power)),
+            context.add(mantissa, power)))
+
+    if exponent:
+        context = get_context(precision + len(str(abs(exponent))))
+        result = context.add(
+            result, context.multiply(exponent, ln10(context.prec)))
+    return result
+
+
+def _check_positive(value: Decimal) -> None:
+    """
+    :raises ValueError: Si ``value`` no es positivo.
+    """
+    if value.is_nan() or value <= _ZERO:
+        raise ValueError("El logaritmo solo está definido para valores "
+                         "positivos")
+
+
+def ln(value: Decimal, precision: int) -> Decimal:
+    """
+    Calcula el logaritmo natural.
+
+    :param value: Valor positivo.
+    :type value: Decimal
+    :param precision: Número de dígitos significativos del resultado.
+    :type precision: int
+    :returns: Resultado redondeado a ``precision`` dígitos.
+    :rtype: Decimal
+    :raises ValueError: Si ``value`` no es positivo.
+    """
+    _check_positive(value)
+    context = get_context(precision)
+    if precision <= LIBMPDEC_PRECISION or value.is_infinite() or \
+            value == _ONE:
+        return context.ln(value)
+    return context.plus(_ln(value, precision))
+
+
+def _is_power_of_ten(value: Decimal) -> bool:
+    """
+    Indica si ``value`` es una potencia exacta de 10 (``1``, ``100``,
+    ``0.001``, ``1.000``...).
+
+    :rtype: bool
+    """
+    digits = value.as_tuple().digits
+    return digits[0] == 1 and not any(digits[1:])
+
+
+def log10(value: Decimal, precision: int) -> Decimal:
+    """
+    Calcula el logaritmo en base 10.
+
+    Las potencias exactas de 10 dan un resultado entero exacto.
+
+    :param value: Valor positivo.
+    :type value: Decimal
+    :param precision: Número de dígitos significativos del resultado.
+    :type precision: int
+    :returns: Resultado redondeado a ``precision`` dígitos.
+    :rtype: Decimal
+    :raises ValueError: Si ``value`` no es positivo.
+    """
+    _check_positive(value)
+    context = get_context(precision)
+    if precision <= LIBMPDEC_PRECISION or value.is_infinite() or \
+            _is_power_of_ten(value):
+        return context.log10(value)
+    working = get_context(precision + _GUARD_DIGITS)
+    return context.divide(
+        _ln(value, working.prec), ln10(working.prec))
+
+
+# ............................................................ raíz y potencia
+def sqrt(value: Decimal, precision: int) -> Decimal:
+    """
+    Calcula la raíz cuadrada (correctamente redondeada).
+
+    :param value: Valor no negativo.
+    :type value: Decimal
+    :param precision: Número de dígitos significativos del resultado.
+    :type precision: int
+    :rtype: Decimal
+    :raises ValueError: Si ``value`` es negativo.
+    """
+    if value < _ZERO:
+        raise ValueError("No se puede calcular la raíz cuadrada de un "
+                         "número negativo")
+    return get_context(precision).sqrt(value)
+
+
+def power(base: Decimal, exponent: Decimal, precision: int) -> Decimal:
+    """
+    Calcula ``base**exponent``.
+
+    Los exponentes enteros y las bases cero o no finitas se resuelven con el
+    contexto decimal; el resto, como ``exp(exponent · ln(base))``.
+
+    :param base: Base.
+    :type base: Decimal
+    :param exponent: Exponente.
+    :type exponent: Decimal
+    :param precision: Número de dígitos significativos del resultado.
+    :type precision: int
+    :rtype: Decimal
+    :raises ValueError: Si la base es negativa y el exponente no es entero.
+    :raises ZeroDivisionError: Si la base es cero y el exponente negativo.
+    """
+    context = get_context(precision)
+    integral = exponent.is_finite() and \
+        exponent == exponent.to_integral_value()
+    if base < _ZERO and not integral:
+        raise ValueError("Una base negativa solo admite exponentes enteros")
+    if not base:
+        if exponent < _ZERO:
+            raise ZeroDivisionError("No se puede dividir por cero")
+        return context.power(base, exponent)
+    if precision <= LIBMPDEC_PRECISION or integral or \
+            not (base.is_finite() and exponent.is_finite()):
+        return context.power(base, exponent)
+
+    # Dígitos enteros de exponent·ln(base), que se pierden en exp().
+    estimate = _ESTIMATE.multiply(exponent, _ESTIMATE.ln(base))
+    if estimate.adjusted() > 7:
+        return context.power(base, exponent)
+    working = precision + _GUARD_DIGITS + max(0, estimate.adjusted() + 1)
+    product = get_context(working).multiply(exponent, _ln(base, working))
+    return context.plus(_exp(product, precision))
+
+
+# ............................................................ trigonometría
+def _sin_cos(value: Decimal, precision: int) -> Tuple[Decimal, Decimal]:
+    """
+    Seno y coseno de ``value`` con unos ``precision`` dígitos.
+
+    :rtype: Tuple[Decimal, Decimal]
+    """
+    # value = quadrant·pi/2 + reduced, con |reduced| <= pi/4. Cada dígito
+    # entero de value y cada cero inicial de reduced (value cerca de un
+    # múltiplo de pi/2) consumen un dígito de pi.
+    base = max(0, value.adjusted() + 1) + _GUARD_DIGITS
+    extra = base
+    while True:
+        working = precision + _series_guard(precision) + extra
+        context = get_context(working)
+        half_pi = context.divide(pi(working), _TWO)
+        quadrant = context.divide(value, half_pi).to_integral_value(
+            rounding=ROUND_HALF_EVEN)
+        if not quadrant:
+            reduced = value
+            break
+        reduced = context.subtract(value, context.multiply(quadrant, half_pi))
+        lost = -reduced.adjusted() if reduced else 0
+        if lost <= extra - base + _GUARD_DIGITS:
+            break
+        extra = base + lost
+
+    halvings = _halvings(working)
+    coefficients = _inverse_factorials(working)
+    reduced = context.divide(reduced, 2 ** halvings)
+    square = context.minus(context.multiply(reduced, reduced))
+    # sin(r) = r·(1/1! - r²/3! + ...), cos(r) = 1/0! - r²/2! + ...
+    last = len(coefficients) - 1
+    sine = coefficients[last - (last + 1) % 2]
+    cosine = coefficients[last - last % 2]
+    for index in range(last - (last + 1) % 2 - 2, 0, -2):
+        sine = context.fma(sine, square, coefficients[index])
+    for index in range(last - last % 2 - 2, -1, -2):
+        cosine = context.fma(cosine, square, coefficients[index])
+    sine = context.multiply(sine, reduced)
+
+    for _ in range(halvings):
+        sine, cosine = (
+            context.multiply(_TWO, context.multiply(sine, cosine)),
+            context.fma(context.multiply(-2, sine), sine, _ONE))
+
+    quadrant = int(quadrant) % 4
+    if quadrant == 1:
+        return cosine, context.minus(sine)
+    if quadrant == 2:
+        return context.minus(sine), context.minus(cosine)
+    if quadrant == 3:
+        return context.minus(cosine), sine
+    return sine, cosine
+
+
+def _check_finite(value: Decimal) -> None:
+    """
+    :raises ValueError: Si ``value`` es NaN o infinito.
+    """
+    if not value.is_finite():
+        raise ValueError("Las funciones trigonométricas requieren un valor "
+                         "finito")
+
+
+def sin(value: Decimal, precision: int) -> Decimal:
+    """
+    Calcula el seno (argumento en radianes).
+
+    :param value: Ángulo en radianes.
+    :type value: Decimal
+    :param precision: Número de dígitos significativos del resultado.
+    :type precision: int
+    :rtype: Decimal
+    :raises ValueError: Si ``value`` no es finito.
+    """
+    _check_finite(value)
+    if not value:
+        return _ZERO
+    return get_context(precision).plus(_sin_cos(value, precision)[0])
+
+
+def cos(value: Decimal, precision: int) -> Decimal:
+    """
+    Calcula el coseno (argumento en radianes).
+
+    :param value: Ángulo en radianes.
+    :type value: Decimal
+    :param precision: Número de dígitos significativos del resultado.
+    :type precision: int
+    :rtype: Decimal
+    :raises ValueError: Si ``value`` no es finito.
+    """
+    _check_finite(value)
+    if not value:
+        return _ONE
+    return get_context(precision).plus(_sin_cos(value, precision)[1])
+
+
+def tan(value: Decimal, precision: int) -> Decimal:
+    """
+    Calcula la tangente (argumento en radianes).
+
+    :param value: Ángulo en radianes.
+    :type value: Decimal
+    :param precision: Número de dígitos significativos del resultado.
+    :type precision: int
+    :rtype: Decimal
+    :raises ValueError: Si ``value`` no es finito.
+    """
+    _check_finite(value)
+    if not value:
+        return _ZERO
+    sine, cosine = _sin_cos(value, precision)
+    return get_context(precision).divide(sine, cosine)
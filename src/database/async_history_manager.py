@@ -0,0 +1,167 @@
+# MODULO: async_history_manager.py
+"""
+Fachada asyncio sobre ``HistoryManager``.
+
+Las llamadas a SQLite son bloqueantes. ``AsyncHistoryManager`` las ejecuta
+en un ``ThreadPoolExecutor`` propio de un solo hilo (las operaciones se
+ejecutan en orden y SQLite solo ve un escritor) y las espera con
+``run_in_executor``, de modo que el bucle de eventos sigue libre.
+
+Contrapresión: como mucho ``max_pending`` operaciones esperan en el
+ejecutor; el resto de corrutinas espera en un ``asyncio.Semaphore`` (una
+cola acotada) en lugar de acumular trabajo sin límite.
+
+Uso::
+
+    history = AsyncHistoryManager()
+    await history.add("2 + 2", Decimal(4))
+    async for record in history.stream():
+        ...
+
+Comparte la base de datos, el esquema y el Singleton de ``HistoryManager``.
+"""
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import partial
+from typing import Any, AsyncIterator, Callable
+from .history_db import HistoryEntry
+from .history_manager_db import HistoryManager
+
+
+# ------------------------------------------------ class -> AsyncHistoryManager
+class AsyncHistoryManager:
+    """
+    Gestiona el historial desde corrutinas sin bloquear el bucle de eventos.
+    Implementa el patrón Singleton, como ``HistoryManager``.
+
+    :cvar max_pending: Operaciones que pueden esperar a la vez en el
+        ejecutor.
+    :ivar manager: Gestor síncrono (Singleton) que hace el trabajo.
+    :vartype manager: HistoryManager
+    :ivar executor: Hilo dedicado a las operaciones de SQLite.
+    :vartype executor: ThreadPoolExecutor
+    """
+
+    _instance = None
+    max_pending = 64
+
+    def __new__(cls):
+        """
+        Implementa el patrón Singleton.
+
+        :returns: Instancia única de `AsyncHistoryManager`.
+        :rtype: AsyncHistoryManager
+        """
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.manager = HistoryManager()
+            cls._instance.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="history-async")
+            # Un semáforo por bucle de eventos (asyncio.Semaphore se asocia
+            # al bucle en el que se usa).
+            cls._instance._semaphores = weakref.WeakKeyDictionary()
+        return cls._instance
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """
+        Semáforo de contrapresión del bucle de eventos actual.
+
+        :rtype: asyncio.Semaphore
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_pending)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Ejecuta ``func(*args)`` en el ejecutor, esperando turno si ya hay
+        ``max_pending`` operaciones pendientes.
+
+        :param func: Método síncrono de ``HistoryManager``.
+        :type func: Callable[..., Any]
+        :returns: El resultado de ``func``.
+        :rtype: Any
+        """
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, partial(func, *args))
+
+    async def create_table(self) -> None:
+        """
+        Crea la tabla ``history_results`` si no existe.
+        """
+        await self._run(self.manager.create_table)
+
+    async def add(self, equation: str, result: Decimal) -> None:
+        """
+        Añade un registro al historial. Se escribe por lotes
+        (``HistoryManager.queue_history``); las lecturas lo incluyen.
+
+        :param equation: La ecuación a guardar.
+        :type equation: str
+        :param result: El resultado de la ecuación.
+        :type result: Decimal
+        :raises pydantic.ValidationError: Si los datos no son válidos.
+        """
+        await self._run(self.manager.queue_history, equation, result)
+
+    async def flush(self) -> int:
+        """
+        Escribe en la base de datos los registros pendientes.
+
+        :returns: Número de registros escritos.
+        :rtype: int
+        """
+        return await self._run(self.manager.writer.flush)
+
+    async def last_records(self, limit: int = 5) -> list:
+        """
+        Obtiene los últimos registros del historial.
+
+        :param limit: El número de registros a obtener.
+        :type limit: int
+        :rtype: list
+        """
+        return await self._run(self.manager.get_last_records, limit)
+
+    async def stream(
+            self,
+            page_size: int = 100) -> AsyncIterator[HistoryEntry]:
+        """
+        Recorre todo el historial, del más reciente al más antiguo, leyendo
+        páginas de ``page_size`` registros en el ejecutor.
+
+        :param page_size: Registros por lectura.
+        :type page_size: int
+        :returns: Registros ``HistoryEntry`` (``id``, ``equation`` y
+            ``result``).
+        :rtype: AsyncIterator[HistoryEntry]
+        """
+        before_id = None
+        while True:
+            page = await self._run(
+                self.manager.get_records_page, before_id, page_size)
+            if not page:
+                return
+            for record in page:
+                yield record
+            before_id = page[-1].id
+
+    async def delete(self) -> None:
+        """
+        Elimina todos los registros del historial.
+        """
+        await self._run(self.manager.delete_history)
+
+    async def close(self) -> None:
+        """
+        Escribe lo pendiente y cierra las conexiones (en el ejecutor, para
+        que el cierre también se ordene tras las operaciones encoladas).
+        """
+        await self._run(self.manager.close)
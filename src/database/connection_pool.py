@@ -0,0 +1,165 @@
+# MODULO: connection_pool.py
+"""
+Conexiones SQLite de larga duración, una por hilo.
+
+Abrir una conexión por operación obliga a SQLite a abrir el archivo y leer
+el esquema cada vez. ``ConnectionPool`` mantiene una conexión por hilo
+(``threading.local``), abierta la primera vez que el hilo la pide y
+configurada con:
+
+- ``auto_vacuum=INCREMENTAL``: las páginas que quedan libres al borrar se
+  devuelven al sistema con ``PRAGMA incremental_vacuum`` (solo tiene efecto
+  al crear la base de datos; las existentes se convierten en la migración
+  v5).
+- ``journal_mode=WAL``: los lectores no bloquean al escritor y cada
+  transacción añade al registro en lugar de reescribir páginas.
+- ``synchronous=NORMAL``: con WAL, sincroniza el disco en los checkpoints y
+  no en cada transacción (una caída del sistema puede perder la última
+  transacción, pero no corrompe la base de datos).
+- ``busy_timeout``: espera a que otro escritor libere el bloqueo en lugar de
+  fallar con ``database is locked`` (si aun así falla, ``gestor_database``
+  reintenta).
+- ``cache_size`` y ``temp_store=MEMORY``: caché de páginas y tablas
+  temporales en memoria.
+
+``close_all`` cierra todas las conexiones (se registra con ``atexit``); las
+llamadas posteriores vuelven a abrirlas bajo demanda.
+
+Cada conexión a ``":memory:"`` abre una base de datos distinta, así que el
+hilo del escritor y los lectores no verían los mismos datos. El pool la
+sustituye por una base de datos en memoria con nombre propio y caché
+compartida (``file:...?mode=memory&cache=shared``), común a todas sus
+conexiones. Existe mientras quede alguna abierta: tras ``close_all`` se
+empieza de nuevo vacía. En memoria no hay WAL (``journal_mode`` queda en
+``memory``) y los conflictos entre conexiones se resuelven con bloqueos de
+tabla, que ``gestor_database`` reintenta igual que ``database is locked``.
+"""
+import atexit
+import itertools
+import sqlite3
+import threading
+from typing import List, Tuple, Union
+from pathlib import Path
+
+PRAGMAS: Tuple[Tuple[str, Union[str, int]], ...] = (
+    # Primero, para que los demás PRAGMA (WAL) también esperen al bloqueo.
+    ("busy_timeout", 5000),
+    ("auto_vacuum", "INCREMENTAL"),
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -8000),       # KiB
+    ("temp_store", "MEMORY"),
+)
+
+MEMORY_PATH = ":memory:"
+
+# Nombres únicos de las bases de datos en memoria de cada pool.
+_memory_names = itertools.count(1)
+
+
+def connect(database: str) -> sqlite3.Connection:
+    """
+    Abre una conexión a ``database``, que puede ser una ruta o la URI de
+    ``ConnectionPool.database``.
+
+    :param database: Ruta o URI ``file:`` de la base de datos.
+    :type database: str
+    :rtype: sqlite3.Connection
+    """
+    # check_same_thread=False solo para poder cerrarla desde otro hilo.
+    return sqlite3.connect(database, check_same_thread=False,
+                           uri=database.startswith("file:"))
+
+
+# ----------------------------------------------------- class -> ConnectionPool
+class ConnectionPool:
+    """
+    Conexiones SQLite reutilizables, una por hilo, para una base de datos.
+
+    :ivar db_path: Ruta de la base de datos (o ``":memory:"``).
+    :vartype db_path: Union[str, Path]
+    :ivar database: Nombre con el que se abren las conexiones: la ruta, o
+        una URI en memoria con caché compartida para ``":memory:"``.
+    :vartype database: str
+    """
+
+    def __init__(self, db_path: Union[str, Path]) -> None:
+        """
+        Constructor de la clase ConnectionPool. No abre ninguna conexión.
+
+        :param db_path: Ruta de la base de datos.
+        :type db_path: Union[str, Path]
+        """
+        self.db_path = db_path
+        self.database = str(db_path)
+        if self.database == MEMORY_PATH:
+            self.database = (f"file:calculator-{next(_memory_names)}"
+                             "?mode=memory&cache=shared")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        atexit.register(self.close_all)
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Devuelve la conexión del hilo actual, abriéndola si hace falta.
+
+        :rtype: sqlite3.Connection
+        :raises sqlite3.Error: Si no se puede abrir la base de datos.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Cada hilo usa la suya; close_all() la cierra desde otro.
+            connection = connect(self.database)
+            try:
+                for name, value in PRAGMAS:
+                    connection.execute(f"PRAGMA {name}={value}")
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @property
+    def in_memory(self) -> bool:
+        """
+        True si la base de datos está en memoria (``":memory:"``).
+
+        :rtype: bool
+        """
+        return self.database != str(self.db_path)
+
+    def close(self) -> None:
+        """
+        Cierra la conexión del hilo actual, si existe.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            self._local.connection = None
+            with self._lock:
+                self._connections.remove(connection)
+            connection.close()
+
+    def close_all(self) -> None:
+        """
+        Cierra las conexiones de todos los hilos.
+
+        Los hilos que vuelvan a usar el pool abren una conexión nueva.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+            # Nuevo almacén local: las conexiones cerradas dejan de verse
+            # desde sus hilos.
+            self._local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def __len__(self) -> int:
+        """
+        Número de conexiones abiertas.
+
+        :rtype: int
+        """
+        return len(self._connections)
@@ -0,0 +1,742 @@
+# MODULO: history_backends.py
+"""
+Almacenes (backends) del historial.
+
+``HistoryManager`` valida los registros, los encola (``HistoryWriter``) y
+guarda los recientes en memoria (``RecentHistory``), pero las lecturas y
+escrituras las hace un backend con la interfaz ``HistoryBackend``. Se elige
+con ``HistoryManager.storage`` o con la variable de entorno
+``CALCULATOR_HISTORY_STORAGE``, sin cambiar a quien usa ``HistoryManager``
+(``ButtonsCreator``, ``HistoryWorker``):
+
+- ``sqlite`` (por defecto, ``history_manager_db.SQLiteBackend``): la base de
+  datos ``calculator_db.db`` en modo WAL, con migraciones, índices, resumen
+  diario (``history_stats``) y búsqueda FTS5. Varios procesos pueden
+  compartirla.
+- ``memory`` (``MemoryBackend``): listas en memoria, sin disco. Para
+  sesiones efímeras y pruebas; el historial se pierde al salir.
+- ``log`` (``AppendLogBackend``): el historial en memoria y cada cambio
+  añadido como una línea JSON a ``calculator_db.jsonl``, que se vuelve a
+  leer al arrancar. Escribir es añadir una línea, sin índices ni
+  transacciones. Un solo proceso.
+
+Los tres devuelven los mismos registros. ``MemoryBackend`` y
+``AppendLogBackend`` responden las consultas recorriendo los registros en
+memoria (sin índices) y ordenan ``search`` por recientes (sin ``bm25``).
+"""
+import heapq
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import (
+    Dict, List, Optional, Protocol, Sequence, Set, Tuple, Union
+)
+from .history_db import (
+    EXACT_CONTEXT, DailyStats, HistoryEntry, HistoryRow, decode_decimal,
+    history_row
+)
+from .retention import RetentionPolicy
+
+# Fila de import_ y replay_spill: (*HistoryRow, CREATED_AT).
+ImportRow = tuple
+
+# Registro con su fecha: (ID, EQUATION, RESULT, CREATED_AT).
+StoredEntry = Tuple[int, str, str, Optional[str]]
+
+# Registro de MemoryBackend: (ID, CREATED_AT, fila).
+_Stored = Tuple[int, Optional[str], HistoryRow]
+
+
+def utc_now(seconds_ago: float = 0) -> str:
+    """
+    Fecha actual (menos ``seconds_ago`` segundos) en UTC, en el formato de
+    ``CREATED_AT`` (``migrations.NOW_SQL``, con milisegundos).
+
+    :param seconds_ago: Segundos a restar.
+    :type seconds_ago: float
+    :rtype: str
+    """
+    moment = datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)
+    return moment.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+# ----------------------------------------------------- class -> HistoryBackend
+class HistoryBackend(Protocol):
+    """
+    Interfaz de un almacén del historial para ``HistoryManager``. Las
+    operaciones devuelven ``None`` si fallan.
+
+    :ivar data_path: Base de datos SQLite que otros procesos pueden
+        modificar (``RecentHistory`` vigila su ``data_version``), o
+        ``None`` si solo la modifica este proceso.
+    :ivar spill_path: Archivo de desbordamiento para los registros que no
+        se puedan escribir (``HistorySpill``), o ``None`` si el almacén no
+        usa el disco.
+    """
+    data_path: Optional[Union[str, Path]]
+    spill_path: Optional[Union[str, Path]]
+
+    def create(self) -> None:
+        """Prepara el almacén (crea o migra el esquema, lee el archivo)."""
+
+    def insert(self, rows: List[HistoryRow]) -> Optional[int]:
+        """Inserta filas con la fecha actual; devuelve el último ID (los
+        ID de las filas son consecutivos)."""
+
+    def import_rows(self, rows: List[ImportRow]) -> Optional[int]:
+        """Inserta filas con su ``CREATED_AT``; devuelve cuántas."""
+
+    def delete_all(self) -> Optional[int]:
+        """Borra todos los registros; devuelve cuántos."""
+
+    def read_last(self, limit: int) -> Optional[List[HistoryEntry]]:
+        """Últimos ``limit`` registros, del más reciente al más antiguo."""
+
+    def read_page(
+            self,
+            before_id: Optional[int],
+            limit: int) -> Optional[List[HistoryEntry]]:
+        """Hasta ``limit`` registros con ``ID < before_id``, del más
+        reciente al más antiguo."""
+
+    def read_after(
+            self,
+            after_id: int,
+            limit: int) -> Optional[List[StoredEntry]]:
+        """Hasta ``limit`` registros con ``ID > after_id``, en orden."""
+
+    def result_values(self, limit: int) -> Optional[list]:
+        """Últimos resultados como Decimal (``equation``, ``result``)."""
+
+    def results_between(
+            self,
+            low: Decimal,
+            high: Decimal,
+            limit: int) -> Optional[list]:
+        """Registros con ``low <= resultado <= high``, de menor a mayor."""
+
+    def sum_results(self, operator: Optional[str]) -> Optional[Decimal]:
+        """Suma exacta de los resultados."""
+
+    def stats(
+            self,
+            operator: Optional[str],
+            start: Optional[str],
+            end: Optional[str],
+            by_day: bool) -> Optional[List[DailyStats]]:
+        """Resumen por día y operador."""
+
+    def rebuild_stats(self) -> Optional[bool]:
+        """Recalcula el resumen desde cero; devuelve True."""
+
+    def search(
+            self,
+            query: str,
+            limit: int,
+            low: Optional[Decimal],
+            high: Optional[Decimal]) -> Optional[List[HistoryEntry]]:
+        """Registros cuya ecuación contiene ``query``."""
+
+    def prune_batch(self, policy: RetentionPolicy) -> Optional[int]:
+        """Borra un lote de los registros que incumplen ``policy``."""
+
+    def vacuum(self, pages: int) -> Optional[int]:
+        """Libera espacio; devuelve lo que queda por liberar."""
+
+    def checkpoint(self) -> None:
+        """Sincroniza en disco lo escrito."""
+
+    def close(self) -> None:
+        """Cierra los archivos o conexiones abiertos."""
+
+
+# ------------------------------------------------------ class -> MemoryBackend
+class MemoryBackend:
+    """
+    Historial en memoria: listas ordenadas por ``ID`` (los ID crecen y no
+    se reutilizan, como con ``AUTOINCREMENT``), seguras entre hilos.
+
+    Implementa la interfaz ``HistoryBackend``. ``max_bytes`` de la política
+    de retención no se aplica y no hay archivo de desbordamiento (no se
+    escribe nada en disco).
+    """
+
+    data_path = None
+    spill_path = None
+
+    def __init__(self) -> None:
+        """
+        Constructor de la clase MemoryBackend. Empieza vacío.
+        """
+        self._ids: List[int] = []
+        self._rows: List[_Stored] = []
+        self._next_id = 1
+        self._lock = threading.RLock()
+
+    # ............................................................... escritura
+    def create(self) -> None:
+        """
+        No hay nada que preparar.
+        """
+
+    def insert(self, rows: List[HistoryRow]) -> Optional[int]:
+        """
+        Inserta filas con la fecha actual.
+
+        :param rows: Filas de ``history_db.to_history_row``.
+        :type rows: List[HistoryRow]
+        :returns: El ID de la última fila.
+        :rtype: Optional[int]
+        """
+        created_at = utc_now()
+        return self._append([(created_at, row) for row in rows])
+
+    def import_rows(self, rows: List[ImportRow]) -> Optional[int]:
+        """
+        Inserta filas ``(*HistoryRow, CREATED_AT)`` conservando su fecha.
+
+        :rtype: Optional[int]
+        """
+        last_id = self._append([(row[-1], row[:-1]) for row in rows])
+        return None if last_id is None else len(rows)
+
+    def delete_all(self) -> Optional[int]:
+        """
+        Borra todos los registros.
+
+        :returns: Número de registros borrados.
+        :rtype: Optional[int]
+        """
+        with self._lock:
+            count = len(self._rows)
+            if not self._persist_clear():
+                return None
+            self._ids.clear()
+            self._rows.clear()
+            return count
+
+    def _append(
+            self,
+            records: List[Tuple[Optional[str], HistoryRow]]) -> Optional[int]:
+        """
+        Asigna ID a ``(CREATED_AT, fila)`` y los añade.
+
+        :returns: El ID del último registro.
+        :rtype: Optional[int]
+        """
+        with self._lock:
+            first = self._next_id
+            stored = [(first + index, created_at, row)
+                      for index, (created_at, row) in enumerate(records)]
+            if not self._persist_insert(stored):
+                return None
+            self._ids.extend(entry[0] for entry in stored)
+            self._rows.extend(stored)
+            self._next_id = first + len(stored)
+            return self._next_id - 1
+
+    def _delete(self, ids: Set[int]) -> Optional[int]:
+        """
+        Borra los registros con esos ID.
+
+        :returns: Número de registros borrados.
+        :rtype: Optional[int]
+        """
+        if not ids:
+            return 0
+        with self._lock:
+            if not self._persist_delete(sorted(ids)):
+                return None
+            self._rows = [entry for entry in self._rows
+                          if entry[0] not in ids]
+            self._ids = [entry[0] for entry in self._rows]
+            return len(ids)
+
+    # Puntos de extensión de AppendLogBackend: guardan el cambio antes de
+    # aplicarlo en memoria y devuelven False si no se pudo.
+    def _persist_insert(self, stored: List[_Stored]) -> bool:
+        """
+        Guarda registros nuevos.
+        """
+        return True
+
+    def _persist_delete(self, ids: Sequence[int]) -> bool:
+        """
+        Guarda el borrado de registros.
+        """
+        return True
+
+    def _persist_clear(self) -> bool:
+        """
+        Guarda el vaciado del historial.
+        """
+        return True
+
+    # ................................................................. lectura
+    def read_last(self, limit: int) -> List[HistoryEntry]:
+        """
+        Últimos ``limit`` registros (negativo: todos), del más reciente al
+        más antiguo.
+
+        :rtype: List[HistoryEntry]
+        """
+        with self._lock:
+            end = len(self._rows)
+            return self._entries(end - limit if limit >= 0 else 0, end)
+
+    def read_page(
+            self,
+            before_id: Optional[int],
+            limit: int) -> List[HistoryEntry]:
+        """
+        Hasta ``limit`` registros con ``ID < before_id`` (``None``: desde el
+        más reciente), del más reciente al más antiguo.
+
+        :rtype: List[HistoryEntry]
+        """
+        with self._lock:
+            end = (len(self._ids) if before_id is None
+                   else bisect_left(self._ids, before_id))
+            return self._entries(end - limit, end)
+
+    def _entries(self, start: int, end: int) -> List[HistoryEntry]:
+        """
+        Registros ``[start, end)``, del más reciente al más antiguo.
+        """
+        return [HistoryEntry(row_id, row[0], row[1]) for row_id, _, row
+                in reversed(self._rows[max(start, 0):end])]
+
+    def read_after(self, after_id: int, limit: int) -> List[StoredEntry]:
+        """
+        Hasta ``limit`` registros con ``ID > after_id``, en orden.
+
+        :rtype: List[StoredEntry]
+        """
+        with self._lock:
+            start = bisect_right(self._ids, after_id)
+            return [(row_id, row[0], row[1], created_at)
+                    for row_id, created_at, row
+                    in self._rows[start:start + limit]]
+
+    @staticmethod
+    def _value(row: HistoryRow) -> Optional[Decimal]:
+        """
+        Resultado exacto de una fila (``None`` si no es un número finito).
+        """
+        value = decode_decimal(row[6], row[7], row[1])
+        return value if value is not None and value.is_finite() else None
+
+    def result_values(self, limit: int) -> list:
+        """
+        Últimos resultados como Decimal.
+
+        :returns: Diccionarios con ``equation`` y ``result``.
+        :rtype: list
+        """
+        with self._lock:
+            rows = self._rows[max(len(self._rows) - limit, 0):]
+        return [{"equation": row[0],
+                 "result": decode_decimal(row[6], row[7], row[1])}
+                for _, _, row in reversed(rows)]
+
+    def results_between(
+            self,
+            low: Decimal,
+            high: Decimal,
+            limit: int) -> list:
+        """
+        Registros con ``low <= resultado <= high``, de menor a mayor.
+
+        :returns: Diccionarios con ``equation`` y ``result``.
+        :rtype: list
+        """
+        with self._lock:
+            rows = list(self._rows)
+        matches = []
+        for row_id, _, row in rows:
+            value = self._value(row)
+            if value is not None and low <= value <= high:
+                matches.append((value, row_id, row[0]))
+        return [{"equation": equation, "result": value}
+                for value, _, equation in heapq.nsmallest(limit, matches)]
+
+    def sum_results(self, operator: Optional[str]) -> Decimal:
+        """
+        Suma exacta de los resultados (opcionalmente, de un operador).
+
+        :rtype: Decimal
+        """
+        with self._lock:
+            rows = list(self._rows)
+        total = Decimal(0)
+        for _, _, row in rows:
+            if operator is None or row[2] == operator:
+                value = self._value(row)
+                if value is not None:
+                    total = EXACT_CONTEXT.add(total, value)
+        return total
+
+    def stats(
+            self,
+            operator: Optional[str],
+            start: Optional[str],
+            end: Optional[str],
+            by_day: bool) -> List[DailyStats]:
+        """
+        Resumen por día y operador, calculado recorriendo los registros.
+
+        :rtype: List[DailyStats]
+        """
+        with self._lock:
+            rows = list(self._rows)
+        groups: Dict[Tuple[Optional[str], Optional[str]], list] = {}
+        for _, created_at, row in rows:
+            day = created_at[:10] if created_at else None
+            if operator is not None and row[2] != operator:
+                continue
+            if (start is not None or end is not None) and day is None:
+                continue
+            if (start is not None and day < str(start)) or \
+                    (end is not None and day > str(end)):
+                continue
+            key = (day if by_day else None, row[2])
+            group = groups.setdefault(key, [0, 0, 0.0, None, None])
+            group[0] += 1
+            number = row[5]
+            if number is not None:
+                group[1] += 1
+                group[2] += number
+                group[3] = number if group[3] is None else min(group[3],
+                                                               number)
+                group[4] = number if group[4] is None else max(group[4],
+                                                               number)
+        # NULL primero, como ORDER BY en SQLite.
+        return [DailyStats(*key, *group) for key, group in sorted(
+            groups.items(),
+            key=lambda item: tuple(part or "" for part in item[0]))]
+
+    def rebuild_stats(self) -> bool:
+        """
+        No hay resumen guardado: ``stats`` lo calcula al leer.
+
+        :rtype: bool
+        """
+        return True
+
+    def search(
+            self,
+            query: str,
+            limit: int,
+            low: Optional[Decimal],
+            high: Optional[Decimal]) -> List[HistoryEntry]:
+        """
+        Registros cuya ecuación contiene ``query`` (sin distinguir
+        mayúsculas) y, opcionalmente, con el resultado en ``[low, high]``,
+        del más reciente al más antiguo.
+
+        :rtype: List[HistoryEntry]
+        """
+        fragment = (query or "").strip().lower()
+        with self._lock:
+            rows = list(self._rows)
+        records = []
+        for row_id, _, row in reversed(rows):
+            if fragment and fragment not in row[0].lower():
+                continue
+            if low is not None or high is not None:
+                value = self._value(row)
+                if value is None or (low is not None and value < low) or \
+                        (high is not None and value > high):
+                    continue
+            records.append(HistoryEntry(row_id, row[0], row[1]))
+            if len(records) >= limit:
+                break
+        return records
+
+    # ........................................................... mantenimiento
+    def prune_batch(self, policy: RetentionPolicy) -> Optional[int]:
+        """
+        Borra como mucho ``policy.batch_size`` de los registros más antiguos
+        que incumplen la política, en el orden de
+        ``SQLiteBackend.prune_batch``.
+
+        :returns: Número de registros borrados.
+        :rtype: Optional[int]
+        """
+        limit = policy.batch_size
+        with self._lock:
+            if policy.max_age_days is not None:
+                cutoff = utc_now(policy.max_age_days * 86400)
+                expired = heapq.nsmallest(limit, (
+                    (created_at, row_id)
+                    for row_id, created_at, _ in self._rows
+                    if created_at is not None and created_at < cutoff))
+                if expired:
+                    return self._delete({row_id for _, row_id in expired})
+            if policy.max_rows is not None:
+                excess = min(limit, len(self._ids) - policy.max_rows)
+                if excess > 0:
+                    return self._delete(set(self._ids[:excess]))
+            if policy.max_bytes is not None:
+                used = self._used_bytes()
+                if used is not None and used > policy.max_bytes:
+                    return self._delete(set(self._ids[:limit]))
+        return 0
+
+    def _used_bytes(self) -> Optional[int]:
+        """
+        Bytes que ocupa el historial (``None``: no se mide).
+        """
+        return None
+
+    def vacuum(self, pages: int) -> int:
+        """
+        La memoria se libera al borrar: no queda nada pendiente.
+
+        :rtype: int
+        """
+        return 0
+
+    def checkpoint(self) -> None:
+        """
+        No hay nada que sincronizar.
+        """
+
+    def close(self) -> None:
+        """
+        No hay nada que cerrar; los registros se conservan.
+        """
+
+    def __len__(self) -> int:
+        """
+        Número de registros.
+
+        :rtype: int
+        """
+        return len(self._rows)
+
+
+# --------------------------------------------------- class -> AppendLogBackend
+class AppendLogBackend(MemoryBackend):
+    """
+    ``MemoryBackend`` que añade cada cambio a un archivo JSONL antes de
+    aplicarlo:
+
+    - ``{"id", "equation", "result", "created_at"}``: un registro nuevo;
+    - ``{"delete": [ids]}``: registros borrados (retención);
+    - ``{"clear": true}``: historial vaciado;
+    - ``{"next_id": n}``: siguiente ID, al principio del archivo compactado.
+
+    ``create`` lee el archivo y reconstruye el historial; una última línea
+    incompleta (el proceso se interrumpió al escribirla) se descarta.
+    ``vacuum`` reescribe el archivo solo con los registros vivos cuando al
+    menos la mitad de sus líneas sobran.
+
+    :cvar fsync: Sincroniza el disco tras cada escritura. Con ``False`` un
+        fallo del proceso no pierde nada, pero un corte de luz puede perder
+        las últimas escrituras.
+    :ivar path: Ruta del archivo.
+    :vartype path: Path
+    :ivar spill_path: Archivo de desbordamiento, junto al anterior.
+    :vartype spill_path: str
+    """
+
+    fsync = True
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Constructor de la clase AppendLogBackend. No abre el archivo hasta
+        ``create`` o la primera escritura.
+
+        :param path: Ruta del archivo.
+        :type path: Union[str, Path]
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.spill_path = f"{path}.spill.jsonl"
+        self._file = None
+        # Líneas del archivo que no son registros vivos.
+        self._garbage = 0
+        # Bytes de la línea de cada registro vivo.
+        self._sizes: Dict[int, int] = {}
+
+    def create(self) -> None:
+        """
+        Lee el archivo (si existe) y reconstruye el historial en memoria.
+        """
+        with self._lock:
+            self.close()
+            live: Dict[int, _Stored] = {}
+            sizes: Dict[int, int] = {}
+            garbage = 0
+            last_id = 0
+            valid = 0
+            try:
+                file = open(self.path, "rb")
+            except FileNotFoundError:
+                file = None
+            if file is not None:
+                with file:
+                    for line in file:
+                        if not line.endswith(b"\n"):
+                            break
+                        valid += len(line)
+                        try:
+                            entry = json.loads(line)
+                            if "next_id" in entry:
+                                last_id = max(last_id, entry["next_id"] - 1)
+                            elif entry.get("clear"):
+                                garbage += len(live) + 1
+                                live.clear()
+                                sizes.clear()
+                            elif "delete" in entry:
+                                garbage += 1
+                                for row_id in entry["delete"]:
+                                    if live.pop(row_id, None) is not None:
+                                        del sizes[row_id]
+                                        garbage += 1
+                            else:
+                                row_id = entry["id"]
+                                live[row_id] = (
+                                    row_id, entry.get("created_at"),
+                                    history_row(entry["equation"],
+                                                entry["result"]))
+                                sizes[row_id] = len(line)
+                                last_id = max(last_id, row_id)
+                        except (ValueError, KeyError, TypeError):
+                            garbage += 1
+                if valid < self.path.stat().st_size:
+                    os.truncate(self.path, valid)
+            self._rows = list(live.values())
+            self._ids = list(live)
+            self._next_id = last_id + 1
+            self._sizes = sizes
+            self._garbage = garbage
+
+    def _write(self, lines: List[bytes]) -> bool:
+        """
+        Añade líneas al archivo.
+
+        :returns: False si no se pudo escribir.
+        :rtype: bool
+        """
+        try:
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            self._file.write(b"".join(lines))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except OSError:
+            print("Ha ocurrido un error al escribir el historial")
+            return False
+        return True
+
+    @staticmethod
+    def _line(entry: dict) -> bytes:
+        """
+        Línea JSON de una entrada.
+        """
+        return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @classmethod
+    def _record_line(cls, entry: _Stored) -> bytes:
+        """
+        Línea de un registro.
+        """
+        row_id, created_at, row = entry
+        return cls._line({"id": row_id, "equation": row[0],
+                          "result": row[1], "created_at": created_at})
+
+    def _persist_insert(self, stored: List[_Stored]) -> bool:
+        """
+        Añade una línea por registro.
+        """
+        lines = [self._record_line(entry) for entry in stored]
+        if not self._write(lines):
+            return False
+        for entry, line in zip(stored, lines):
+            self._sizes[entry[0]] = len(line)
+        return True
+
+    def _persist_delete(self, ids: Sequence[int]) -> bool:
+        """
+        Añade una línea ``delete``.
+        """
+        if not self._write([self._line({"delete": list(ids)})]):
+            return False
+        for row_id in ids:
+            self._sizes.pop(row_id, None)
+        self._garbage += len(ids) + 1
+        return True
+
+    def _persist_clear(self) -> bool:
+        """
+        Añade una línea ``clear``.
+        """
+        if not self._write([self._line({"clear": True})]):
+            return False
+        self._garbage += len(self._rows) + 1
+        self._sizes.clear()
+        return True
+
+    def _used_bytes(self) -> int:
+        """
+        Bytes de las líneas de los registros vivos (lo que ocuparía el
+        archivo tras ``vacuum``).
+        """
+        return sum(self._sizes.values())
+
+    def vacuum(self, pages: int) -> Optional[int]:
+        """
+        Reescribe el archivo con los registros vivos si al menos la mitad
+        de sus líneas sobran. Se escribe en un archivo temporal que
+        sustituye al original (``os.replace``), así que una interrupción no
+        pierde nada.
+
+        :param pages: No se usa (se reescribe todo de una vez).
+        :type pages: int
+        :returns: 0: no queda nada pendiente hasta que sobren más líneas
+            (como las páginas libres de SQLite); ``None`` si falla.
+        :rtype: Optional[int]
+        """
+        with self._lock:
+            if not self._garbage or self._garbage < len(self._rows):
+                return 0
+            temporary = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(temporary, "wb") as file:
+                    # Conserva el siguiente ID: no se reutilizan.
+                    file.write(self._line({"next_id": self._next_id}))
+                    file.writelines(map(self._record_line, self._rows))
+                    file.flush()
+                    os.fsync(file.fileno())
+                self.close()
+                os.replace(temporary, self.path)
+            except OSError:
+                print("Ha ocurrido un error al escribir el historial")
+                return None
+            self._garbage = 0
+            return 0
+
+    def checkpoint(self) -> None:
+        """
+        Sincroniza el archivo en disco.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Cierra el archivo; la siguiente escritura lo vuelve a abrir.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -3,9 +3,223 @@
 Módulo que crea la entidad u objeto que contiene la información necesaria para
 realizar nuevos registros en la base de datos, así como sus respectivas
 consultas.
+
+``to_row`` prepara la fila que se inserta en ``history_results``: además de
+la ecuación y el resultado en texto (exactos), guarda el operador, los
+operandos y el resultado numéricos (``REAL``) para filtrar y ordenar con
+índices, y la codificación exacta ``(coeficiente, exponente)`` de cada
+número (``encode_decimal``), que SQLite compara y suma como enteros.
 """
-from decimal import Decimal
-from pydantic import BaseModel
+import math
+from decimal import (
+    Context, Decimal, InvalidOperation, MAX_EMAX, MAX_PREC, MIN_EMIN
+)
+from typing import NamedTuple, Optional, Tuple
+from pydantic import BaseModel, StrictStr, validator
+
+OPERATORS = ("+", "-", "*", "/", "%")
+
+# Límites de una columna INTEGER de SQLite (64 bits con signo).
+SQLITE_INT_MIN = -2 ** 63
+SQLITE_INT_MAX = 2 ** 63 - 1
+
+# Contexto sin redondeo ni límites de exponente: scaleb es exacto.
+EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+EncodedDecimal = Tuple[Optional[int], Optional[int]]
+
+# (EQUATION, RESULT, OPERATOR, OPERAND_1, OPERAND_2, RESULT_NUM,
+#  RESULT_COEF, RESULT_EXP, OPERAND_1_COEF, OPERAND_1_EXP,
+#  OPERAND_2_COEF, OPERAND_2_EXP)
+HistoryRow = Tuple[str, str, Optional[str], Optional[float],
+                   Optional[float], Optional[float],
+                   Optional[int], Optional[int], Optional[int],
+                   Optional[int], Optional[int], Optional[int]]
+
+
+def encode_decimal(value: Optional[Decimal]) -> EncodedDecimal:
+    """
+    Codifica un Decimal como ``(coeficiente, exponente)`` enteros, con
+    ``value == coeficiente * 10 ** exponente`` y el mismo exponente (se
+    conservan los ceros a la derecha: ``5.00`` es ``(500, -2)``).
+
+    Si el coeficiente no cabe en 64 bits se eliminan sus ceros a la derecha;
+    si aun así no cabe, o el valor no es finito o es ``-0``, devuelve
+    ``(None, None)`` y el texto de la columna sigue siendo la única
+    representación exacta.
+
+    :param value: Valor a codificar.
+    :type value: Optional[Decimal]
+    :rtype: Tuple[Optional[int], Optional[int]]
+    """
+    if value is None or not value.is_finite():
+        return None, None
+    exponent = value.as_tuple().exponent
+    coefficient = int(value.scaleb(-exponent, EXACT_CONTEXT))
+    if coefficient == 0 and value.is_signed():
+        return None, None
+    if not SQLITE_INT_MIN <= coefficient <= SQLITE_INT_MAX:
+        reduced = value.normalize(EXACT_CONTEXT)
+        exponent = reduced.as_tuple().exponent
+        coefficient = int(reduced.scaleb(-exponent, EXACT_CONTEXT))
+        if not SQLITE_INT_MIN <= coefficient <= SQLITE_INT_MAX:
+            return None, None
+    return coefficient, exponent
+
+
+def parse_decimal(text: Optional[str]) -> Optional[Decimal]:
+    """
+    Decimal de una columna de texto (None si no es un número).
+
+    :param text: Texto guardado.
+    :type text: Optional[str]
+    :rtype: Optional[Decimal]
+    """
+    try:
+        return Decimal(text)
+    except (InvalidOperation, TypeError):
+        return None
+
+
+def decode_decimal(
+        coefficient: Optional[int],
+        exponent: Optional[int],
+        text: Optional[str] = None) -> Optional[Decimal]:
+    """
+    Reconstruye el Decimal de ``encode_decimal`` sin pasar por texto. Si
+    no hay codificación, analiza ``text`` (``parse_decimal``).
+
+    :param coefficient: Coeficiente entero.
+    :type coefficient: Optional[int]
+    :param exponent: Exponente.
+    :type exponent: Optional[int]
+    :param text: Representación en texto, para valores sin codificar.
+    :type text: Optional[str]
+    :rtype: Optional[Decimal]
+    """
+    if coefficient is None:
+        return parse_decimal(text)
+    return Decimal(coefficient).scaleb(exponent, EXACT_CONTEXT)
+
+
+class HistoryEntry(NamedTuple):
+    """
+    Registro del historial leído por ``HistoryManager`` (``iter_history``,
+    ``get_last_records``, ``get_records_page``, ``search_history``): una
+    tupla inmutable, sin diccionario por registro.
+
+    Los campos se leen por nombre (``record.equation``) o por posición;
+    ``_asdict()`` devuelve un diccionario. ``id`` es el de la fila, con el
+    que se pide la página siguiente (``before_id`` o ``after_id``).
+    """
+    id: int
+    equation: str
+    result: str
+
+
+class DailyStats(NamedTuple):
+    """
+    Resumen del historial de ``HistoryManager.stats``: registros de un día
+    (``None`` en los totales o en los registros sin fecha) y un operador
+    (``None`` si la ecuación no tiene operador).
+
+    ``result_sum`` es la suma en ``REAL`` (para paneles); la suma exacta es
+    ``HistoryManager.sum_results``.
+    """
+    day: Optional[str]
+    operator: Optional[str]
+    count: int
+    result_count: int
+    result_sum: float
+    result_min: Optional[float]
+    result_max: Optional[float]
+
+
+def to_real(value: Optional[Decimal]) -> Optional[float]:
+    """
+    Convierte un Decimal en el valor de una columna ``REAL``.
+
+    :param value: Valor a convertir.
+    :type value: Optional[Decimal]
+    :returns: El valor como float, o None si no es finito o no cabe.
+    :rtype: Optional[float]
+    """
+    if value is None:
+        return None
+    number = float(value)
+    return number if math.isfinite(number) else None
+
+
+def split_equation(
+        equation: str) -> Tuple[Optional[str], Optional[Decimal],
+                                Optional[Decimal]]:
+    """
+    Separa una ecuación ``"<operando> <operador> <operando>"`` (el formato
+    de ``ButtonsCreator``) en sus partes.
+
+    :param equation: Ecuación guardada en el historial.
+    :type equation: str
+    :returns: ``(operador, operando_1, operando_2)``, o tres None si la
+        ecuación no tiene ese formato.
+    :rtype: Tuple[Optional[str], Optional[Decimal], Optional[Decimal]]
+    """
+    parts = (equation or "").split()
+    if len(parts) != 3 or parts[1] not in OPERATORS:
+        return None, None, None
+    try:
+        return parts[1], Decimal(parts[0]), Decimal(parts[2])
+    except InvalidOperation:
+        return None, None, None
+
+
+def history_row(equation: str, result: str) -> HistoryRow:
+    """
+    Fila de ``history_results`` a partir de la ecuación y el resultado en
+    texto, sin crear un ``HistoryTableDB`` (importación masiva). El texto
+    del resultado se guarda tal cual, aunque no sea un número.
+
+    :param equation: Ecuación de la operación.
+    :type equation: str
+    :param result: Resultado en texto.
+    :type result: str
+    :rtype: HistoryRow
+    """
+    value = parse_decimal(result)
+    operator, operand_1, operand_2 = split_equation(equation)
+    return (equation, result, operator,
+            to_real(operand_1), to_real(operand_2), to_real(value),
+            *encode_decimal(value), *encode_decimal(operand_1),
+            *encode_decimal(operand_2))
+
+
+def to_history_row(
+        equation: str,
+        result: Decimal,
+        strict: bool = False) -> HistoryRow:
+    """
+    Valida un registro en la entrada de ``HistoryManager`` y devuelve su
+    fila.
+
+    Una ecuación ``str`` con un resultado ``Decimal`` (lo que envía la
+    calculadora) no necesita el modelo de Pydantic y se convierte
+    directamente (``history_row``). Cualquier otro tipo pasa por
+    ``HistoryTableDB``, que lo convierte o lanza ``ValidationError`` como
+    antes. Con ``strict`` se valida siempre con ``StrictHistoryTableDB``.
+
+    :param equation: Ecuación de la operación.
+    :type equation: str
+    :param result: Resultado de la ecuación.
+    :type result: Decimal
+    :param strict: Validación estricta (ver ``StrictHistoryTableDB``).
+    :type strict: bool
+    :rtype: HistoryRow
+    :raises pydantic.ValidationError: Si los datos no son válidos.
+    """
+    if strict:
+        return StrictHistoryTableDB(equation=equation, result=result).to_row()
+    if type(equation) is str and type(result) is Decimal:
+        return history_row(equation, str(result))
+    return HistoryTableDB(equation=equation, result=result).to_row()
 
 
 # --------------------------------------------------- class -> HistoryTableDB 
@@ -29,3 +243,43 @@ class HistoryTableDB(BaseModel):
         :rtype: str
         """
         return f"{self.equation} = {self.result}"
+
+    def to_row(self) -> HistoryRow:
+        """
+        Devuelve la fila a insertar en ``history_results``.
+
+        :returns: ``(EQUATION, RESULT, OPERATOR, OPERAND_1, OPERAND_2,
+            RESULT_NUM)`` seguido de ``(coeficiente, exponente)`` del
+            resultado y de cada operando.
+        :rtype: HistoryRow
+        """
+        return history_row(self.equation, str(self.result))
+
+
+# --------------------------------------------- class -> StrictHistoryTableDB
+class StrictHistoryTableDB(HistoryTableDB):
+    """
+    ``HistoryTableDB`` sin conversiones: la ecuación debe ser un ``str`` con
+    el formato ``"<operando> <operador> <operando>"`` y el resultado, un
+    ``Decimal`` finito.
+    """
+    equation: StrictStr
+    result: Decimal
+
+    @validator("equation")
+    def _check_equation(cls, equation: str) -> str:
+        """
+        Comprueba el formato de la ecuación.
+        """
+        if split_equation(equation)[0] is None:
+            raise ValueError(f"Ecuación sin formato reconocible: {equation}")
+        return equation
+
+    @validator("result", pre=True)
+    def _check_result(cls, result: Decimal) -> Decimal:
+        """
+        Comprueba que el resultado es un ``Decimal`` finito.
+        """
+        if not isinstance(result, Decimal) or not result.is_finite():
+            raise ValueError(f"Resultado no válido: {result!r}")
+        return result
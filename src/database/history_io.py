@@ -0,0 +1,130 @@
+# MODULO: history_io.py
+"""
+Formatos de exportación e importación del historial.
+
+``HistoryManager.export`` e ``HistoryManager.import_`` mueven el historial
+entre bases de datos por bloques, con memoria constante. Cada registro tiene
+los campos ``FIELDS``:
+
+- ``csv``: una cabecera con los campos y una fila por registro.
+- ``jsonl``: un objeto JSON por línea.
+
+El formato se deduce de la extensión (``historial.csv``,
+``historial.jsonl``) y un sufijo ``.gz`` comprime o descomprime con gzip
+sobre la marcha (``historial.jsonl.gz``). ``created_at`` vacío o ausente
+es ``NULL`` (registros migrados sin fecha).
+"""
+import csv
+import gzip
+import json
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional, Tuple, Union
+
+FORMATS = ("csv", "jsonl")
+FIELDS = ("equation", "result", "created_at")
+
+# Registro exportado: (EQUATION, RESULT, CREATED_AT).
+ExportRow = Tuple[str, str, Optional[str]]
+
+
+def detect_format(
+        path: Union[str, Path],
+        fmt: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Formato y compresión de un archivo.
+
+    :param path: Ruta del archivo.
+    :type path: Union[str, Path]
+    :param fmt: Formato (``"csv"`` o ``"jsonl"``); ``None`` lo deduce de la
+        extensión.
+    :type fmt: Optional[str]
+    :returns: ``(formato, comprimido)``.
+    :rtype: Tuple[str, bool]
+    :raises ValueError: Si el formato no es válido o no se puede deducir.
+    """
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    compressed = bool(suffixes) and suffixes[-1] == ".gz"
+    if compressed:
+        suffixes.pop()
+    if fmt is None and suffixes:
+        fmt = suffixes[-1].lstrip(".")
+    if fmt not in FORMATS:
+        raise ValueError(
+            f"Formato desconocido: {fmt} (válidos: {', '.join(FORMATS)})")
+    return fmt, compressed
+
+
+def open_text(path: Union[str, Path], mode: str, compressed: bool) -> IO:
+    """
+    Abre un archivo de texto UTF-8, comprimido con gzip o no.
+
+    :param mode: ``"r"`` o ``"w"``.
+    :type mode: str
+    :rtype: IO
+    """
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="",
+                         compresslevel=6)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def write_rows(file: IO, fmt: str, rows: Iterable[ExportRow]) -> None:
+    """
+    Escribe registros en un archivo abierto (sin cabecera; ver
+    ``write_header``).
+
+    :param file: Archivo de texto abierto para escritura.
+    :type file: IO
+    :param fmt: Formato.
+    :type fmt: str
+    :param rows: Registros ``(equation, result, created_at)``.
+    :type rows: Iterable[ExportRow]
+    """
+    if fmt == "csv":
+        csv.writer(file).writerows(rows)
+    else:
+        file.writelines(
+            json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n"
+            for row in rows)
+
+
+def write_header(file: IO, fmt: str) -> None:
+    """
+    Escribe la cabecera del formato (solo ``csv`` la tiene).
+
+    :param file: Archivo de texto abierto para escritura.
+    :type file: IO
+    :param fmt: Formato.
+    :type fmt: str
+    """
+    if fmt == "csv":
+        csv.writer(file).writerow(FIELDS)
+
+
+def read_rows(file: IO, fmt: str) -> Iterator[ExportRow]:
+    """
+    Lee los registros de un archivo abierto, uno a uno.
+
+    :param file: Archivo de texto abierto para lectura.
+    :type file: IO
+    :param fmt: Formato.
+    :type fmt: str
+    :returns: Registros ``(equation, result, created_at)``.
+    :rtype: Iterator[ExportRow]
+    :raises ValueError: Si un registro no tiene ``equation`` o ``result``,
+        o si una línea JSON no es válida.
+    """
+    if fmt == "csv":
+        records = csv.DictReader(file)
+        start = 2
+    else:
+        records = (json.loads(line) for line in file if line.strip())
+        start = 1
+    for number, record in enumerate(records, start):
+        equation = result = None
+        if isinstance(record, dict):
+            equation, result = record.get("equation"), record.get("result")
+        if equation is None or result is None:
+            raise ValueError(
+                f"Registro {number}: faltan 'equation' o 'result'")
+        yield equation, str(result), record.get("created_at") or None
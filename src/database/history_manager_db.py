@@ -7,25 +7,175 @@ Este módulo incluye:
 
 - El decorador gestor_database para manejar automáticamente la conexión a la
   base de datos.
+- La clase SQLiteBackend, el almacén por defecto del historial.
 - La clase HistoryManager que implementa el patrón Singleton para asegurar una
   sola instancia de conexión a la base de datos.
+
+Las conexiones son de larga duración (una por hilo, en modo WAL) y las
+gestiona ``ConnectionPool`` (``connection_pool.py``). Los registros
+encolados con ``queue_history`` se escriben por lotes (``HistoryWriter``,
+``history_writer.py``). El esquema de la tabla es versionado
+(``migrations.py``) y su tamaño se acota con una política de retención
+(``retention.py``). En lugar de SQLite, el historial puede guardarse en
+memoria o en un archivo de solo añadir (``history_backends.py``).
 """
+import math
+import os
+import random
 import sqlite3
+import time
+from itertools import islice
+from datetime import date
 from pathlib import Path
 from decimal import Decimal
-from typing import Callable, Any
-from .history_db import HistoryTableDB
+from typing import Callable, Any, Iterator, List, Optional, Tuple, Union
+from .connection_pool import ConnectionPool
+from .history_backends import (
+    AppendLogBackend, HistoryBackend, ImportRow, MemoryBackend
+)
+from .history_db import (
+    EXACT_CONTEXT, DailyStats, HistoryEntry, HistoryRow, decode_decimal,
+    history_row, parse_decimal, to_history_row
+)
+from .history_io import (
+    detect_format, open_text, read_rows, write_header, write_rows
+)
+from .history_spill import HistorySpill
+from .history_writer import HistoryWriter
+from .migrations import NOW_SQL, has_full_text_index, migrate, rebuild_stats
+from .recent_history import RecentHistory
+from .retention import RetentionPolicy
+
+# Backends de open_backend y variable de entorno que elige uno si
+# HistoryManager.storage es None.
+STORAGES = ("sqlite", "memory", "log")
+STORAGE_ENV = "CALCULATOR_HISTORY_STORAGE"
+
+# Reintentos de gestor_database si otra conexión bloquea la base de datos
+# (además de la espera de busy_timeout): esperas aleatorias de hasta
+# RETRY_DELAY * 2 ** intento segundos. LOCK_TIMEOUT acota en segundos la
+# espera total de una llamada, busy_timeout de cada intento incluido.
+LOCK_RETRIES = 4
+RETRY_DELAY = 0.05
+LOCK_TIMEOUT = 10.0
+
+# Margen relativo de los filtros por RESULT_NUM, mayor que el error de
+# redondeo de float; el valor exacto decide los extremos.
+REAL_MARGIN = 1e-12
+
+INSERT_HISTORY_SQL = f"""
+    INSERT INTO history_results (EQUATION, RESULT, OPERATOR, OPERAND_1,
+                                 OPERAND_2, RESULT_NUM, RESULT_COEF,
+                                 RESULT_EXP, OPERAND_1_COEF, OPERAND_1_EXP,
+                                 OPERAND_2_COEF, OPERAND_2_EXP, CREATED_AT)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {NOW_SQL})
+"""
+
+# Igual que INSERT_HISTORY_SQL, pero conserva el CREATED_AT importado.
+IMPORT_HISTORY_SQL = """
+    INSERT INTO history_results (EQUATION, RESULT, OPERATOR, OPERAND_1,
+                                 OPERAND_2, RESULT_NUM, RESULT_COEF,
+                                 RESULT_EXP, OPERAND_1_COEF, OPERAND_1_EXP,
+                                 OPERAND_2_COEF, OPERAND_2_EXP, CREATED_AT)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def real_filter(
+        low: Optional[Decimal],
+        high: Optional[Decimal],
+        column: str = "RESULT_NUM") -> Tuple[str, List[float], bool]:
+    """
+    Condición SQL que acota por la columna ``REAL`` los candidatos de un
+    rango de resultados; el valor exacto decide después.
+
+    Los resultados que no caben en float se guardan con ``RESULT_NUM``
+    nulo. Si un extremo tampoco cabe (o es infinito), ese lado queda
+    abierto y se añaden las filas con la columna nula; la condición ya no
+    sigue el orden de los valores.
+
+    :param low: Extremo inferior (``None``: sin límite).
+    :type low: Optional[Decimal]
+    :param high: Extremo superior (``None``: sin límite).
+    :type high: Optional[Decimal]
+    :param column: Columna ``REAL`` a filtrar.
+    :type column: str
+    :returns: La condición, sus parámetros y si incluye filas con la
+        columna nula.
+    :rtype: Tuple[str, List[float], bool]
+    """
+    conditions: List[str] = []
+    params: List[float] = []
+    with_null = False
+    for bound, operator, sign in ((low, ">=", -1), (high, "<=", 1)):
+        if bound is None:
+            continue
+        number = float(bound)
+        if not math.isfinite(number):
+            with_null = True
+            continue
+        conditions.append(f"{column} {operator} ?")
+        params.append(number + sign * max(abs(number), 1.0) * REAL_MARGIN)
+    condition = " AND ".join(conditions) or "1"
+    if with_null:
+        condition = f"({condition} OR {column} IS NULL)"
+    return condition, params, with_null
+
+
+def _limit_busy_timeout(
+        connection: sqlite3.Connection,
+        deadline: float) -> Optional[int]:
+    """
+    Reduce el ``busy_timeout`` de la conexión al tiempo que queda hasta
+    ``deadline`` (``time.monotonic()``), si es menor.
+
+    :param connection: Conexión del hilo actual.
+    :type connection: sqlite3.Connection
+    :param deadline: Instante límite de la espera.
+    :type deadline: float
+    :returns: El ``busy_timeout`` anterior, que hay que restaurar, o
+        ``None`` si no se cambió.
+    :rtype: Optional[int]
+    """
+    busy = connection.execute("PRAGMA busy_timeout").fetchone()[0]
+    remaining = max(int((deadline - time.monotonic()) * 1000), 0)
+    if remaining >= busy:
+        return None
+    connection.execute(f"PRAGMA busy_timeout={remaining}")
+    return busy
+
+
+# -------------------------------------------------- class -> HistoryWriteError
+class HistoryWriteError(RuntimeError):
+    """
+    El almacén del historial no aceptó una escritura (por ejemplo, la base
+    de datos siguió bloqueada durante ``LOCK_TIMEOUT`` segundos).
+    """
 
 
 # ------------------------------------------------------------- gestor_database
 def gestor_database(func: Callable[..., Any]) -> Callable[..., Any]:
     """
     Decorador para manejar la conexión a la base de datos SQLite y el cursor.
-    Abre una conexión a la base de datos SQLite, crea un cursor, ejecuta la
-    función decorada pasando el cursor como argumento y luego cierra el cursor.
+    Toma la conexión del hilo actual de ``self.pool`` (abierta una sola vez),
+    crea un cursor, ejecuta la función decorada en una transacción pasando el
+    cursor como argumento y luego cierra el cursor. La transacción se
+    confirma al terminar o se revierte si hay un error.
     Además, captura cualquier error de la base de datos que pueda ocurrir
     durante la ejecución de la función decorada.
 
+    Si la base de datos está bloqueada por otra conexión (``database is
+    locked``), la transacción se revierte y se reintenta hasta
+    ``LOCK_RETRIES`` veces con esperas crecientes y aleatorias (*jitter*),
+    para que los procesos que compiten no reintenten a la vez. La espera
+    total (esperas entre intentos y ``busy_timeout`` de cada uno) no supera
+    ``LOCK_TIMEOUT`` segundos.
+
+    Si la función no se puede ejecutar, imprime el error y devuelve
+    ``None``: los llamantes lo tratan como un fallo (``HistoryManager``
+    desborda las inserciones al archivo ``spill`` y lanza
+    ``HistoryWriteError`` en las demás escrituras).
+
     :param func: Función a decorar. Debe aceptar un argumento adicional cursor
             que será proporcionado automáticamente por el decorador.
     :type func: Callable[..., Any]
@@ -38,30 +188,598 @@ def gestor_database(func: Callable[..., Any]) -> Callable[..., Any]:
     """
 
     def db_decorator(self, *args: Any, **kwargs: Any) -> Any:
-        try:
-            with sqlite3.connect(self.db_path) as db_connect:
-                cursor = db_connect.cursor()
-                try:
-                    return func(self, *args, cursor=cursor, **kwargs)
-                finally:
-                    cursor.close()
-        except sqlite3.Error:
-            print("Ha ocurrido un error al acceder a la base de datos")
-            return None
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        for attempt in range(LOCK_RETRIES + 1):
+            try:
+                with self.pool.connection() as db_connect:
+                    # El primer intento usa el busy_timeout de PRAGMAS; los
+                    # reintentos, como mucho el tiempo que queda.
+                    busy = (None if attempt == 0
+                            else _limit_busy_timeout(db_connect, deadline))
+                    cursor = db_connect.cursor()
+                    try:
+                        return func(self, *args, cursor=cursor, **kwargs)
+                    finally:
+                        cursor.close()
+                        if busy is not None:
+                            db_connect.execute(f"PRAGMA busy_timeout={busy}")
+            except sqlite3.OperationalError as error:
+                remaining = deadline - time.monotonic()
+                if "locked" not in str(error) or attempt == LOCK_RETRIES \
+                        or remaining <= 0:
+                    break
+                time.sleep(min(random.uniform(0, RETRY_DELAY * 2 ** attempt),
+                               remaining))
+            except sqlite3.Error:
+                break
+        print("Ha ocurrido un error al acceder a la base de datos")
+        return None
 
     return db_decorator
 
 
+# ------------------------------------------------------ class -> SQLiteBackend
+class SQLiteBackend:
+    """
+    Historial en la base de datos SQLite (``history_results``): el backend
+    por defecto de ``HistoryManager``. Implementa la interfaz
+    ``HistoryBackend`` (``history_backends.py``); cada método usa la
+    conexión del hilo actual con ``gestor_database``.
+
+    :ivar data_path: Ruta de la base de datos (la URI compartida del pool
+        para ``":memory:"``).
+    :vartype data_path: Union[str, Path]
+    :ivar spill_path: Archivo de desbordamiento, junto a la base de datos
+        (``None`` en memoria).
+    :vartype spill_path: Optional[str]
+    :ivar pool: Conexiones de larga duración, una por hilo.
+    :vartype pool: ConnectionPool
+    """
+
+    def __init__(self, db_path: Union[str, Path]) -> None:
+        """
+        Constructor de la clase SQLiteBackend. Las conexiones se abren
+        bajo demanda.
+
+        :param db_path: Ruta de la base de datos.
+        :type db_path: Union[str, Path]
+        """
+        self.pool = ConnectionPool(db_path)
+        self.data_path = (self.pool.database if self.pool.in_memory
+                          else db_path)
+        self.spill_path = (None if self.pool.in_memory
+                           else f"{db_path}.spill.jsonl")
+
+    def close(self) -> None:
+        """
+        Cierra todas las conexiones abiertas.
+        """
+        self.pool.close_all()
+
+    @gestor_database
+    def create(self, cursor=None) -> None:
+        """
+        Crea la tabla o migra el esquema a la última versión (ver
+        ``migrations.py``).
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        """
+        migrate(cursor.connection)
+
+    @gestor_database
+    def insert(self, rows: List[HistoryRow], cursor=None) -> int:
+        """
+        Inserta las filas con ``executemany``. En una transacción, los ID
+        de ``AUTOINCREMENT`` de las filas son consecutivos.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :returns: El ID de la última fila insertada.
+        :rtype: int
+        """
+        cursor.executemany(INSERT_HISTORY_SQL, rows)
+        return cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+    @gestor_database
+    def import_rows(self, rows: List[ImportRow], cursor=None) -> int:
+        """
+        Inserta filas ``(*HistoryRow, CREATED_AT)`` con ``executemany``,
+        conservando su fecha.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: int
+        """
+        cursor.executemany(IMPORT_HISTORY_SQL, rows)
+        return len(rows)
+
+    @gestor_database
+    def delete_all(self, cursor=None) -> int:
+        """
+        Borra todas las filas de ``history_results``.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :returns: Número de filas borradas.
+        :rtype: int
+        """
+        cursor.execute("DELETE FROM history_results")
+        return cursor.rowcount
+
+    @gestor_database
+    def checkpoint(self, cursor=None) -> None:
+        """
+        Vuelca el WAL al archivo principal y lo sincroniza en disco.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        """
+        cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @gestor_database
+    def prune_batch(self, policy: RetentionPolicy, cursor=None) -> int:
+        """
+        Borra como mucho ``policy.batch_size`` de los registros más antiguos
+        que incumplen la política: primero los caducados, después los que
+        sobran por número y, por último, si la base de datos ocupa más de
+        ``max_bytes``.
+
+        :param policy: Política a aplicar.
+        :type policy: RetentionPolicy
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :returns: Número de registros borrados.
+        :rtype: int
+        """
+        limit = policy.batch_size
+        if policy.max_age_days is not None:
+            cursor.execute("""
+                DELETE FROM history_results WHERE ID IN (
+                    SELECT ID FROM history_results
+                    WHERE CREATED_AT < strftime('%Y-%m-%d %H:%M:%f', 'now', ?)
+                    ORDER BY CREATED_AT LIMIT ?)
+            """, (f"-{policy.max_age_days * 86400} seconds", limit))
+            if cursor.rowcount:
+                return cursor.rowcount
+        if policy.max_rows is not None:
+            count = cursor.execute(
+                "SELECT COUNT(*) FROM history_results").fetchone()[0]
+            limit = min(limit, count - policy.max_rows)
+            if limit > 0:
+                return self._delete_oldest(cursor, limit)
+            limit = policy.batch_size
+        if policy.max_bytes is not None:
+            page_size, page_count, free_pages = (
+                cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+                for pragma in ("page_size", "page_count", "freelist_count"))
+            if (page_count - free_pages) * page_size > policy.max_bytes:
+                return self._delete_oldest(cursor, limit)
+        return 0
+
+    @staticmethod
+    def _delete_oldest(cursor: sqlite3.Cursor, limit: int) -> int:
+        """
+        Borra los ``limit`` registros más antiguos (menor ``ID``).
+
+        :rtype: int
+        """
+        cursor.execute("""
+            DELETE FROM history_results WHERE ID IN (
+                SELECT ID FROM history_results ORDER BY ID LIMIT ?)
+        """, (limit,))
+        return cursor.rowcount
+
+    @gestor_database
+    def vacuum(self, pages: int, cursor=None) -> int:
+        """
+        Devuelve al sistema hasta ``pages`` páginas libres
+        (``auto_vacuum=INCREMENTAL``).
+
+        :param pages: Páginas a liberar.
+        :type pages: int
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :returns: Páginas libres que quedan.
+        :rtype: int
+        """
+        # execute() solo avanza un paso del PRAGMA (libera una página);
+        # executescript() lo ejecuta completo.
+        cursor.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+        return cursor.execute("PRAGMA freelist_count").fetchone()[0]
+
+    @gestor_database
+    def read_last(self, limit: int, cursor=None) -> list:
+        """
+        Lee de la base de datos los últimos ``limit`` registros.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: list
+        """
+        query = """
+            SELECT ID, EQUATION, RESULT
+            FROM history_results
+            ORDER BY ID DESC
+            LIMIT ?
+        """
+        cursor.execute(query, (limit,))
+        return list(map(HistoryEntry._make, cursor.fetchall()))
+
+    @gestor_database
+    def read_page(
+            self,
+            before_id: Optional[int],
+            limit: int,
+            cursor=None) -> list:
+        """
+        Página de ``get_records_page``: registros con ``ID < before_id``,
+        del más reciente al más antiguo.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: list
+        """
+        if before_id is None:
+            cursor.execute(
+                "SELECT ID, EQUATION, RESULT FROM history_results "
+                "ORDER BY ID DESC LIMIT ?", (limit,))
+        else:
+            cursor.execute(
+                "SELECT ID, EQUATION, RESULT FROM history_results "
+                "WHERE ID < ? ORDER BY ID DESC LIMIT ?", (before_id, limit))
+        return list(map(HistoryEntry._make, cursor.fetchall()))
+
+    @gestor_database
+    def read_after(self, after_id: int, limit: int, cursor=None) -> list:
+        """
+        Página de ``iter_history`` y ``export``: filas ``(ID, EQUATION,
+        RESULT, CREATED_AT)`` con ``ID > after_id`` (paginación por clave,
+        sin ``OFFSET``).
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: list
+        """
+        cursor.execute("""
+            SELECT ID, EQUATION, RESULT, CREATED_AT
+            FROM history_results
+            WHERE ID > ?
+            ORDER BY ID
+            LIMIT ?
+        """, (after_id, limit))
+        return cursor.fetchall()
+
+    @gestor_database
+    def result_values(self, limit: int, cursor=None) -> list:
+        """
+        Últimos resultados como Decimal, reconstruidos desde
+        ``RESULT_COEF``/``RESULT_EXP`` sin analizar texto (salvo los
+        valores sin codificación exacta, ver ``encode_decimal``).
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: list
+        """
+        cursor.execute("""
+            SELECT EQUATION, RESULT_COEF, RESULT_EXP, RESULT
+            FROM history_results
+            ORDER BY ID DESC
+            LIMIT ?
+        """, (limit,))
+        return [
+            {"equation": i[0], "result": decode_decimal(i[1], i[2], i[3])}
+            for i in cursor.fetchall()
+        ]
+
+    @gestor_database
+    def results_between(
+            self,
+            low: Decimal,
+            high: Decimal,
+            limit: int,
+            cursor=None) -> list:
+        """
+        Registros con ``low <= resultado <= high``, de menor a mayor. El
+        índice de ``RESULT_NUM`` acota los candidatos y el valor exacto
+        decide los extremos. Con un extremo fuera del rango de float
+        (``real_filter``) se ordenan en Python.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: list
+        """
+        condition, params, with_null = real_filter(low, high)
+        cursor.execute(f"""
+            SELECT EQUATION, RESULT_COEF, RESULT_EXP, RESULT
+            FROM history_results
+            WHERE {condition}
+            ORDER BY RESULT_NUM, ID
+        """, params)
+        records = []
+        for equation, coefficient, exponent, text in cursor:
+            result = decode_decimal(coefficient, exponent, text)
+            if (result is not None and result.is_finite()
+                    and low <= result <= high):
+                records.append({"equation": equation, "result": result})
+                if len(records) == limit and not with_null:
+                    break
+        if with_null:
+            # Orden estable: a igual valor se mantiene el orden por ID.
+            records.sort(key=lambda record: record["result"])
+            del records[limit:]
+        return records
+
+    @gestor_database
+    def sum_results(self, operator: Optional[str], cursor=None) -> Decimal:
+        """
+        Suma exacta de los resultados. SQLite suma los coeficientes enteros
+        agrupados por exponente; solo se combinan en Python los subtotales
+        de cada exponente y los valores sin codificación exacta.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: Decimal
+        """
+        where = "" if operator is None else "AND OPERATOR = ?"
+        params = () if operator is None else (operator,)
+        try:
+            cursor.execute(f"""
+                SELECT SUM(RESULT_COEF), RESULT_EXP
+                FROM history_results
+                WHERE RESULT_COEF IS NOT NULL {where}
+                GROUP BY RESULT_EXP
+            """, params)
+            subtotals = cursor.fetchall()
+        except sqlite3.OperationalError:
+            # SUM desborda los 64 bits: se suman las filas en Python.
+            cursor.execute(f"""
+                SELECT RESULT_COEF, RESULT_EXP
+                FROM history_results
+                WHERE RESULT_COEF IS NOT NULL {where}
+            """, params)
+            subtotals = cursor.fetchall()
+        total = Decimal(0)
+        for coefficient, exponent in subtotals:
+            total = EXACT_CONTEXT.add(
+                total, decode_decimal(coefficient, exponent))
+        cursor.execute(f"""
+            SELECT RESULT FROM history_results
+            WHERE RESULT_COEF IS NULL {where}
+        """, params)
+        for (text,) in cursor.fetchall():
+            value = parse_decimal(text)
+            if value is not None and value.is_finite():
+                total = EXACT_CONTEXT.add(total, value)
+        return total
+
+    @gestor_database
+    def stats(
+            self,
+            operator: Optional[str],
+            start: Optional[str],
+            end: Optional[str],
+            by_day: bool,
+            cursor=None) -> List[DailyStats]:
+        """
+        Resumen desde ``history_stats`` (mantenida por disparadores, ver
+        ``migrations.py``), sin recorrer ``history_results``. Antes
+        recalcula el mínimo y el máximo de los grupos marcados ``STALE``
+        (a los que se les borró un extremo). Si la base de datos sigue
+        bloqueada, la consulta entera falla (``None``) y las marcas se
+        conservan para la siguiente: el resumen se deriva de
+        ``history_results`` y no se pierde nada.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: List[DailyStats]
+        """
+        cursor.execute("""
+            UPDATE history_stats SET
+                RESULT_MIN = (SELECT MIN(RESULT_NUM) FROM history_results
+                              WHERE OPERATOR IS NULLIF(history_stats.OPERATOR,
+                                                       '')
+                                AND CREATED_AT >= history_stats.DAY
+                                AND CREATED_AT < date(history_stats.DAY,
+                                                      '+1 day')),
+                RESULT_MAX = (SELECT MAX(RESULT_NUM) FROM history_results
+                              WHERE OPERATOR IS NULLIF(history_stats.OPERATOR,
+                                                       '')
+                                AND CREATED_AT >= history_stats.DAY
+                                AND CREATED_AT < date(history_stats.DAY,
+                                                      '+1 day')),
+                STALE = 0
+            WHERE STALE AND DAY != ''
+        """)
+        cursor.execute("""
+            UPDATE history_stats SET
+                RESULT_MIN = (SELECT MIN(RESULT_NUM) FROM history_results
+                              WHERE OPERATOR IS NULLIF(history_stats.OPERATOR,
+                                                       '')
+                                AND CREATED_AT IS NULL),
+                RESULT_MAX = (SELECT MAX(RESULT_NUM) FROM history_results
+                              WHERE OPERATOR IS NULLIF(history_stats.OPERATOR,
+                                                       '')
+                                AND CREATED_AT IS NULL),
+                STALE = 0
+            WHERE STALE AND DAY = ''
+        """)
+        conditions, params = [], []
+        if operator is not None:
+            conditions.append("OPERATOR = ?")
+            params.append(operator)
+        if start is not None or end is not None:
+            conditions.append("DAY != ''")
+        if start is not None:
+            conditions.append("DAY >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("DAY <= ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        day = "NULLIF(DAY, '')" if by_day else "NULL"
+        group = "DAY, OPERATOR" if by_day else "OPERATOR"
+        cursor.execute(f"""
+            SELECT {day}, NULLIF(OPERATOR, ''), SUM(COUNT),
+                   SUM(RESULT_COUNT), TOTAL(RESULT_SUM), MIN(RESULT_MIN),
+                   MAX(RESULT_MAX)
+            FROM history_stats
+            {where}
+            GROUP BY {group}
+            ORDER BY {group}
+        """, params)
+        return [DailyStats._make(row) for row in cursor.fetchall()]
+
+    @gestor_database
+    def rebuild_stats(self, cursor=None) -> bool:
+        """
+        Calcula ``history_stats`` desde cero recorriendo
+        ``history_results``.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :returns: True (``None`` si falla).
+        :rtype: bool
+        """
+        rebuild_stats(cursor.connection)
+        return True
+
+    @gestor_database
+    def search(
+            self,
+            query: str,
+            limit: int,
+            low: Optional[Decimal],
+            high: Optional[Decimal],
+            cursor=None) -> list:
+        """
+        Búsqueda de ``search_history``. Con el índice FTS5
+        (``history_fts``, tokenizador ``trigram``) un fragmento de 3 o más
+        caracteres no recorre la tabla y los resultados se ordenan por
+        relevancia (``bm25``) y después por recientes. Los fragmentos más
+        cortos, o sin FTS5, usan ``LIKE`` y se ordenan por recientes.
+
+        :param cursor: Conexión a la base de datos proporcionada por el
+            decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: list
+        """
+        fragment = (query or "").strip()
+        conditions: List[str] = []
+        params: List[Any] = []
+        if len(fragment) >= 3 and has_full_text_index(cursor.connection):
+            source = ("history_fts JOIN history_results AS h "
+                      "ON h.ID = history_fts.rowid")
+            conditions.append("history_fts MATCH ?")
+            # Frase entre comillas: el fragmento literal, operadores
+            # incluidos.
+            params.append('"' + fragment.replace('"', '""') + '"')
+            order = "bm25(history_fts), h.ID DESC"
+        else:
+            source = "history_results AS h"
+            if fragment:
+                escaped = (fragment.replace("\\", "\\\\")
+                           .replace("%", "\\%").replace("_", "\\_"))
+                conditions.append("h.EQUATION LIKE ? ESCAPE '\\'")
+                params.append(f"%{escaped}%")
+            order = "h.ID DESC"
+        if low is not None or high is not None:
+            condition, bounds, _ = real_filter(low, high, "h.RESULT_NUM")
+            conditions.append(condition)
+            params.extend(bounds)
+        where = " AND ".join(conditions) or "1"
+        cursor.execute(f"""
+            SELECT h.ID, h.EQUATION, h.RESULT, h.RESULT_COEF, h.RESULT_EXP
+            FROM {source}
+            WHERE {where}
+            ORDER BY {order}
+        """, params)
+        records = []
+        for row_id, equation, text, coefficient, exponent in cursor:
+            if low is not None or high is not None:
+                value = decode_decimal(coefficient, exponent, text)
+                if value is None or not value.is_finite() or \
+                        (low is not None and value < low) or \
+                        (high is not None and value > high):
+                    continue
+            records.append(HistoryEntry(row_id, equation, text))
+            if len(records) >= limit:
+                break
+        return records
+
+
+def open_backend(
+        storage: str,
+        db_path: Union[str, Path]) -> HistoryBackend:
+    """
+    Crea el backend del historial.
+
+    :param storage: ``"sqlite"`` (la base de datos ``db_path``),
+        ``"memory"`` (sin disco) o ``"log"`` (``db_path`` con extensión
+        ``.jsonl``). Ver ``history_backends.py``.
+    :type storage: str
+    :param db_path: Ruta de la base de datos.
+    :type db_path: Union[str, Path]
+    :rtype: HistoryBackend
+    :raises ValueError: Si ``storage`` no es uno de ``STORAGES``.
+    """
+    if storage == "sqlite":
+        return SQLiteBackend(db_path)
+    if storage == "memory":
+        return MemoryBackend()
+    if storage == "log":
+        return AppendLogBackend(Path(db_path).with_suffix(".jsonl"))
+    raise ValueError(
+        f"Almacén desconocido: {storage} (válidos: {', '.join(STORAGES)})")
+
+
 # ----------------------------------------------------- class -> HistoryManager
 class HistoryManager:
     """
-    Gestiona las operaciones create-read-delete en la base de datos.
+    Gestiona las operaciones create-read-delete del historial.
     Esta clase implementa el patrón Singleton para asegurar una única
     instancia de conexión.
+
+    :cvar _db_path: Ruta de la base de datos. Si es ``None`` se usa
+        ``calculator_db.db`` en la raíz del proyecto.
+    :cvar storage: Backend del historial (``"sqlite"``, ``"memory"`` o
+        ``"log"``). Si es ``None`` se usa la variable de entorno
+        ``CALCULATOR_HISTORY_STORAGE`` o, si no está, ``"sqlite"``.
+    :cvar retention: Política de retención que aplica ``housekeeping``
+        (``None``: el historial no se poda).
+    :cvar strict: Validación estricta de los registros nuevos (ver
+        ``history_db.to_history_row``).
+    :ivar backend: Almacén del historial (``history_backends.py``).
+    :vartype backend: HistoryBackend
+    :ivar writer: Cola de escritura por lotes de ``queue_history``.
+    :vartype writer: HistoryWriter
+    :ivar recent: Últimos registros en memoria para ``get_last_records``.
+    :vartype recent: RecentHistory
+    :ivar spill: Registros que no se pudieron escribir, pendientes de
+        ``replay_spill`` (``None`` si el backend no usa el disco).
+    :vartype spill: Optional[HistorySpill]
     """
 
     _instance = None
     _db_path = None
+    storage: Optional[str] = None
+    retention: Optional[RetentionPolicy] = None
+    strict = False
 
     def __new__(cls):
         """
@@ -69,41 +787,147 @@ class HistoryManager:
 
         :returns: Instancia única de `HistoryManager`.
         :rtype: HistoryManager
+        :raises ValueError: Si el backend configurado no existe.
         """
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
             # Obtener la ruta del directorio del proyecto
             project_dir = Path(__file__).parent.parent.parent
-            cls._instance.db_path = project_dir / "calculator_db.db"
+            db_path = cls._db_path or project_dir / "calculator_db.db"
+            backend = open_backend(
+                cls.storage or os.environ.get(STORAGE_ENV, "sqlite"),
+                db_path)
+            cls._instance = super().__new__(cls)
+            cls._instance.db_path = db_path
+            cls._instance.backend = backend
+            cls._instance.writer = HistoryWriter(cls._instance)
+            cls._instance.recent = RecentHistory(backend.data_path)
+            cls._instance.spill = (
+                None if backend.spill_path is None
+                else HistorySpill(backend.spill_path))
         return cls._instance
 
-    @gestor_database
-    def create_table(self, cursor=None) -> None:
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
         """
-        Verifica si la tabla de historial existe; si no existe, la crea.
+        Conexiones del backend SQLite (``None`` con otros backends).
 
-        :param cursor: Conexión a la base de datos proporcionada por el
-            decorador.
-        :type cursor: sqlite3.Cursor
+        :rtype: Optional[ConnectionPool]
+        """
+        return getattr(self.backend, "pool", None)
+
+    def close(self) -> None:
+        """
+        Escribe los registros encolados y cierra todas las conexiones
+        abiertas (por ejemplo, al salir de la aplicación). Las llamadas
+        posteriores vuelven a abrirlas.
 
         :returns: None
         :rtype: None
         """
-        create_table_sql = """
-            CREATE TABLE IF NOT EXISTS history_results (
-                ID INTEGER PRIMARY KEY AUTOINCREMENT,
-                EQUATION CHAR(50),
-                RESULT CHAR(50)
-            );
+        self.writer.close()
+        self.recent.close()
+        self.backend.close()
+
+    def queue_history(
+            self,
+            history_equation: str,
+            history_result: Decimal) -> None:
         """
-        cursor.execute(create_table_sql)
+        Encola un registro para escribirlo por lotes, sin esperar a la base
+        de datos. Ver ``HistoryWriter``.
+
+        :param history_equation: La ecuación a guardar.
+        :type history_equation: str
+        :param history_result: El resultado de la ecuación.
+        :type history_result: Decimal
+        :returns: None
+        :rtype: None
+        """
+        self.writer.append(history_equation, history_result)
+
+    def insert_many(self, records: List[HistoryRow]) -> Optional[int]:
+        """
+        Inserta varios registros en una sola transacción y los añade a los
+        registros recientes en memoria.
+
+        :param records: Filas de ``history_db.to_history_row``.
+        :type records: List[HistoryRow]
+        :returns: Número de registros insertados (``None`` si falla).
+        :rtype: Optional[int]
+        """
+        # RecentHistory añade ``inserted`` después de ejecutar ``insert``,
+        # cuando ya se conocen los ID.
+        inserted: List[HistoryEntry] = []
+
+        def insert() -> Optional[int]:
+            last_id = self.backend.insert(records)
+            if last_id is None:
+                return None
+            first_id = last_id - len(records) + 1
+            inserted.extend(
+                HistoryEntry(first_id + index, row[0], row[1])
+                for index, row in enumerate(records))
+            return len(records)
+
+        return self.recent.append(insert, inserted)
+
+    def checkpoint(self) -> None:
+        """
+        Sincroniza en disco lo escrito (con SQLite, vuelca el WAL al
+        archivo principal).
+
+        :returns: None
+        :rtype: None
+        """
+        self.backend.checkpoint()
+
+    def create_table(self) -> None:
+        """
+        Verifica si la tabla de historial existe; si no existe, la crea.
+        Si existe con un esquema anterior, la migra a la última versión
+        (ver ``migrations.py``). Con otros backends, prepara el almacén.
+        Después vuelca los registros pendientes del archivo de
+        desbordamiento.
+
+        :returns: None
+        :rtype: None
+        """
+        self.backend.create()
+        self.replay_spill()
+
+    def replay_spill(self) -> int:
+        """
+        Escribe en la base de datos, en una transacción, los registros del
+        archivo de desbordamiento (de este o de otros procesos) y lo borra.
+        Si falla, el archivo se conserva para el siguiente intento.
+
+        :returns: Número de registros escritos.
+        :rtype: int
+        """
+        if self.spill is None or not self.spill.pending():
+            return 0
+        count = self.spill.drain(self._replay_rows)
+        if count:
+            self.recent.invalidate()
+        return count
+
+    def _replay_rows(self, records) -> Optional[int]:
+        """
+        Inserta los registros de ``records()`` conservando su
+        ``CREATED_AT``.
+
+        :param records: Devuelve un iterador de registros
+            ``(equation, result, created_at)``.
+        :rtype: Optional[int]
+        """
+        return self.backend.import_rows([
+            (*history_row(equation, result), created_at)
+            for equation, result, created_at in records()])
 
-    @gestor_database
     def new_history(
             self,
             history_equation: str,
-            history_result: Decimal,
-            cursor=None) -> None:
+            history_result: Decimal) -> None:
         """
         Agrega un nuevo registro (ecuación y resultado) al historial en la base
         de datos.
@@ -114,71 +938,408 @@ class HistoryManager:
         :param history_result: El resultado de la ecuación.
         :type history_result: Decimal
 
-        :param cursor: Conexión a la base de datos proporcionada por el
-            decorador.
-        :type cursor: sqlite3.Cursor
+        Si la base de datos no está disponible ni tras los reintentos, el
+        registro se guarda en el archivo de desbordamiento (``spill``).
 
         :returns: None
         :rtype: None
+        :raises pydantic.ValidationError: Si los datos no son válidos.
         """
-        history_table_db_instance: HistoryTableDB = HistoryTableDB(
-            equation=history_equation,
-            result=history_result
-        )
-
-        if history_table_db_instance:
-            equation_str = history_table_db_instance.equation
-            result_str = str(history_table_db_instance.result)
+        rows = [to_history_row(history_equation, history_result,
+                               self.strict)]
+        if self.insert_many(rows) is None and self.spill is not None:
+            self.spill.write(rows)
 
-            cursor.execute(
-                "INSERT INTO history_results (EQUATION, RESULT) VALUES (?,?)",
-                (equation_str, result_str)
-            )
+    def delete_history(self) -> None:
+        """
+        Elimina todos los registros del historial en la base de datos (y
+        de memoria).
 
-    @gestor_database
-    def delete_history(self, cursor=None) -> None:
+        :returns: None
+        :rtype: None
+        :raises HistoryWriteError: Si no se pudo borrar.
         """
-        Elimina todos los registros del historial en la base de datos.
+        self.writer.discard()
+        if self.recent.clear(self.backend.delete_all) is None:
+            raise HistoryWriteError("No se pudo borrar el historial")
 
-        :param cursor: Conexión a la base de datos proporcionada por el
-            decorador.
-        :type cursor: sqlite3.Cursor
+    def set_retention(self, policy: Optional[RetentionPolicy]) -> None:
+        """
+        Cambia la política de retención y programa su aplicación en el
+        próximo periodo inactivo del hilo de escritura.
 
+        :param policy: Nueva política (``None`` la desactiva).
+        :type policy: Optional[RetentionPolicy]
         :returns: None
         :rtype: None
         """
-        cursor.execute("DELETE FROM history_results")
+        self.retention = policy
+        if policy is not None:
+            self.writer.schedule_housekeeping()
 
-    @gestor_database
-    def get_last_records(self, limit=5, cursor=None) -> list:
+    def prune(
+            self,
+            policy: Optional[RetentionPolicy] = None,
+            max_batches: Optional[int] = None) -> int:
+        """
+        Aplica una política de retención por lotes de ``batch_size``
+        registros, cada uno en su transacción y seguido de un
+        ``incremental_vacuum``, hasta cumplirla o llegar a ``max_batches``.
+
+        :param policy: Política a aplicar (por defecto, ``retention``).
+        :type policy: Optional[RetentionPolicy]
+        :param max_batches: Lotes como máximo (``None``: sin límite).
+        :type max_batches: Optional[int]
+        :returns: Número de registros borrados.
+        :rtype: int
+        :raises HistoryWriteError: Si un lote no se pudo borrar (los
+            anteriores quedan borrados).
+        """
+        policy = policy or self.retention
+        if policy is None:
+            return 0
+        self.writer.flush()
+        deleted = 0
+        batches = 0
+        try:
+            while max_batches is None or batches < max_batches:
+                count = self.backend.prune_batch(policy)
+                if count is None:
+                    raise HistoryWriteError(
+                        f"No se pudo podar el historial ({deleted} "
+                        "registros borrados)")
+                self.backend.vacuum(policy.vacuum_pages)
+                if not count:
+                    break
+                deleted += count
+                batches += 1
+        finally:
+            if deleted:
+                self.recent.invalidate()
+        return deleted
+
+    def housekeeping(self) -> bool:
+        """
+        Un paso de mantenimiento: un lote de la política de retención y un
+        ``incremental_vacuum``. Lo llama ``HistoryWriter`` cuando está
+        inactivo.
+
+        :returns: True si queda trabajo (registros por podar o páginas
+            libres, o un paso que falló y se reintentará).
+        :rtype: bool
+        """
+        policy = self.retention
+        if policy is None:
+            return False
+        deleted = self.backend.prune_batch(policy)
+        if deleted is None:
+            return True
+        free_pages = self.backend.vacuum(policy.vacuum_pages)
+        if deleted:
+            self.recent.invalidate()
+        return bool(deleted) or bool(free_pages)
+
+    def get_last_records(self, limit=5) -> list:
         """
         Obtiene los últimos registros del historial, ordenados de forma
         descendente por ID.
 
+        Se responde desde los registros recientes en memoria
+        (``RecentHistory``); solo lee la base de datos la primera vez, si
+        otro proceso la ha modificado o si ``limit`` supera los registros
+        guardados en memoria.
+
         :param limit: Número máximo de registros a obtener (por defecto 5).
+            Un valor negativo devuelve todos los registros.
         :type limit: int
 
-        :param cursor: Conexión a la base de datos proporcionada por el
-            decorador.
-        :type cursor: sqlite3.Cursor
+        :returns: Lista de ``HistoryEntry`` (``id``, ``equation`` y
+            ``result``). Antes eran diccionarios sin ``id``:
+            ``record._asdict()`` da el diccionario.
+        :rtype: list
+        """
+        # Los registros encolados también deben aparecer.
+        self.writer.flush()
+        return self.recent.read(limit, self.backend.read_last)
+
+    def get_records_page(
+            self,
+            before_id: Optional[int] = None,
+            limit: int = 100) -> list:
+        """
+        Obtiene una página del historial, del más reciente al más antiguo,
+        con paginación por clave: la página siguiente empieza en el ``id``
+        del último registro recibido, sin ``OFFSET``.
 
-        :returns: Lista de diccionarios, cada uno con los campos 'equation' y
-            'result'.
+        :param before_id: Devuelve solo registros con ``ID`` menor (``None``
+            para empezar por el más reciente).
+        :type before_id: Optional[int]
+        :param limit: Registros por página.
+        :type limit: int
+        :returns: Lista de ``HistoryEntry`` (``id``, ``equation`` y
+            ``result``).
         :rtype: list
         """
-        query = """
-            SELECT ID, EQUATION, RESULT
-            FROM history_results
-            ORDER BY ID DESC
-            LIMIT ?
+        self.writer.flush()
+        return self.backend.read_page(before_id, limit)
+
+    def iter_history(
+            self,
+            after_id: Optional[int] = None,
+            page_size: int = 1000) -> Iterator[HistoryEntry]:
         """
-        cursor.execute(query, (limit,))
+        Recorre el historial en orden de ``ID`` sin cargarlo entero en
+        memoria: lee páginas de ``page_size`` filas con paginación por clave
+        (``WHERE ID > ?``, que usa la clave primaria; sin ``OFFSET``) y las
+        entrega una a una. La memoria usada no depende del tamaño de la
+        tabla.
 
-        records = [
-            {"equation": i[1], "result": i[2]} for i in cursor.fetchall()
-        ]
+        Cada página es una lectura corta: los registros insertados durante
+        el recorrido con ``ID`` mayor que el último leído también se
+        entregan.
 
-        return records
+        :param after_id: Empieza después de este ``ID`` (``None``: desde el
+            principio).
+        :type after_id: Optional[int]
+        :param page_size: Filas por lectura.
+        :type page_size: int
+        :returns: Registros ``HistoryEntry(id, equation, result)``.
+        :rtype: Iterator[HistoryEntry]
+        :raises ValueError: Si ``page_size`` no es positivo.
+        """
+        if page_size <= 0:
+            raise ValueError("page_size debe ser positivo")
+        self.writer.flush()
+        last_id = 0 if after_id is None else after_id
+        while True:
+            page = self.backend.read_after(last_id, page_size)
+            if not page:
+                return
+            for row in page:
+                yield HistoryEntry(row[0], row[1], row[2])
+            last_id = page[-1][0]
+
+    def export(
+            self,
+            path: Union[str, Path],
+            fmt: Optional[str] = None,
+            chunk_size: int = 10000,
+            progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Exporta el historial, en orden de ``ID``, a un archivo CSV o JSONL
+        (comprimido con gzip si la ruta termina en ``.gz``; ver
+        ``history_io.py``). Lee y escribe bloques de ``chunk_size``
+        registros, así que la memoria no depende del tamaño de la tabla.
+
+        :param path: Archivo de destino (se sobrescribe).
+        :type path: Union[str, Path]
+        :param fmt: ``"csv"`` o ``"jsonl"``; ``None`` lo deduce de la
+            extensión.
+        :type fmt: Optional[str]
+        :param chunk_size: Registros por lectura.
+        :type chunk_size: int
+        :param progress: Se llama tras cada bloque con los registros
+            exportados hasta el momento.
+        :type progress: Optional[Callable[[int], None]]
+        :returns: Número de registros exportados.
+        :rtype: int
+        :raises ValueError: Si el formato no es válido o ``chunk_size`` no
+            es positivo.
+        """
+        fmt, compressed = detect_format(path, fmt)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser positivo")
+        self.writer.flush()
+        exported = 0
+        last_id = 0
+        with open_text(path, "w", compressed) as file:
+            write_header(file, fmt)
+            while True:
+                chunk = self.backend.read_after(last_id, chunk_size)
+                if not chunk:
+                    break
+                write_rows(file, fmt, (row[1:] for row in chunk))
+                exported += len(chunk)
+                last_id = chunk[-1][0]
+                if progress is not None:
+                    progress(exported)
+        return exported
+
+    def import_(
+            self,
+            path: Union[str, Path],
+            fmt: Optional[str] = None,
+            batch_size: int = 10000,
+            progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Añade al historial los registros de un archivo de ``export``. Lee
+        el archivo en bloques de ``batch_size`` registros y escribe cada
+        bloque con ``executemany`` en una transacción; se conservan
+        ``created_at`` y el texto del resultado.
+
+        Si la base de datos falla, los bloques anteriores quedan guardados
+        y se lanza ``HistoryWriteError``.
+
+        :param path: Archivo de origen.
+        :type path: Union[str, Path]
+        :param fmt: ``"csv"`` o ``"jsonl"``; ``None`` lo deduce de la
+            extensión.
+        :type fmt: Optional[str]
+        :param batch_size: Registros por transacción.
+        :type batch_size: int
+        :param progress: Se llama tras cada bloque con los registros
+            importados hasta el momento.
+        :type progress: Optional[Callable[[int], None]]
+        :returns: Número de registros importados.
+        :rtype: int
+        :raises ValueError: Si el formato no es válido, ``batch_size`` no
+            es positivo o un registro está incompleto.
+        :raises HistoryWriteError: Si no se pudo escribir un bloque.
+        """
+        fmt, compressed = detect_format(path, fmt)
+        if batch_size <= 0:
+            raise ValueError("batch_size debe ser positivo")
+        self.writer.flush()
+        imported = 0
+        try:
+            with open_text(path, "r", compressed) as file:
+                records = read_rows(file, fmt)
+                while True:
+                    batch = [(*history_row(equation, result), created_at)
+                             for equation, result, created_at
+                             in islice(records, batch_size)]
+                    if not batch:
+                        break
+                    if self.backend.import_rows(batch) is None:
+                        raise HistoryWriteError(
+                            f"No se pudo importar el historial ({imported} "
+                            "registros importados)")
+                    imported += len(batch)
+                    if progress is not None:
+                        progress(imported)
+        finally:
+            if imported:
+                self.recent.invalidate()
+        return imported
+
+    def get_result_values(self, limit: int = 5) -> list:
+        """
+        Obtiene los últimos resultados como Decimal (sin redondear, a
+        diferencia del texto de ``get_last_records``).
+
+        :param limit: El número de registros a obtener.
+        :type limit: int
+        :returns: Lista de diccionarios con ``equation`` y ``result``
+            (Decimal).
+        :rtype: list
+        """
+        self.writer.flush()
+        return self.backend.result_values(limit)
+
+    def get_results_between(
+            self,
+            low: Decimal,
+            high: Decimal,
+            limit: int = 100) -> list:
+        """
+        Obtiene los registros con ``low <= resultado <= high``, de menor a
+        mayor.
+
+        :param low: Extremo inferior.
+        :type low: Decimal
+        :param high: Extremo superior.
+        :type high: Decimal
+        :param limit: Número máximo de registros.
+        :type limit: int
+        :returns: Lista de diccionarios con ``equation`` y ``result``
+            (Decimal).
+        :rtype: list
+        """
+        self.writer.flush()
+        return self.backend.results_between(low, high, limit)
+
+    def sum_results(self, operator: Optional[str] = None) -> Decimal:
+        """
+        Suma exacta de los resultados (opcionalmente, de un operador).
+
+        :param operator: Operador por el que filtrar (``None``: todos).
+        :type operator: Optional[str]
+        :returns: La suma exacta.
+        :rtype: Decimal
+        """
+        self.writer.flush()
+        return self.backend.sum_results(operator)
+
+    def stats(
+            self,
+            operator: Optional[str] = None,
+            start: Optional[Union[str, date]] = None,
+            end: Optional[Union[str, date]] = None,
+            by_day: bool = True) -> Optional[List[DailyStats]]:
+        """
+        Número de registros y suma, mínimo y máximo del resultado por día y
+        operador. Con SQLite se responde desde ``history_stats`` (mantenida
+        por disparadores, ver ``migrations.py``), sin recorrer
+        ``history_results``: el coste depende del número de días y
+        operadores, no de registros.
+
+        :param operator: Solo este operador (``None``: todos).
+        :type operator: Optional[str]
+        :param start: Primer día incluido (``"YYYY-MM-DD"`` o ``date``).
+        :type start: Optional[Union[str, date]]
+        :param end: Último día incluido.
+        :type end: Optional[Union[str, date]]
+        :param by_day: Si es False, agrega todos los días por operador (con
+            ``day=None``).
+        :type by_day: bool
+        :returns: Resúmenes ordenados por día y operador (``None`` si
+            la base de datos no está disponible; se puede repetir).
+        :rtype: Optional[List[DailyStats]]
+        """
+        self.writer.flush()
+        return self.backend.stats(
+            operator, None if start is None else str(start),
+            None if end is None else str(end), by_day)
+
+    def rebuild_stats(self) -> None:
+        """
+        Calcula el resumen de ``stats`` desde cero (por ejemplo, tras
+        modificar ``history_results`` sin disparadores o para corregir el
+        redondeo acumulado de las sumas).
+
+        :returns: None
+        :rtype: None
+        :raises HistoryWriteError: Si no se pudo guardar el resumen.
+        """
+        if self.backend.rebuild_stats() is None:
+            raise HistoryWriteError("No se pudo recalcular el resumen")
+
+    def search_history(
+            self,
+            query: str = "",
+            limit: int = 20,
+            low: Optional[Decimal] = None,
+            high: Optional[Decimal] = None) -> list:
+        """
+        Busca registros cuya ecuación contiene ``query`` (sin distinguir
+        mayúsculas), opcionalmente con el resultado en ``[low, high]``.
+        Con SQLite y FTS5 se ordenan por relevancia; si no, por recientes
+        (ver ``SQLiteBackend.search``).
+
+        :param query: Fragmento a buscar (vacío: cualquier ecuación).
+        :type query: str
+        :param limit: Número máximo de resultados.
+        :type limit: int
+        :param low: Resultado mínimo (``None``: sin mínimo).
+        :type low: Optional[Decimal]
+        :param high: Resultado máximo (``None``: sin máximo).
+        :type high: Optional[Decimal]
+        :returns: Lista de ``HistoryEntry`` (``id``, ``equation`` y
+            ``result``).
+        :rtype: list
+        """
+        self.writer.flush()
+        return self.backend.search(query, limit, low, high)
 
 
 # TEST: pruebas simples de funcionamiento de base de datos. Teporales.
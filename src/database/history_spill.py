@@ -0,0 +1,162 @@
+# MODULO: history_spill.py
+"""
+Archivo de desbordamiento (spill) del historial.
+
+Si un registro no se puede escribir en la base de datos ni tras los
+reintentos de ``gestor_database`` (por ejemplo, otro proceso la mantiene
+bloqueada), ``HistoryManager`` lo guarda en un archivo JSONL junto a ella
+(``calculator_db.db.spill.jsonl``, mismo formato que ``history_io``) en
+lugar de perderlo. ``HistoryManager.replay_spill`` lo vuelca después en la
+base de datos en una sola transacción y lo borra.
+
+Varios procesos comparten el archivo. Con ``fcntl`` (POSIX) cada acceso
+toma un bloqueo exclusivo del archivo: quien escribe espera a que termine
+el volcado y, si el archivo se ha borrado entretanto, abre uno nuevo. Sin
+``fcntl`` cada escritura es una única llamada ``write`` en modo
+``O_APPEND``, y solo el cerrojo entre hilos protege el volcado.
+"""
+import io
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, IO, Iterator, List, Optional, Union
+from .history_db import HistoryRow
+from .history_io import ExportRow, write_rows
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    fcntl = None
+
+
+@contextmanager
+def _file_lock(file: IO) -> Iterator[None]:
+    """
+    Bloqueo exclusivo entre procesos de un archivo abierto (si hay
+    ``fcntl``).
+    """
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def _is_current(file: IO, path: Path) -> bool:
+    """
+    Indica si ``file`` sigue siendo el archivo de ``path`` (no se ha borrado
+    ni sustituido desde que se abrió).
+    """
+    try:
+        return os.stat(path).st_ino == os.fstat(file.fileno()).st_ino
+    except FileNotFoundError:
+        return False
+
+
+# ------------------------------------------------------ class -> HistorySpill
+class HistorySpill:
+    """
+    Registros del historial pendientes de escribir, en un archivo JSONL.
+
+    :ivar path: Ruta del archivo.
+    :vartype path: Path
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Constructor de la clase HistorySpill. No crea el archivo.
+
+        :param path: Ruta del archivo.
+        :type path: Union[str, Path]
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def write(self, rows: List[HistoryRow]) -> None:
+        """
+        Añade filas al archivo y lo sincroniza en disco. ``CREATED_AT`` es
+        el momento actual (UTC), como si se hubieran escrito ahora.
+
+        :param rows: Filas de ``history_db.to_history_row``.
+        :type rows: List[HistoryRow]
+        """
+        created_at = datetime.now(timezone.utc).strftime(
+            "%Y-%m-%d %H:%M:%S.%f")[:-3]
+        buffer = io.StringIO()
+        write_rows(buffer, "jsonl",
+                   ((row[0], row[1], created_at) for row in rows))
+        data = buffer.getvalue().encode("utf-8")
+        with self._lock:
+            while True:
+                with open(self.path, "ab") as file:
+                    with _file_lock(file):
+                        if not _is_current(file, self.path):
+                            # Se volcó y borró mientras se esperaba.
+                            continue
+                        os.write(file.fileno(), data)
+                        os.fsync(file.fileno())
+                        return
+
+    def pending(self) -> bool:
+        """
+        Indica si hay registros en el archivo.
+
+        :rtype: bool
+        """
+        return self.path.exists()
+
+    def drain(
+            self,
+            consume: Callable[[Callable[[], Iterator[ExportRow]]],
+                              Optional[int]]) -> int:
+        """
+        Entrega los registros del archivo a ``consume`` y, si los guarda,
+        borra el archivo (con el bloqueo tomado, así que ningún registro
+        escrito entretanto se pierde).
+
+        :param consume: Recibe una función que devuelve un iterador nuevo
+            sobre los registros ``(equation, result, created_at)`` cada vez
+            que se llama (para poder reintentar) y devuelve el número de
+            registros guardados, o None si falla.
+        :type consume: Callable
+        :returns: Registros volcados (0 si no había o si falló).
+        :rtype: int
+        """
+        with self._lock:
+            try:
+                file = open(self.path, "r", encoding="utf-8", newline="")
+            except FileNotFoundError:
+                return 0
+            with file, _file_lock(file):
+                if not _is_current(file, self.path):
+                    return 0
+
+                def records() -> Iterator[ExportRow]:
+                    file.seek(0)
+                    return self._read(file)
+
+                count = consume(records)
+                if count is None:
+                    return 0
+                os.unlink(self.path)
+                return count
+
+    @staticmethod
+    def _read(file: IO) -> Iterator[ExportRow]:
+        """
+        Registros del archivo. Omite las líneas incompletas o no válidas
+        (por ejemplo, la última si el proceso se interrumpió al escribirla).
+        """
+        for line in file:
+            try:
+                record = json.loads(line)
+                yield (record["equation"], record["result"],
+                       record.get("created_at"))
+            except (ValueError, KeyError, TypeError):
+                continue
@@ -0,0 +1,222 @@
+# MODULO: history_writer.py
+"""
+Escritura diferida (write-behind) del historial.
+
+``HistoryManager.new_history`` hace un INSERT y una transacción por
+resultado. ``HistoryWriter`` acumula los registros en memoria y los escribe
+por lotes con ``executemany`` en una sola transacción
+(``HistoryManager.insert_many``). Un lote se escribe:
+
+- al alcanzar ``batch_size`` registros;
+- ``max_delay`` segundos después de encolar el primero;
+- al llamar a ``flush`` o ``close`` (y en la salida del intérprete, con
+  ``atexit``).
+
+Las escrituras por tamaño y por tiempo las hace un hilo propio, de modo que
+quien encola no espera a SQLite. Cuando el hilo lleva ``idle_delay`` segundos
+sin registros pendientes, aprovecha para el mantenimiento
+(``HistoryManager.housekeeping``, un lote de la política de retención) y
+repite mientras quede trabajo y no lleguen registros nuevos. ``close``
+escribe lo pendiente y fuerza un checkpoint del WAL, que deja los datos
+sincronizados en disco.
+"""
+import atexit
+import threading
+import time
+from decimal import Decimal
+from typing import List, Optional
+from .history_db import HistoryRow, to_history_row
+
+
+# ------------------------------------------------------ class -> HistoryWriter
+class HistoryWriter:
+    """
+    Cola de escritura por lotes para el historial de un ``HistoryManager``.
+
+    :ivar batch_size: Registros que disparan una escritura inmediata.
+    :vartype batch_size: int
+    :ivar max_delay: Segundos máximos que un registro espera en la cola.
+    :vartype max_delay: float
+    :ivar idle_delay: Segundos sin escrituras antes del mantenimiento.
+    :vartype idle_delay: float
+    """
+
+    def __init__(
+            self,
+            manager,
+            batch_size: int = 50,
+            max_delay: float = 0.5,
+            idle_delay: float = 5.0) -> None:
+        """
+        Constructor de la clase HistoryWriter. El hilo de escritura se
+        inicia con el primer registro.
+
+        :param manager: Gestor cuyo ``insert_many`` escribe los lotes.
+        :type manager: HistoryManager
+        :param batch_size: Registros que disparan una escritura inmediata.
+        :type batch_size: int
+        :param max_delay: Segundos máximos que un registro espera en la cola.
+        :type max_delay: float
+        :param idle_delay: Segundos sin escrituras antes del mantenimiento.
+        :type idle_delay: float
+        :raises ValueError: Si algún umbral no es positivo.
+        """
+        if batch_size <= 0 or max_delay <= 0 or idle_delay <= 0:
+            raise ValueError("Los umbrales de escritura deben ser positivos")
+        self.manager = manager
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.idle_delay = idle_delay
+        self._pending: List[HistoryRow] = []
+        self._first_queued: Optional[float] = None
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._written = False
+        # Hay mantenimiento por hacer en el próximo periodo inactivo.
+        self._idle_work = True
+        atexit.register(self.close)
+
+    def append(self, equation: str, result: Decimal) -> None:
+        """
+        Encola un registro del historial.
+
+        :param equation: La ecuación a guardar.
+        :type equation: str
+        :param result: El resultado de la ecuación.
+        :type result: Decimal
+        :raises pydantic.ValidationError: Si los datos no son válidos.
+        """
+        row = to_history_row(equation, result, self.manager.strict)
+        with self._condition:
+            self._pending.append(row)
+            if self._first_queued is None:
+                self._first_queued = time.monotonic()
+                # Despierta al hilo si esperaba para el mantenimiento.
+                self._condition.notify()
+            self._start_thread()
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+
+    def schedule_housekeeping(self) -> None:
+        """
+        Pide un mantenimiento en el próximo periodo inactivo (por ejemplo,
+        al cambiar la política de retención).
+        """
+        with self._condition:
+            self._idle_work = True
+            self._start_thread()
+            self._condition.notify()
+
+    def _start_thread(self) -> None:
+        """
+        Inicia el hilo de escritura si no está en marcha. Se llama con
+        ``_condition`` tomado.
+        """
+        if self._thread is None and not self._stopping:
+            self._thread = threading.Thread(
+                target=self._run, name="history-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """
+        Bucle del hilo de escritura: espera a que se cumpla un umbral y
+        escribe el lote, o hace un lote de mantenimiento si está inactivo.
+        """
+        while True:
+            idle = False
+            with self._condition:
+                while not self._stopping:
+                    if len(self._pending) >= self.batch_size:
+                        break
+                    if self._first_queued is None:
+                        if not self._idle_work:
+                            self._condition.wait()
+                        elif not self._condition.wait(self.idle_delay) \
+                                and self._first_queued is None:
+                            idle = True
+                            break
+                        continue
+                    remaining = (self._first_queued + self.max_delay
+                                 - time.monotonic())
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopping:
+                    return
+            if idle:
+                self._idle_work = bool(self.manager.housekeeping())
+            else:
+                self.flush()
+                self._idle_work = True
+
+    def flush(self) -> int:
+        """
+        Escribe los registros pendientes en una sola transacción.
+
+        Si la escritura falla, los registros vuelven a la cola (``close``
+        guarda en el archivo de desbordamiento los que no se pudieron
+        escribir). Si se escribe y hay registros desbordados, los vuelca.
+
+        :returns: Número de registros escritos.
+        :rtype: int
+        """
+        with self._flush_lock:
+            with self._condition:
+                rows, self._pending = self._pending, []
+                self._first_queued = None
+            if not rows:
+                return 0
+            if self.manager.insert_many(rows) is None:
+                with self._condition:
+                    self._pending[:0] = rows
+                    self._first_queued = time.monotonic()
+                return 0
+            self._written = True
+        self.manager.replay_spill()
+        return len(rows)
+
+    def discard(self) -> None:
+        """
+        Descarta los registros pendientes sin escribirlos.
+        """
+        with self._condition:
+            self._pending = []
+            self._first_queued = None
+
+    def close(self) -> None:
+        """
+        Detiene el hilo, escribe lo pendiente y sincroniza el WAL en disco.
+        Lo que no se pueda escribir se guarda en el archivo de
+        desbordamiento del gestor.
+
+        Se registra con ``atexit``. Si no se ha escrito nada desde el último
+        cierre, no abre la base de datos. Un registro encolado después vuelve
+        a iniciar el hilo.
+        """
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join()
+        with self._condition:
+            self._stopping = False
+        self.flush()
+        with self._condition:
+            rows, self._pending = self._pending, []
+            self._first_queued = None
+        if rows and self.manager.spill is not None:
+            self.manager.spill.write(rows)
+        if self._written:
+            self._written = False
+            self.manager.checkpoint()
+
+    def __len__(self) -> int:
+        """
+        Número de registros pendientes.
+
+        :rtype: int
+        """
+        return len(self._pending)
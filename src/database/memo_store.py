@@ -0,0 +1,321 @@
+# MODULO: memo_store.py
+"""
+Almacén persistente de resultados de ``Calculator`` (memoización en disco).
+
+La caché de resultados (``core/result_cache.py``) empieza vacía en cada
+ejecución. ``MemoStore`` guarda sus resultados en una tabla propia,
+``memo_results``, dentro de ``calculator_db.db``, para que los cálculos
+repetidos entre ejecuciones sean consultas.
+
+No se siembra desde ``history_results``: allí se guarda el resultado ya
+redondeado a dos decimales por la interfaz, que no es el resultado de
+``Calculator`` (28 dígitos, con su exponente), y la ecuación es texto libre.
+
+Características:
+
+- **Consultas solo en memoria**: ``get`` y ``put`` nunca leen ni escriben
+  la base de datos, así que una consulta desde el hilo de la interfaz no
+  espera a SQLite (``busy_timeout`` y reintentos).
+- **Carga previa**: ``load`` lee la tabla (hasta ``max_entries`` filas, las
+  usadas más recientemente); ``preload`` lo hace en un hilo en segundo
+  plano al arrancar. Hasta entonces, las consultas fallan y se calculan.
+- **Límite de tamaño**: en memoria se desaloja el resultado usado hace más
+  tiempo; en disco, ``flush`` borra las filas que sobrepasan el límite.
+- **Escritura diferida**: los resultados nuevos y los usados se marcan como
+  pendientes y se escriben juntos con ``flush``, al cerrar la aplicación
+  (``close``).
+- **Sin SQLite**: si ``HistoryManager`` usa un backend sin base de datos
+  (``memory`` o ``log``, ver ``history_backends.py``), el almacén creado sin
+  ruta solo guarda los resultados en memoria y no toca el disco.
+"""
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Optional, Set
+from core.result_cache import CacheKey
+from .connection_pool import ConnectionPool
+from .history_manager_db import HistoryManager, gestor_database
+
+# La precisión ``None`` (la de Calculator por defecto) se guarda como 0, ya
+# que SQLite no considera iguales dos NULL en una clave primaria.
+_DEFAULT_PRECISION = 0
+
+
+# ---------------------------------------------------------- class -> MemoStore
+class MemoStore:
+    """
+    Almacén de resultados persistente y acotado para ``ResultCache``.
+
+    Implementa la interfaz ``ResultStore``: se conecta con
+    ``Calculator.result_cache.attach_store(MemoStore())``.
+
+    :ivar db_path: Ruta de la base de datos SQLite (``None``: solo en
+        memoria).
+    :vartype db_path: Optional[Path]
+    :ivar pool: Conexiones de larga duración a la base de datos (``None``:
+        solo en memoria).
+    :vartype pool: Optional[ConnectionPool]
+    :ivar max_entries: Número máximo de resultados guardados.
+    :vartype max_entries: int
+    """
+
+    def __init__(self, db_path=None, max_entries: int = 20000) -> None:
+        """
+        Constructor de la clase MemoStore. No accede a la base de datos.
+
+        :param db_path: Ruta de la base de datos. Por defecto, la de
+            ``HistoryManager`` (``calculator_db.db``), cuyas conexiones se
+            comparten; si su backend no es SQLite, el almacén no persiste.
+        :type db_path: Optional[Path]
+        :param max_entries: Número máximo de resultados guardados.
+        :type max_entries: int
+        :raises ValueError: Si ``max_entries`` no es positivo.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries debe ser positivo")
+        # Solo se cierran en close() las conexiones abiertas por el almacén,
+        # no las compartidas con HistoryManager.
+        self._owns_pool = db_path is not None
+        if db_path is None:
+            self.pool = HistoryManager().pool
+            self.db_path = (None if self.pool is None
+                            else HistoryManager().db_path)
+        else:
+            self.db_path = db_path
+            self.pool = ConnectionPool(db_path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Decimal]" = OrderedDict()
+        self._pending: Set[CacheKey] = set()
+        self._loaded = False
+        self._loader: Optional[threading.Thread] = None
+
+    # ................................................... interfaz caché
+    def get(self, key: CacheKey) -> Optional[Decimal]:
+        """
+        Busca un resultado en memoria (sin acceder a la base de datos).
+
+        :param key: Clave canónica de la operación.
+        :type key: CacheKey
+        :returns: Resultado guardado o ``None``.
+        :rtype: Optional[Decimal]
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._pending.add(key)
+            return result
+
+    def put(self, key: CacheKey, result: Decimal) -> None:
+        """
+        Guarda un resultado (se escribe en disco con ``flush``).
+
+        :param key: Clave canónica de la operación.
+        :type key: CacheKey
+        :param result: Resultado de la operación.
+        :type result: Decimal
+        """
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            self._pending.add(key)
+            self._trim()
+
+    def _trim(self) -> None:
+        """
+        Desaloja los resultados usados hace más tiempo hasta cumplir
+        ``max_entries``. Requiere el cerrojo.
+        """
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._pending.discard(evicted)
+
+    # ...................................................... persistencia
+    def load(self) -> int:
+        """
+        Lee la tabla y añade sus resultados a los de memoria (solo la
+        primera vez). Los resultados guardados o usados antes de la carga
+        se consideran más recientes que los del disco.
+
+        :returns: Número de resultados leídos.
+        :rtype: int
+        """
+        with self._lock:
+            if self._loaded:
+                return 0
+            self._loaded = True
+        rows = None if self.pool is None else self._read_rows()
+        if not rows:
+            return 0
+        loaded: "OrderedDict[CacheKey, Decimal]" = OrderedDict(
+            ((operator, precision or None, text_1, text_2), Decimal(result))
+            for operator, precision, text_1, text_2, result in rows)
+        with self._lock:
+            for key in self._entries:
+                loaded.pop(key, None)
+            loaded.update(self._entries)
+            self._entries = loaded
+            self._trim()
+        return len(rows)
+
+    def preload(self) -> threading.Thread:
+        """
+        Ejecuta ``load`` en un hilo en segundo plano (al arrancar la
+        aplicación), para no leer la base de datos desde el hilo que
+        consulta la caché.
+
+        :returns: El hilo de la carga.
+        :rtype: threading.Thread
+        """
+        self._loader = threading.Thread(
+            target=self.load, name="MemoStore-load", daemon=True)
+        self._loader.start()
+        return self._loader
+
+    @gestor_database
+    def create_table(self, cursor=None) -> None:
+        """
+        Crea la tabla ``memo_results`` si no existe.
+
+        :param cursor: Cursor proporcionado por el decorador.
+        :type cursor: sqlite3.Cursor
+        """
+        self._create_schema(cursor)
+
+    @staticmethod
+    def _create_schema(cursor) -> None:
+        """
+        Crea la tabla y su índice con el cursor indicado.
+
+        :param cursor: Cursor de una conexión abierta.
+        :type cursor: sqlite3.Cursor
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS memo_results (
+                OPERATOR TEXT NOT NULL,
+                PRECISION INTEGER NOT NULL,
+                OPERAND_1 TEXT NOT NULL,
+                OPERAND_2 TEXT NOT NULL,
+                RESULT TEXT NOT NULL,
+                LAST_USED INTEGER NOT NULL,
+                UNIQUE (OPERATOR, PRECISION, OPERAND_1, OPERAND_2)
+            );
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS memo_results_last_used
+            ON memo_results (LAST_USED);
+        """)
+
+    @gestor_database
+    def _read_rows(self, cursor=None) -> list:
+        """
+        Lee las filas usadas más recientemente, de la más antigua a la más
+        reciente (el orden de desalojo en memoria).
+
+        :param cursor: Cursor proporcionado por el decorador.
+        :type cursor: sqlite3.Cursor
+        :rtype: list
+        """
+        self._create_schema(cursor)
+        cursor.execute("""
+            SELECT OPERATOR, PRECISION, OPERAND_1, OPERAND_2, RESULT
+            FROM memo_results
+            ORDER BY LAST_USED DESC
+            LIMIT ?
+        """, (self.max_entries,))
+        return cursor.fetchall()[::-1]
+
+    def flush(self) -> int:
+        """
+        Escribe en disco los resultados pendientes y aplica el límite.
+
+        :returns: Número de filas escritas.
+        :rtype: int
+        """
+        with self._lock:
+            if self.pool is None:
+                self._pending.clear()
+            if not self._pending:
+                return 0
+            # Marca de uso en nanosegundos, creciente en el orden de uso de
+            # la memoria para que el recorte en disco respete ese orden.
+            now = time.time_ns()
+            rows = [
+                (key[0], key[1] or _DEFAULT_PRECISION, key[2], key[3],
+                 str(result), now + index)
+                for index, (key, result) in enumerate(self._entries.items())
+                if key in self._pending
+            ]
+            self._pending.clear()
+        self._write_rows(rows)
+        return len(rows)
+
+    @gestor_database
+    def _write_rows(self, rows: list, cursor=None) -> None:
+        """
+        Inserta o actualiza filas y borra las que sobrepasan el límite.
+
+        :param rows: Filas ``(operador, precisión, operando_1, operando_2,
+            resultado, último_uso)``.
+        :type rows: list
+        :param cursor: Cursor proporcionado por el decorador.
+        :type cursor: sqlite3.Cursor
+        """
+        self._create_schema(cursor)
+        cursor.executemany("""
+            INSERT OR REPLACE INTO memo_results
+            (OPERATOR, PRECISION, OPERAND_1, OPERAND_2, RESULT, LAST_USED)
+            VALUES (?,?,?,?,?,?)
+        """, rows)
+        cursor.execute("""
+            DELETE FROM memo_results
+            WHERE rowid NOT IN (
+                SELECT rowid FROM memo_results
+                ORDER BY LAST_USED DESC
+                LIMIT ?
+            )
+        """, (self.max_entries,))
+
+    def clear(self) -> None:
+        """
+        Elimina todos los resultados guardados, en memoria y en disco.
+        """
+        with self._lock:
+            self._entries = OrderedDict()
+            self._pending.clear()
+            # Una carga posterior no debe recuperar la tabla borrada.
+            self._loaded = True
+        if self.pool is not None:
+            self._drop_table()
+
+    @gestor_database
+    def _drop_table(self, cursor=None) -> None:
+        """
+        Borra la tabla ``memo_results``.
+
+        :param cursor: Cursor proporcionado por el decorador.
+        :type cursor: sqlite3.Cursor
+        """
+        cursor.execute("DROP TABLE IF EXISTS memo_results")
+
+    def close(self) -> None:
+        """
+        Espera a la carga previa, escribe los resultados pendientes y cierra
+        las conexiones propias (las de ``HistoryManager`` las cierra
+        ``HistoryManager.close``).
+        """
+        if self._loader is not None:
+            self._loader.join()
+        self.flush()
+        if self._owns_pool:
+            self.pool.close_all()
+
+    def __len__(self) -> int:
+        """
+        Número de resultados en memoria.
+
+        :rtype: int
+        """
+        return len(self._entries)
@@ -0,0 +1,416 @@
+# MODULO: migrations.py
+"""
+Migraciones versionadas del esquema de ``history_results``.
+
+La versión del esquema se guarda en ``PRAGMA user_version`` (0 en una base de
+datos nueva). ``migrate`` aplica en orden las migraciones de ``MIGRATIONS``
+con número mayor que la versión actual y, tras cada una, actualiza
+``user_version``.
+
+- v1: tabla original (``ID``, ``EQUATION``, ``RESULT``).
+- v2: ``CREATED_AT`` (fecha de creación, UTC), ``OPERATOR``, ``OPERAND_1``,
+  ``OPERAND_2`` y ``RESULT_NUM`` (numéricos), con índices para consultas por
+  rango de fechas y por operador. Las filas existentes se completan por
+  lotes a partir de ``EQUATION`` y ``RESULT``; su ``CREATED_AT`` queda en
+  NULL (no se conoce).
+- v3: ``RESULT_COEF``/``RESULT_EXP`` y ``OPERAND_n_COEF``/``OPERAND_n_EXP``:
+  cada número como ``coeficiente * 10 ** exponente`` en dos enteros
+  (``history_db.encode_decimal``), exacto y sin análisis de texto; índice
+  por ``RESULT_NUM`` para filtros por rango.
+- v4: ``history_fts``, índice FTS5 (tokenizador ``trigram``) de
+  ``EQUATION`` con contenido externo, sincronizado con disparadores
+  ``AFTER INSERT/DELETE/UPDATE``. Requiere FTS5 en SQLite (3.34+ para
+  ``trigram``); si no está disponible, se omite.
+- v5: ``auto_vacuum=INCREMENTAL``, necesario para que la retención
+  (``retention.RetentionPolicy``) reduzca el archivo por partes. Cambiar el
+  modo en una base de datos con tablas exige un ``VACUUM`` completo, que se
+  hace una sola vez.
+- v6: ``history_stats``, resumen por día y operador (número de registros,
+  suma, mínimo y máximo de ``RESULT_NUM``) mantenido por disparadores;
+  se calcula desde cero con ``rebuild_stats``.
+
+Cada migración es idempotente: si se interrumpe (por ejemplo, a mitad del
+relleno por lotes), la siguiente ejecución la retoma.
+"""
+import sqlite3
+from typing import Callable, Dict, Tuple
+from .history_db import (
+    encode_decimal, parse_decimal, split_equation, to_real
+)
+
+BATCH_SIZE = 1000
+
+# Fecha actual en UTC con milisegundos, en el formato de SQLite.
+NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+def schema_version(connection: sqlite3.Connection) -> int:
+    """
+    Versión del esquema guardada en la base de datos.
+
+    :param connection: Conexión abierta.
+    :type connection: sqlite3.Connection
+    :rtype: int
+    """
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _columns(connection: sqlite3.Connection, table: str) -> set:
+    """
+    Nombres de las columnas de una tabla.
+
+    :rtype: set
+    """
+    return {row[1] for row in
+            connection.execute(f"PRAGMA table_info({table})")}
+
+
+def _v1_create_table(
+        connection: sqlite3.Connection,
+        batch_size: int) -> None:
+    """
+    v1: tabla original del historial.
+    """
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS history_results (
+            ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            EQUATION CHAR(50),
+            RESULT CHAR(50)
+        );
+    """)
+
+
+def _add_columns(
+        connection: sqlite3.Connection,
+        columns: Tuple[Tuple[str, str], ...],
+        indexes: Tuple[str, ...]) -> None:
+    """
+    Añade las columnas que falten e índices, en una transacción. Las
+    columnas se comprueban con el bloqueo de escritura tomado, por si otro
+    proceso está migrando a la vez.
+
+    :param columns: Pares ``(nombre, tipo)``.
+    :param indexes: Sentencias ``CREATE INDEX IF NOT EXISTS``.
+    """
+    with connection:
+        connection.execute("BEGIN IMMEDIATE")
+        existing = _columns(connection, "history_results")
+        for name, kind in columns:
+            if name not in existing:
+                connection.execute(
+                    f"ALTER TABLE history_results ADD COLUMN {name} {kind}")
+        for index in indexes:
+            connection.execute(index)
+
+
+def _backfill(
+        connection: sqlite3.Connection,
+        batch_size: int,
+        pending: str,
+        assignments: str,
+        compute: Callable[[str, str], tuple]) -> None:
+    """
+    Rellena columnas nuevas por lotes. Cada lote es una transacción corta,
+    de modo que la base de datos sigue disponible para otros hilos durante
+    la migración.
+
+    :param pending: Condición SQL de las filas por rellenar.
+    :param assignments: Lista ``SET`` del ``UPDATE``.
+    :param compute: Calcula los valores a partir de ``(EQUATION, RESULT)``.
+    """
+    last_id = 0
+    while True:
+        rows = connection.execute(f"""
+            SELECT ID, EQUATION, RESULT FROM history_results
+            WHERE ID > ? AND {pending}
+            ORDER BY ID LIMIT ?
+        """, (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        updates = [(*compute(equation, result), row_id)
+                   for row_id, equation, result in rows]
+        with connection:
+            connection.executemany(
+                f"UPDATE history_results SET {assignments} WHERE ID = ?",
+                updates)
+        last_id = rows[-1][0]
+
+
+def _v2_typed_columns(
+        connection: sqlite3.Connection,
+        batch_size: int) -> None:
+    """
+    v2: fecha de creación, columnas numéricas e índices; rellena las filas
+    existentes por lotes.
+    """
+    _add_columns(
+        connection,
+        (("CREATED_AT", "TEXT"),
+         ("OPERATOR", "TEXT"),
+         ("OPERAND_1", "REAL"),
+         ("OPERAND_2", "REAL"),
+         ("RESULT_NUM", "REAL")),
+        ("""CREATE INDEX IF NOT EXISTS history_results_created_at
+            ON history_results (CREATED_AT);""",
+         """CREATE INDEX IF NOT EXISTS history_results_operator
+            ON history_results (OPERATOR, CREATED_AT);"""))
+
+    def compute(equation: str, result: str) -> tuple:
+        operator, operand_1, operand_2 = split_equation(equation)
+        return (operator, to_real(operand_1), to_real(operand_2),
+                to_real(parse_decimal(result)))
+
+    _backfill(connection, batch_size,
+              "RESULT_NUM IS NULL AND OPERATOR IS NULL",
+              "OPERATOR = ?, OPERAND_1 = ?, OPERAND_2 = ?, RESULT_NUM = ?",
+              compute)
+
+
+def _v3_exact_encoding(
+        connection: sqlite3.Connection,
+        batch_size: int) -> None:
+    """
+    v3: codificación exacta ``(coeficiente, exponente)`` del resultado y
+    los operandos, e índice por valor del resultado; rellena las filas
+    existentes por lotes.
+    """
+    _add_columns(
+        connection,
+        (("RESULT_COEF", "INTEGER"),
+         ("RESULT_EXP", "INTEGER"),
+         ("OPERAND_1_COEF", "INTEGER"),
+         ("OPERAND_1_EXP", "INTEGER"),
+         ("OPERAND_2_COEF", "INTEGER"),
+         ("OPERAND_2_EXP", "INTEGER")),
+        ("""CREATE INDEX IF NOT EXISTS history_results_result_num
+            ON history_results (RESULT_NUM);""",))
+
+    def compute(equation: str, result: str) -> tuple:
+        _, operand_1, operand_2 = split_equation(equation)
+        return (*encode_decimal(parse_decimal(result)),
+                *encode_decimal(operand_1), *encode_decimal(operand_2))
+
+    _backfill(connection, batch_size,
+              "RESULT_COEF IS NULL AND OPERAND_1_COEF IS NULL",
+              "RESULT_COEF = ?, RESULT_EXP = ?, OPERAND_1_COEF = ?, "
+              "OPERAND_1_EXP = ?, OPERAND_2_COEF = ?, OPERAND_2_EXP = ?",
+              compute)
+
+
+def _v4_full_text_index(
+        connection: sqlite3.Connection,
+        batch_size: int) -> None:
+    """
+    v4: índice FTS5 de ``EQUATION`` (``history_fts``) mantenido por
+    disparadores. Si SQLite no incluye FTS5, no se crea y
+    ``search_history`` usa ``LIKE``.
+    """
+    try:
+        with connection:
+            connection.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+                    EQUATION,
+                    content='history_results',
+                    content_rowid='ID',
+                    tokenize='trigram'
+                );
+            """)
+    except sqlite3.OperationalError:
+        return
+    with connection:
+        connection.executescript("""
+            CREATE TRIGGER IF NOT EXISTS history_fts_insert
+            AFTER INSERT ON history_results BEGIN
+                INSERT INTO history_fts (rowid, EQUATION)
+                VALUES (new.ID, new.EQUATION);
+            END;
+            CREATE TRIGGER IF NOT EXISTS history_fts_delete
+            AFTER DELETE ON history_results BEGIN
+                INSERT INTO history_fts (history_fts, rowid, EQUATION)
+                VALUES ('delete', old.ID, old.EQUATION);
+            END;
+            CREATE TRIGGER IF NOT EXISTS history_fts_update
+            AFTER UPDATE OF EQUATION ON history_results BEGIN
+                INSERT INTO history_fts (history_fts, rowid, EQUATION)
+                VALUES ('delete', old.ID, old.EQUATION);
+                INSERT INTO history_fts (rowid, EQUATION)
+                VALUES (new.ID, new.EQUATION);
+            END;
+        """)
+        # Indexa las filas existentes; 'rebuild' es idempotente.
+        connection.execute(
+            "INSERT INTO history_fts (history_fts) VALUES ('rebuild')")
+
+
+def has_full_text_index(connection: sqlite3.Connection) -> bool:
+    """
+    Indica si la base de datos tiene el índice ``history_fts``.
+
+    :param connection: Conexión abierta.
+    :type connection: sqlite3.Connection
+    :rtype: bool
+    """
+    return connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'history_fts'"
+    ).fetchone() is not None
+
+
+def _v5_incremental_vacuum(
+        connection: sqlite3.Connection,
+        batch_size: int) -> None:
+    """
+    v5: ``auto_vacuum=INCREMENTAL``. Las bases de datos nuevas ya se crean
+    así (``connection_pool.PRAGMAS``); las existentes se reconstruyen con
+    ``VACUUM``.
+    """
+    if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.execute("VACUUM")
+
+
+# Clave de history_stats de una fila: el día de CREATED_AT y el operador
+# ('' si no se conocen; una clave primaria no puede tener NULL repetidos).
+_STATS_KEY = ("COALESCE(substr({row}.CREATED_AT, 1, 10), '')",
+              "COALESCE({row}.OPERATOR, '')")
+
+_STATS_ADD = """
+    INSERT INTO history_stats (DAY, OPERATOR, COUNT, RESULT_COUNT,
+                               RESULT_SUM, RESULT_MIN, RESULT_MAX, STALE)
+    VALUES ({day}, {operator}, 1, {row}.RESULT_NUM IS NOT NULL,
+            COALESCE({row}.RESULT_NUM, 0), {row}.RESULT_NUM,
+            {row}.RESULT_NUM, 0)
+    ON CONFLICT (DAY, OPERATOR) DO UPDATE SET
+        COUNT = COUNT + 1,
+        RESULT_COUNT = RESULT_COUNT + excluded.RESULT_COUNT,
+        RESULT_SUM = RESULT_SUM + excluded.RESULT_SUM,
+        RESULT_MIN = COALESCE(min(RESULT_MIN, excluded.RESULT_MIN),
+                              RESULT_MIN, excluded.RESULT_MIN),
+        RESULT_MAX = COALESCE(max(RESULT_MAX, excluded.RESULT_MAX),
+                              RESULT_MAX, excluded.RESULT_MAX);
+"""
+
+# Quitar el mínimo o el máximo de un grupo no permite saber el siguiente sin
+# leer el grupo: se marca STALE y HistoryManager.stats lo recalcula al leer.
+_STATS_REMOVE = """
+    UPDATE history_stats SET
+        COUNT = COUNT - 1,
+        RESULT_COUNT = RESULT_COUNT - ({row}.RESULT_NUM IS NOT NULL),
+        RESULT_SUM = RESULT_SUM - COALESCE({row}.RESULT_NUM, 0),
+        STALE = STALE OR COALESCE(
+            {row}.RESULT_NUM IN (RESULT_MIN, RESULT_MAX), 0)
+    WHERE DAY = {day} AND OPERATOR = {operator};
+    DELETE FROM history_stats
+    WHERE DAY = {day} AND OPERATOR = {operator} AND COUNT <= 0;
+"""
+
+
+def _stats_sql(template: str, row: str) -> str:
+    """
+    Sentencia de ``_STATS_ADD``/``_STATS_REMOVE`` para la fila ``new`` u
+    ``old`` de un disparador.
+    """
+    day, operator = (part.format(row=row) for part in _STATS_KEY)
+    return template.format(day=day, operator=operator, row=row)
+
+
+def rebuild_stats(connection: sqlite3.Connection) -> None:
+    """
+    Calcula ``history_stats`` desde cero a partir de ``history_results``,
+    en una transacción.
+
+    :param connection: Conexión abierta.
+    :type connection: sqlite3.Connection
+    """
+    day, operator = (part.format(row="history_results")
+                     for part in _STATS_KEY)
+    with connection:
+        connection.execute("DELETE FROM history_stats")
+        connection.execute(f"""
+            INSERT INTO history_stats (DAY, OPERATOR, COUNT, RESULT_COUNT,
+                                       RESULT_SUM, RESULT_MIN, RESULT_MAX,
+                                       STALE)
+            SELECT {day}, {operator}, COUNT(*), COUNT(RESULT_NUM),
+                   TOTAL(RESULT_NUM), MIN(RESULT_NUM), MAX(RESULT_NUM), 0
+            FROM history_results
+            GROUP BY 1, 2
+        """)
+
+
+def _v6_daily_stats(
+        connection: sqlite3.Connection,
+        batch_size: int) -> None:
+    """
+    v6: resumen ``history_stats`` por día y operador, mantenido por
+    disparadores, y su cálculo inicial.
+    """
+    with connection:
+        connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS history_stats (
+                DAY TEXT NOT NULL,
+                OPERATOR TEXT NOT NULL,
+                COUNT INTEGER NOT NULL,
+                RESULT_COUNT INTEGER NOT NULL,
+                RESULT_SUM REAL NOT NULL,
+                RESULT_MIN REAL,
+                RESULT_MAX REAL,
+                STALE INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (DAY, OPERATOR)
+            ) WITHOUT ROWID;
+            CREATE TRIGGER IF NOT EXISTS history_stats_insert
+            AFTER INSERT ON history_results BEGIN
+                {_stats_sql(_STATS_ADD, "new")}
+            END;
+            CREATE TRIGGER IF NOT EXISTS history_stats_delete
+            AFTER DELETE ON history_results BEGIN
+                {_stats_sql(_STATS_REMOVE, "old")}
+            END;
+            CREATE TRIGGER IF NOT EXISTS history_stats_update
+            AFTER UPDATE OF CREATED_AT, OPERATOR, RESULT_NUM
+            ON history_results BEGIN
+                {_stats_sql(_STATS_REMOVE, "old")}
+                {_stats_sql(_STATS_ADD, "new")}
+            END;
+        """)
+    rebuild_stats(connection)
+
+
+MIGRATIONS: Dict[int, Callable[[sqlite3.Connection, int], None]] = {
+    1: _v1_create_table,
+    2: _v2_typed_columns,
+    3: _v3_exact_encoding,
+    4: _v4_full_text_index,
+    5: _v5_incremental_vacuum,
+    6: _v6_daily_stats,
+}
+
+LATEST_VERSION = max(MIGRATIONS)
+
+
+def migrate(
+        connection: sqlite3.Connection,
+        target: int = LATEST_VERSION,
+        batch_size: int = BATCH_SIZE) -> int:
+    """
+    Lleva el esquema hasta la versión ``target``.
+
+    :param connection: Conexión abierta.
+    :type connection: sqlite3.Connection
+    :param target: Versión final.
+    :type target: int
+    :param batch_size: Filas por transacción al rellenar columnas nuevas.
+    :type batch_size: int
+    :returns: La versión resultante.
+    :rtype: int
+    :raises ValueError: Si la base de datos tiene una versión más nueva
+        que ``LATEST_VERSION``.
+    """
+    version = schema_version(connection)
+    if version > LATEST_VERSION:
+        raise ValueError(
+            f"Versión de esquema desconocida: {version} "
+            f"(la más reciente es {LATEST_VERSION})")
+    for number in range(version + 1, target + 1):
+        MIGRATIONS[number](connection, batch_size)
+        with connection:
+            connection.execute(f"PRAGMA user_version = {number}")
+    return max(version, target)
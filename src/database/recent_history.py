@@ -0,0 +1,233 @@
+# MODULO: recent_history.py
+"""
+Búfer circular en memoria con los registros más recientes del historial.
+
+``HistoryManager.get_last_records`` se responde desde este búfer: se llena
+con la primera lectura y se actualiza con cada escritura del proceso, de
+modo que mostrar "los últimos 5" no vuelve a leer lo que el propio proceso
+acaba de escribir.
+
+Coherencia con otros procesos: ``PRAGMA data_version`` cambia cuando otra
+conexión confirma cambios en la base de datos. ``RecentHistory`` lo consulta
+en una conexión propia (``probe``):
+
+- al leer, si ha cambiado desde la última vez, recarga el búfer;
+- al escribir, lo consulta antes y después de la escritura (con el cerrojo
+  tomado, así que las escrituras del proceso no se solapan). Si había
+  cambiado antes, otra conexión escribió entretanto y el búfer se descarta.
+  Si no, el valor nuevo puede incluir también lo que otra conexión
+  confirme durante la escritura propia: se comprueba que los ID posteriores
+  al último del búfer son exactamente los insertados (o que la tabla está
+  vacía tras un borrado) antes de aplicar la escritura al búfer.
+
+Con los backends sin base de datos compartida (``history_backends.py``) no
+hay otros escritores: ``db_path`` es ``None`` y no se consulta nada.
+"""
+import sqlite3
+import threading
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Deque, List, Optional, Union
+from .connection_pool import connect
+from .history_db import HistoryEntry
+
+Record = HistoryEntry
+
+
+# ------------------------------------------------------ class -> RecentHistory
+class RecentHistory:
+    """
+    Últimos ``maxlen`` registros del historial (del más antiguo al más
+    reciente), seguro entre hilos.
+
+    :ivar db_path: Ruta de la base de datos (``None``: solo escribe este
+        proceso).
+    :vartype db_path: Optional[Union[str, Path]]
+    :ivar maxlen: Registros que se guardan en memoria.
+    :vartype maxlen: int
+    """
+
+    def __init__(
+            self,
+            db_path: Optional[Union[str, Path]],
+            maxlen: int = 50) -> None:
+        """
+        Constructor de la clase RecentHistory. El búfer empieza vacío y sin
+        cargar.
+
+        :param db_path: Ruta de la base de datos (``None``: solo escribe
+            este proceso).
+        :type db_path: Optional[Union[str, Path]]
+        :param maxlen: Registros que se guardan en memoria.
+        :type maxlen: int
+        """
+        self.db_path = db_path
+        self.maxlen = maxlen
+        self._records: Optional[Deque[Record]] = None
+        # True si el búfer contiene la tabla completa.
+        self._complete = False
+        self._version: Optional[int] = None
+        self._probe: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _data_version(self) -> int:
+        """
+        ``PRAGMA data_version`` en la conexión propia (siempre 0 sin base
+        de datos).
+
+        :rtype: int
+        """
+        if self.db_path is None:
+            return 0
+        if self._probe is None:
+            self._probe = connect(str(self.db_path))
+        return self._probe.execute("PRAGMA data_version").fetchone()[0]
+
+    def _only_change(self, after_id: int, ids: List[int]) -> bool:
+        """
+        Comprueba que los ID posteriores a ``after_id`` son exactamente
+        ``ids``, es decir, que ninguna otra conexión ha insertado registros
+        que el búfer no tenga (siempre cierto sin base de datos).
+
+        :param after_id: Último ID del búfer (0 si está vacío).
+        :type after_id: int
+        :param ids: ID insertados por la escritura propia.
+        :type ids: List[int]
+        :rtype: bool
+        """
+        if self.db_path is None:
+            return True
+        try:
+            rows = self._probe.execute(
+                "SELECT ID FROM history_results WHERE ID > ? "
+                "ORDER BY ID LIMIT ?", (after_id, len(ids) + 1)).fetchall()
+        except sqlite3.Error:
+            return False
+        return [row[0] for row in rows] == ids
+
+    def read(
+            self,
+            limit: int,
+            load: Callable[[int], Optional[List[Record]]]
+    ) -> Optional[List[Record]]:
+        """
+        Devuelve los últimos ``limit`` registros, del más reciente al más
+        antiguo. Solo llama a ``load`` si el búfer no está cargado, si otra
+        conexión cambió la base de datos, o si se piden más registros de
+        los que guarda.
+
+        :param limit: Número de registros (negativo: todos, como
+            ``LIMIT -1`` en SQLite).
+        :type limit: int
+        :param load: Lee de la base de datos los últimos ``n`` registros,
+            del más reciente al más antiguo (None si falla).
+        :type load: Callable[[int], Optional[List[Record]]]
+        :rtype: Optional[List[Record]]
+        """
+        with self._lock:
+            version = self._data_version()
+            if self._records is None or version != self._version:
+                records = load(self.maxlen)
+                if records is None:
+                    self._records = None
+                    return None
+                self._records = deque(reversed(records), maxlen=self.maxlen)
+                self._complete = len(records) < self.maxlen
+                self._version = version
+            if (limit < 0 or limit > self.maxlen) and not self._complete:
+                return load(limit)
+            # Los registros son inmutables: se devuelven sin copiarlos.
+            return list(islice(reversed(self._records),
+                               limit if limit >= 0 else None))
+
+    def append(
+            self,
+            func: Callable[[], Optional[int]],
+            records: List[Record]) -> Optional[int]:
+        """
+        Ejecuta una inserción propia y añade sus registros al búfer.
+
+        :param func: Inserción en la base de datos (devuelve None si falla).
+        :type func: Callable[[], Optional[int]]
+        :param records: Registros insertados, del más antiguo al más
+            reciente.
+        :type records: List[Record]
+        :returns: El resultado de ``func``.
+        :rtype: Optional[int]
+        """
+        def apply(buffer: Deque[Record]) -> bool:
+            if not self._only_change(buffer[-1].id if buffer else 0,
+                                     [record.id for record in records]):
+                return False
+            buffer.extend(records)
+            if len(buffer) == self.maxlen:
+                self._complete = False
+            return True
+
+        return self._write(func, apply)
+
+    def clear(self, func: Callable[[], Optional[int]]) -> Optional[int]:
+        """
+        Ejecuta un borrado propio de todo el historial y vacía el búfer.
+
+        :param func: Borrado en la base de datos (devuelve None si falla).
+        :type func: Callable[[], Optional[int]]
+        :returns: El resultado de ``func``.
+        :rtype: Optional[int]
+        """
+        def apply(buffer: Deque[Record]) -> bool:
+            if not self._only_change(0, []):
+                return False
+            buffer.clear()
+            self._complete = True
+            return True
+
+        return self._write(func, apply)
+
+    def _write(
+            self,
+            func: Callable[[], Optional[int]],
+            apply: Callable[[Deque[Record]], bool]) -> Optional[int]:
+        """
+        Ejecuta una escritura propia y, si nadie más ha escrito, la aplica
+        al búfer; si no, lo descarta. ``apply`` devuelve False si detecta
+        cambios de otra conexión confirmados durante la escritura.
+        """
+        with self._lock:
+            before = self._data_version()
+            result = func()
+            after = self._data_version()
+            if result is None or before != self._version:
+                self._records = None
+            elif self._records is not None:
+                if apply(self._records):
+                    self._version = after
+                else:
+                    self._records = None
+            return result
+
+    def invalidate(self) -> None:
+        """
+        Descarta el búfer; la próxima lectura lo recarga.
+        """
+        with self._lock:
+            self._records = None
+
+    def close(self) -> None:
+        """
+        Cierra la conexión propia y descarta el búfer.
+        """
+        with self._lock:
+            self._records = None
+            if self._probe is not None:
+                self._probe.close()
+                self._probe = None
+
+    def __len__(self) -> int:
+        """
+        Registros en memoria.
+
+        :rtype: int
+        """
+        return 0 if self._records is None else len(self._records)
@@ -0,0 +1,42 @@
+# MODULO: retention.py
+"""
+Políticas de retención del historial.
+
+Una ``RetentionPolicy`` limita ``history_results`` por número de registros,
+antigüedad o tamaño de la base de datos. ``HistoryManager.prune`` la aplica
+por lotes: cada lote borra como mucho ``batch_size`` de los registros más
+antiguos en una transacción corta y después devuelve al sistema hasta
+``vacuum_pages`` páginas libres con ``PRAGMA incremental_vacuum`` (la base
+de datos usa ``auto_vacuum=INCREMENTAL``). Así el archivo se mantiene acotado
+sin bloqueos largos.
+
+``HistoryWriter`` llama a ``HistoryManager.housekeeping`` (un lote) cuando
+lleva ``idle_delay`` segundos sin escrituras pendientes.
+"""
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+# ---------------------------------------------------- class -> RetentionPolicy
+class RetentionPolicy(BaseModel):
+    """
+    Límites del historial. Los límites a ``None`` no se aplican.
+
+    :ivar max_rows: Registros que se conservan (los más recientes).
+    :ivar max_age_days: Antigüedad máxima en días, según ``CREATED_AT``
+        (los registros migrados sin fecha no caducan).
+    :ivar max_bytes: Tamaño máximo ocupado por la base de datos (páginas en
+        uso, sin contar el WAL).
+    :ivar batch_size: Registros borrados por transacción.
+    :ivar vacuum_pages: Páginas libres devueltas al sistema por lote.
+    """
+    max_rows: Optional[int] = Field(
+        default=None, gt=0, description="registros que se conservan")
+    max_age_days: Optional[float] = Field(
+        default=None, gt=0, description="antigüedad máxima en días")
+    max_bytes: Optional[int] = Field(
+        default=None, gt=0, description="tamaño máximo de la base de datos")
+    batch_size: int = Field(
+        default=500, gt=0, description="registros borrados por transacción")
+    vacuum_pages: int = Field(
+        default=100, gt=0, description="páginas liberadas por lote")
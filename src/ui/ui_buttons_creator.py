@@ -9,16 +9,17 @@ from typing import Dict
 from pydantic import BaseModel, Field
 from PyQt5.QtWidgets import QPushButton, QGridLayout
 from core.calculator import Calculator
-from database.history_manager_db import HistoryManager
 
 try:
     from ui_styles import (
         general_buttons_style, c_buttons_style, equal_buttons_style
     )
+    from ui_history_worker import HistoryWorker
 except ModuleNotFoundError:
     from .ui_styles import (
         general_buttons_style, c_buttons_style, equal_buttons_style
     )
+    from .ui_history_worker import HistoryWorker
 
 
 # .. .................................................. class -> ButtonData ..󰌠
@@ -69,8 +70,8 @@ class ButtonsCreator:
     :ivar display_result: Label para mostrar el resultado.
     :ivar state: Estado actual de la calculadora.
     :ivar buttons: Diccionario de botones creados.
-    :ivar history_manager: Instancia de HistoryManager para gestión de
-        registros en base de datos.
+    :ivar history_worker: Ejecuta las operaciones de HistoryManager en un
+        hilo de trabajo, sin bloquear la interfaz.
     """
 
     def __init__(
@@ -97,7 +98,7 @@ class ButtonsCreator:
         self.display_result = display_result
         self.state = CalculatorState()
         self.buttons: Dict[str, QPushButton] = {}
-        self.history_manager = HistoryManager()
+        self.history_worker = HistoryWorker()
         self.current_theme = "dark"
 
     def create_buttons(self) -> QGridLayout:
@@ -235,8 +236,9 @@ class ButtonsCreator:
         """
         Convierte los valores a tipo Decimal, realiza el cálculo
         correspondiente al operador y muestra el resultado.
-        Crea un nuevo registro en la base de datos con la ecuación y el
-        resultado usando la clase HistoryManager (Singleton).
+        Guarda un nuevo registro del historial con la ecuación y el
+        resultado a través de HistoryWorker, en un hilo de trabajo: la
+        interfaz no espera a la base de datos.
 
         :param value: No se utiliza, se mantiene por compatibilidad con la
             señal.
@@ -265,9 +267,8 @@ class ButtonsCreator:
                     self.state.result = self.state.result.quantize(
                         Decimal("0.00"))
                     self.display_result.setText(str(self.state.result))
-                    equation: str = f"{num1} {
-                        str(self.state.current_operator)} {num2}"
-                    self.history_manager.new_history(
+                    equation: str = f"{num1} {op} {num2}"
+                    self.history_worker.save(
                         equation, Decimal(self.state.result)
                     )
 
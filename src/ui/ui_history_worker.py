@@ -0,0 +1,145 @@
+# MODULO: ui_history_worker.py
+"""
+Acceso al historial fuera del hilo de la interfaz.
+
+Las llamadas a ``HistoryManager`` (validación, escritura y lectura de SQLite)
+pueden tardar si el disco es lento. ``HistoryWorker`` las ejecuta en un
+``QThreadPool`` propio y devuelve los resultados con señales de Qt, que se
+entregan en el hilo del receptor (el de la interfaz). Así ``ButtonsCreator``
+nunca espera a la base de datos.
+
+El pool usa un único hilo: las tareas se ejecutan en el orden en que se
+encolan, de modo que una lectura ve las escrituras pedidas antes.
+"""
+from decimal import Decimal
+from typing import Any, Callable
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from database.history_manager_db import HistoryManager
+
+
+# ----------------------------------------------------- class -> HistorySignals
+class HistorySignals(QObject):
+    """
+    Señales de ``HistoryWorker``.
+
+    :ivar saved: Se emite al encolar un registro (ecuación).
+    :ivar records_loaded: Se emite con los registros leídos.
+    :ivar failed: Se emite con el mensaje de error de una tarea.
+    """
+    saved = pyqtSignal(str)
+    records_loaded = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+
+# -------------------------------------------------------- class -> HistoryTask
+class HistoryTask(QRunnable):
+    """
+    Tarea del pool: ejecuta una función y emite su resultado.
+    """
+
+    def __init__(
+            self,
+            func: Callable[[], Any],
+            on_result: Callable[[Any], None],
+            on_error: Callable[[str], None]) -> None:
+        """
+        Constructor de la clase HistoryTask.
+
+        :param func: Función a ejecutar en el hilo del pool.
+        :type func: Callable[[], Any]
+        :param on_result: Recibe el resultado (normalmente ``signal.emit``).
+        :type on_result: Callable[[Any], None]
+        :param on_error: Recibe el mensaje si ``func`` lanza una excepción.
+        :type on_error: Callable[[str], None]
+        """
+        super().__init__()
+        self.func = func
+        self.on_result = on_result
+        self.on_error = on_error
+
+    def run(self) -> None:
+        """
+        Ejecuta la tarea en el hilo del pool.
+        """
+        try:
+            result = self.func()
+        except Exception as e:
+            self.on_error(str(e))
+        else:
+            self.on_result(result)
+
+
+# ------------------------------------------------------ class -> HistoryWorker
+class HistoryWorker:
+    """
+    Ejecuta las operaciones del historial en un hilo de trabajo.
+
+    :ivar history_manager: Gestor del historial (Singleton).
+    :vartype history_manager: HistoryManager
+    :ivar signals: Señales con los resultados.
+    :vartype signals: HistorySignals
+    :ivar pool: Pool de un hilo donde se ejecutan las tareas.
+    :vartype pool: QThreadPool
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor de la clase HistoryWorker.
+        """
+        self.history_manager = HistoryManager()
+        self.signals = HistorySignals()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+
+    def _submit(
+            self,
+            func: Callable[[], Any],
+            on_result: Callable[[Any], None]) -> None:
+        """
+        Encola una tarea en el pool.
+        """
+        self.pool.start(HistoryTask(func, on_result, self.signals.failed.emit))
+
+    def save(self, equation: str, result: Decimal) -> None:
+        """
+        Guarda un registro del historial sin bloquear. Emite ``saved`` o
+        ``failed``.
+
+        :param equation: La ecuación a guardar.
+        :type equation: str
+        :param result: El resultado de la ecuación.
+        :type result: Decimal
+        """
+        def task() -> str:
+            self.history_manager.queue_history(equation, result)
+            return equation
+
+        self._submit(task, self.signals.saved.emit)
+
+    def load_last_records(self, limit: int = 5) -> None:
+        """
+        Lee los últimos registros sin bloquear. Emite ``records_loaded`` o
+        ``failed``.
+
+        :param limit: El número de registros a obtener.
+        :type limit: int
+        """
+        def task() -> list:
+            records = self.history_manager.get_last_records(limit)
+            if records is None:
+                raise RuntimeError("No se pudo leer el historial")
+            return records
+
+        self._submit(task, self.signals.records_loaded.emit)
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """
+        Espera a que terminen las tareas pendientes (por ejemplo, al cerrar
+        la aplicación).
+
+        :param msecs: Milisegundos máximos de espera (``-1``: sin límite).
+        :type msecs: int
+        :returns: False si se agotó el tiempo.
+        :rtype: bool
+        """
+        return self.pool.waitForDone(msecs)
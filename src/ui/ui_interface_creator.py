@@ -40,6 +40,7 @@ class InterfaceCreator:
     :ivar display_value_2: Pantalla para el segundo valor
     :ivar display_operator: Pantalla para el operador
     :ivar display_result: Pantalla para el resultado
+    :ivar buttons_creator: Botones y su HistoryWorker
     """
 
     def __init__(self) -> None:
@@ -89,14 +90,14 @@ class InterfaceCreator:
 
         # Crear y obtener los botones usando ButtonsCreator
         # NOTE: uso de los valores desempaquetados de la tupla.
-        buttons_creator = ButtonsCreator(
+        self.buttons_creator = ButtonsCreator(
             central_widget,
             self.display_value_1,
             self.display_value_2,
             self.display_operator,
             self.display_result,
         )
-        buttons_layout = buttons_creator.create_buttons()
+        buttons_layout = self.buttons_creator.create_buttons()
         main_layout.addLayout(buttons_layout)
 
         self.main_window.setCentralWidget(central_widget)
@@ -110,9 +111,11 @@ class InterfaceCreator:
         1. Muestra la ventana principal
         2. Inicia el bucle de eventos de Qt
         3. Espera a que el usuario cierre la aplicación
+        4. Espera a que terminen las tareas pendientes del historial
         """
         self.main_window.show()
         self.app.exec_()
+        self.buttons_creator.history_worker.wait_for_done()
 
 
 # NOTE: agregar las notas del desempaquetado y su funcionamiento.
@@ -0,0 +1,51 @@
+# MODULO: conftest.py
+"""
+Fixtures compartidas de las pruebas del historial: instancias nuevas de
+``HistoryManager`` (Singleton) sobre bases de datos temporales.
+"""
+import pytest
+from database.history_manager_db import HistoryManager
+
+
+@pytest.fixture
+def open_manager(mocker, tmp_path):
+    """
+    Devuelve una función ``open_manager(storage=None, db_path=None)`` que
+    descarta la instancia anterior y crea un ``HistoryManager`` con el
+    backend ``storage`` (``None``: el configurado) sobre ``db_path`` (por
+    defecto, ``tmp_path / "history.db"``), con la tabla creada. Al terminar
+    cierra la última instancia.
+    """
+    mocker.patch.object(HistoryManager, '_db_path', tmp_path / "history.db")
+
+    def open_manager(storage=None, db_path=None) -> HistoryManager:
+        HistoryManager._instance = None
+        mocker.patch.object(HistoryManager, "storage", storage)
+        if db_path is not None:
+            mocker.patch.object(HistoryManager, '_db_path', db_path)
+        manager = HistoryManager()
+        manager.create_table()
+        return manager
+
+    yield open_manager
+    if HistoryManager._instance is not None:
+        HistoryManager._instance.close()
+    HistoryManager._instance = None
+
+
+@pytest.fixture
+def manager(open_manager):
+    """
+    HistoryManager sobre un archivo temporal: otras conexiones, hilos y
+    procesos ven la misma base de datos.
+    """
+    return open_manager()
+
+
+@pytest.fixture
+def memory_manager(open_manager):
+    """
+    HistoryManager sobre una base de datos ``:memory:`` (compartida por los
+    hilos del pool, sin archivo de desbordamiento).
+    """
+    return open_manager(db_path=":memory:")
@@ -0,0 +1,135 @@
+# MODULO: test_async_history_manager.py
+"""
+Pruebas unitarias para la fachada asyncio -> async_history_manager.py.
+"""
+import asyncio
+from decimal import Decimal
+import threading
+import time
+import pytest
+from database.async_history_manager import AsyncHistoryManager
+from database.history_db import HistoryEntry
+from database.history_manager_db import HistoryManager
+
+
+class TestAsyncHistoryManager:
+    """
+    Pruebas unitarias para AsyncHistoryManager: concurrencia, contrapresión
+    y lectura por páginas sin bloquear el bucle de eventos.
+    """
+
+    @pytest.fixture
+    def history(self, manager):
+        """
+        AsyncHistoryManager sobre un archivo temporal (el ejecutor trabaja
+        en otro hilo).
+        """
+        AsyncHistoryManager._instance = None
+        history = AsyncHistoryManager()
+        asyncio.run(history.create_table())
+        yield history
+        history.executor.shutdown()
+        AsyncHistoryManager._instance = None
+
+    def test_singleton(self, history):
+        """
+        Verifica el Singleton y que comparte el HistoryManager síncrono.
+        """
+        assert AsyncHistoryManager() is history
+        assert history.manager is HistoryManager()
+
+    def test_concurrent_add_and_stream(self, history):
+        """
+        Verifica que miles de corrutinas concurrentes registran su
+        resultado y que stream los recorre todos, del más reciente al más
+        antiguo.
+        """
+        async def scenario():
+            await asyncio.gather(*(
+                history.add(f"{index} + 0", Decimal(index))
+                for index in range(2000)))
+            return [record async for record in history.stream(page_size=300)]
+
+        records = asyncio.run(scenario())
+        assert len(records) == 2000
+        ids = [record.id for record in records]
+        assert ids == sorted(ids, reverse=True)
+        assert len(history.manager.get_last_records(10000)) == 2000
+
+    def test_backpressure(self, history, mocker):
+        """
+        Verifica que nunca hay más de max_pending operaciones en el
+        ejecutor.
+        """
+        mocker.patch.object(AsyncHistoryManager, "max_pending", 4)
+        lock = threading.Lock()
+        in_flight = []
+        current = [0]
+        submit = history.executor.submit
+
+        def counting_submit(*args, **kwargs):
+            with lock:
+                current[0] += 1
+                in_flight.append(current[0])
+            future = submit(*args, **kwargs)
+
+            def done(_):
+                with lock:
+                    current[0] -= 1
+            future.add_done_callback(done)
+            return future
+
+        mocker.patch.object(history.executor, "submit",
+                            side_effect=counting_submit)
+
+        async def scenario():
+            await asyncio.gather(*(
+                history.add("1 + 1", Decimal(2)) for _ in range(100)))
+
+        asyncio.run(scenario())
+        assert max(in_flight) <= 4
+        assert len(history.manager.get_last_records(1000)) == 100
+
+    def test_event_loop_not_blocked(self, history, mocker):
+        """
+        Verifica que una base de datos lenta no bloquea el bucle de
+        eventos.
+        """
+        get_last_records = history.manager.get_last_records
+
+        def slow_read(*args):
+            time.sleep(0.3)
+            return get_last_records(*args)
+
+        mocker.patch.object(history.manager, "get_last_records",
+                            side_effect=slow_read)
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await history.add("2 * 3", Decimal(6))
+            records = await history.last_records()
+            task.cancel()
+            return records, ticks
+
+        records, ticks = asyncio.run(scenario())
+        assert records == [HistoryEntry(1, "2 * 3", "6")]
+        assert ticks >= 10
+
+    def test_delete(self, history):
+        """
+        Verifica que delete vacía el historial, incluidos los pendientes.
+        """
+        async def scenario():
+            await history.add("1 + 2", Decimal(3))
+            await history.delete()
+            return await history.last_records()
+
+        assert asyncio.run(scenario()) == []
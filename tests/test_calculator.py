@@ -8,9 +8,11 @@ Este archivo realiza pruebas a los métodos de la clase Calculator ubicada en
 
 Número total de pruebas: 36/41
 """
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
+import random
 import pytest
-from core.calculator import Calculator
+from core.calculator import _OPERATIONS, Calculator, _integer_fast_path
+from core.precision import get_context
 
 
 # ------------------------------------------------- Tests para Calculator.add()
@@ -363,3 +365,193 @@ class TestCalculatorDivide():
                 match="No se puede dividir por cero"
         ):
             self.calculator_instance.divide(Decimal('-6.5'), Decimal('0'))
+
+
+# ----------------------------------------- Tests para la API por lotes (apply)
+class TestCalculatorBatch():
+    """
+    Pruebas unitarias para ``Calculator.apply()`` y los métodos ``*_many``.
+
+    Comprueba que los lotes producen los mismos resultados que las
+    operaciones individuales y que los errores se informan por posición.
+    """
+
+    calculator_instance: Calculator = Calculator()
+
+    def test_add_many_matches_add(self):
+        """
+        Verifica que add_many coincide con add elemento a elemento.
+        """
+        values_1 = [Decimal('2'), Decimal('2.5'), Decimal('-3')]
+        values_2 = [Decimal('3'), Decimal('3.5'), Decimal('0')]
+        batch = self.calculator_instance.add_many(values_1, values_2)
+
+        assert batch.errors == {}
+        assert batch.results == [
+            self.calculator_instance.add(v1, v2)
+            for v1, v2 in zip(values_1, values_2)
+        ]
+
+    def test_apply_accepts_mixed_iterables(self):
+        """
+        Verifica que se aceptan generadores, enteros, floats y cadenas.
+        """
+        batch = self.calculator_instance.apply(
+            "*", (v for v in [2, 0.5, "1.5"]), [Decimal('3'), 4, "2"]
+        )
+        assert batch.results == [Decimal('6'), Decimal('2'), Decimal('3')]
+
+    def test_divide_many_reports_zero_division(self):
+        """
+        Verifica que una división por cero no detiene el lote.
+        """
+        batch = self.calculator_instance.divide_many(
+            [Decimal('6'), Decimal('1'), Decimal('6.5')],
+            [Decimal('2'), Decimal('0'), Decimal('2.5')]
+        )
+        assert batch.results == [Decimal('3'), None, Decimal('2.6')]
+        assert batch.errors == {1: "No se puede dividir por cero"}
+
+    def test_apply_length_mismatch(self):
+        """
+        Verifica que secuencias de distinta longitud lanzan ValueError.
+        """
+        with pytest.raises(ValueError):
+            self.calculator_instance.subtract_many([1, 2], [1])
+
+    def test_apply_invalid_operator(self):
+        """
+        Verifica que un operador desconocido lanza ValueError.
+        """
+        with pytest.raises(ValueError, match="Operador no soportado"):
+            self.calculator_instance.apply("^", [1], [1])
+
+
+# --------------------------------------- Tests para la precisión por llamada
+class TestCalculatorPrecision():
+    """
+    Pruebas unitarias para la precisión por llamada y la caché de contextos.
+    """
+
+    calculator_instance: Calculator = Calculator()
+
+    def test_default_precision(self):
+        """
+        Verifica que por defecto se usan 28 dígitos.
+        """
+        result = self.calculator_instance.divide(Decimal('1'), Decimal('3'))
+        assert len(result.as_tuple().digits) == 28
+
+    def test_per_call_precision(self):
+        """
+        Verifica que una llamada puede pedir 50 dígitos sin cambiar la clase.
+        """
+        result = self.calculator_instance.divide(
+            Decimal('1'), Decimal('3'), precision=50
+        )
+        assert len(result.as_tuple().digits) == 50
+        assert Calculator._PRECISION == 28
+
+    def test_batch_precision(self):
+        """
+        Verifica la precisión por lote en Calculator.apply().
+        """
+        batch = self.calculator_instance.apply(
+            "/", [Decimal('2')], [Decimal('3')], precision=10
+        )
+        assert batch.results == [Decimal('0.6666666667')]
+
+    def test_invalid_precision(self):
+        """
+        Verifica que una precisión explícita 0 se rechaza en lugar de usar
+        la de por defecto.
+        """
+        with pytest.raises(ValueError):
+            self.calculator_instance.divide(
+                Decimal('1'), Decimal('3'), precision=0)
+        with pytest.raises(ValueError):
+            self.calculator_instance.add(
+                Decimal('1.5'), Decimal('3'), precision=0)
+
+    def test_default_precision_shares_cache_entry(self):
+        """
+        Verifica que ``precision=None`` y ``precision=28`` usan la misma
+        entrada de la caché.
+        """
+        Calculator.result_cache.clear()
+        Calculator.result_cache.reset_stats()
+        first = self.calculator_instance.divide(Decimal('1'), Decimal('3'))
+        second = self.calculator_instance.divide(
+            Decimal('1'), Decimal('3'), precision=28)
+        assert first == second
+        assert len(Calculator.result_cache) == 1
+        assert Calculator.result_cache.stats().hits == 1
+
+    def test_contexts_are_reused(self):
+        """
+        Verifica que el contexto de cada precisión se construye una vez.
+        """
+        assert get_context(40) is get_context(40)
+        assert get_context(40) is not get_context(40, ROUND_HALF_UP)
+
+
+# ----------------------------------- Tests para el atajo de operandos enteros
+class TestCalculatorIntegerFastPath():
+    """
+    Pruebas unitarias para el atajo de operandos enteros.
+
+    Compara cada operación con la versión sin caché ni atajo
+    (``__wrapped__``), incluidos exponente y signo del resultado.
+    """
+
+    OPERATIONS = ("add", "subtract", "multiply", "divide", "percent")
+
+    @pytest.mark.parametrize("name", OPERATIONS)
+    @pytest.mark.parametrize("precision", [None, 5, 50])
+    def test_matches_decimal(self, name, precision):
+        """
+        Verifica que los resultados son idénticos a los de Decimal.
+        """
+        rnd = random.Random(8)
+        operation = getattr(Calculator, name)
+        values = [Decimal(rnd.randint(-10 ** digits, 10 ** digits))
+                  for digits in (1, 2, 3, 6, 14, 27, 28, 40)
+                  for _ in range(6)]
+        values += [Decimal("0"), Decimal("-0"), Decimal("100"),
+                   Decimal("2.0"), Decimal("1E+2"), Decimal(10 ** 5),
+                   Decimal(10 ** 28), Decimal(10 ** 29), Decimal(10 ** 30)]
+        for value_1 in values:
+            for value_2 in values:
+                if name == "divide" and not value_2:
+                    continue
+                expected = operation.__wrapped__(value_1, value_2, precision)
+                result = operation(value_1, value_2, precision)
+                assert str(result) == str(expected), (value_1, value_2)
+
+    def test_integers_skip_cache(self):
+        """
+        Verifica que los resultados enteros no ocupan la caché y los
+        cocientes no enteros sí.
+        """
+        Calculator.result_cache.clear()
+        assert Calculator.multiply(Decimal(12), Decimal(-3)) == Decimal(-36)
+        assert Calculator.divide(Decimal(12), Decimal(4)) == Decimal(3)
+        assert Calculator.percent(Decimal(250), Decimal(40)) == Decimal(100)
+        assert len(Calculator.result_cache) == 0
+        assert str(Calculator.divide(Decimal(10), Decimal(4))) == "2.5"
+        assert str(Calculator.percent(Decimal(5), Decimal(5))) == "0.25"
+        assert len(Calculator.result_cache) == 2
+
+    def test_inexact_quotient_not_divided(self, mocker):
+        """
+        Verifica que un cociente no entero se descarta antes de dividir, y
+        que la división solo la calcula el camino con caché.
+        """
+        divide = mocker.Mock(wraps=_OPERATIONS["/"])
+        mocker.patch.dict(_OPERATIONS, {"/": divide})
+        fast_path = _integer_fast_path("/")
+        assert fast_path(Decimal(1), Decimal(3), 28) is None
+        assert fast_path(Decimal(7), Decimal(0), 28) is None
+        assert divide.call_count == 0
+        assert fast_path(Decimal(12), Decimal(-4), 28) == Decimal(-3)
+        assert divide.call_count == 1
@@ -0,0 +1,231 @@
+# MODULO: test_concurrent_writers.py
+"""
+Pruebas unitarias para la escritura concurrente del historial ->
+reintentos de gestor_database, archivo de desbordamiento (history_spill.py)
+y varios procesos escribiendo en la misma base de datos.
+"""
+from decimal import Decimal
+import multiprocessing
+import sqlite3
+import threading
+import time
+import pytest
+from database import connection_pool, history_manager_db
+from database.history_manager_db import HistoryManager, HistoryWriteError
+from database.retention import RetentionPolicy
+
+PROCESSES = 4
+RECORDS = 300
+
+
+def write_records(db_path: str, worker: int, records: int) -> None:
+    """
+    Proceso escritor: encola ``records`` registros (uno de cada diez con
+    ``new_history``) y cierra el gestor.
+    """
+    HistoryManager._instance = None
+    HistoryManager._db_path = db_path
+    manager = HistoryManager()
+    manager.create_table()
+    for index in range(records):
+        equation = f"{worker} + {index}"
+        if index % 10 == 0:
+            manager.new_history(equation, Decimal(worker + index))
+        else:
+            manager.queue_history(equation, Decimal(worker + index))
+    manager.close()
+
+
+class TestConcurrentWriters:
+    """
+    Pruebas de bloqueo entre conexiones y procesos: reintentos con espera
+    aleatoria, desbordamiento a archivo, su volcado y varios procesos
+    escritores sin pérdidas.
+    """
+
+    @pytest.fixture
+    def manager(self, mocker, open_manager):
+        """
+        HistoryManager sobre un archivo temporal, sin espera de
+        ``busy_timeout`` y con reintentos cortos.
+        """
+        pragmas = tuple((name, 0 if name == "busy_timeout" else value)
+                        for name, value in connection_pool.PRAGMAS)
+        mocker.patch.object(connection_pool, "PRAGMAS", pragmas)
+        mocker.patch.object(history_manager_db, "RETRY_DELAY", 0.01)
+        return open_manager()
+
+    @pytest.fixture
+    def locker(self, manager):
+        """
+        Conexión de "otro proceso" que puede bloquear la base de datos.
+        """
+        connection = sqlite3.connect(manager.db_path, isolation_level=None,
+                                     check_same_thread=False)
+        yield connection
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        connection.close()
+
+    def equations(self, manager) -> list:
+        """
+        Ecuaciones guardadas, en orden.
+        """
+        with manager.pool.connection() as connection:
+            return [row[0] for row in connection.execute(
+                "SELECT EQUATION FROM history_results ORDER BY ID")]
+
+    def test_retry_with_jitter(self, manager, locker, mocker):
+        """
+        Verifica que una escritura bloqueada se reintenta con esperas
+        aleatorias crecientes hasta que se libera el bloqueo.
+        """
+        # Espera máxima en cada intento: 0.01 + 0.02 + 0.04 + 0.08 s.
+        uniform = mocker.patch.object(history_manager_db.random, "uniform",
+                                      side_effect=lambda low, high: high)
+        locker.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.05, locker.execute, ("COMMIT",))
+        release.start()
+        manager.new_history("1 + 1", Decimal(2))
+        release.join()
+        assert self.equations(manager) == ["1 + 1"]
+        assert not manager.spill.pending()
+        assert uniform.call_count >= 1
+        bounds = [call.args[1] for call in uniform.call_args_list]
+        assert bounds == [0.01 * 2 ** n for n in range(len(bounds))]
+
+    def test_spill_and_replay(self, manager, locker, capsys):
+        """
+        Verifica que lo que no se puede escribir se guarda en el archivo de
+        desbordamiento y se vuelca, con su fecha, al liberarse el bloqueo.
+        """
+        locker.execute("BEGIN IMMEDIATE")
+        manager.new_history("1 + 1", Decimal(2))
+        manager.queue_history("2 + 2", Decimal(4))
+        manager.writer.close()
+        assert "error" in capsys.readouterr().out
+        assert manager.spill.pending()
+        assert len(manager.spill.path.read_text().splitlines()) == 2
+        locker.execute("COMMIT")
+
+        assert manager.replay_spill() == 2
+        assert not manager.spill.pending()
+        assert self.equations(manager) == ["1 + 1", "2 + 2"]
+        with manager.pool.connection() as connection:
+            assert connection.execute(
+                "SELECT COUNT(*) FROM history_results "
+                "WHERE CREATED_AT IS NOT NULL AND RESULT_COEF IS NOT NULL"
+            ).fetchone()[0] == 2
+
+    def test_replay_after_flush(self, manager, locker):
+        """
+        Verifica que la siguiente escritura correcta vuelca lo desbordado.
+        """
+        locker.execute("BEGIN IMMEDIATE")
+        manager.new_history("1 + 1", Decimal(2))
+        locker.execute("COMMIT")
+        manager.queue_history("2 + 2", Decimal(4))
+        manager.writer.flush()
+        assert sorted(self.equations(manager)) == ["1 + 1", "2 + 2"]
+        assert not manager.spill.pending()
+
+    def test_replay_skips_truncated_line(self, manager):
+        """
+        Verifica que una línea incompleta (escritura interrumpida) se omite.
+        """
+        manager.spill.path.write_text(
+            '{"equation": "1 + 1", "result": "2", "created_at": null}\n'
+            '{"equation": "2 + ', encoding="utf-8")
+        manager.create_table()
+        assert self.equations(manager) == ["1 + 1"]
+        assert not manager.spill.pending()
+
+    def test_replay_failure_keeps_spill(self, manager, locker):
+        """
+        Verifica que si el volcado falla, el archivo se conserva.
+        """
+        manager.spill.path.write_text(
+            '{"equation": "1 + 1", "result": "2"}\n', encoding="utf-8")
+        locker.execute("BEGIN IMMEDIATE")
+        assert manager.replay_spill() == 0
+        assert manager.spill.pending()
+        locker.execute("COMMIT")
+        assert manager.replay_spill() == 1
+
+    def test_total_wait_is_capped(self, manager, locker, mocker):
+        """
+        Verifica que los reintentos no esperan más de LOCK_TIMEOUT en total
+        y que el busy_timeout recortado se restaura.
+        """
+        mocker.patch.object(history_manager_db, "LOCK_TIMEOUT", 0.3)
+        mocker.patch.object(history_manager_db, "RETRY_DELAY", 1.0)
+        mocker.patch.object(history_manager_db.random, "uniform",
+                            side_effect=lambda low, high: high)
+        connection = manager.pool.connection()
+        connection.execute("PRAGMA busy_timeout=200")
+        locker.execute("BEGIN IMMEDIATE")
+        start = time.monotonic()
+        manager.new_history("1 + 1", Decimal(2))
+        # Sin el límite: 0.2 s por intento y esperas de 1 + 2 + 4 + 8 s.
+        assert time.monotonic() - start < 1.0
+        assert manager.spill.pending()
+        assert connection.execute(
+            "PRAGMA busy_timeout").fetchone()[0] == 200
+
+    def test_failed_writes_raise(self, manager, locker, tmp_path):
+        """
+        Verifica que las escrituras que no desbordan al archivo lanzan
+        HistoryWriteError en lugar de perderse en silencio, y que el
+        mantenimiento se reintenta.
+        """
+        manager.new_history("1 + 1", Decimal(2))
+        manager.new_history("3 + 3", Decimal(6))
+        source = tmp_path / "import.jsonl"
+        source.write_text('{"equation": "2 + 2", "result": "4"}\n',
+                          encoding="utf-8")
+        policy = RetentionPolicy(max_rows=1)
+        manager.retention = policy
+        locker.execute("BEGIN IMMEDIATE")
+        for write in (manager.delete_history, manager.rebuild_stats,
+                      lambda: manager.import_(source),
+                      lambda: manager.prune(policy)):
+            with pytest.raises(HistoryWriteError):
+                write()
+        assert manager.housekeeping() is True
+        locker.execute("COMMIT")
+        assert self.equations(manager) == ["1 + 1", "3 + 3"]
+        assert manager.import_(source) == 1
+        assert manager.prune() == 2
+
+    def test_processes_lose_no_rows(self, tmp_path, capfd):
+        """
+        Verifica que varios procesos migrando y escribiendo a la vez en la
+        misma base de datos no pierden registros ni fallan, y mide el
+        rendimiento agregado.
+        """
+        db_path = str(tmp_path / "shared.db")
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=write_records,
+                            args=(db_path, worker, RECORDS))
+            for worker in range(PROCESSES)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(120)
+            assert process.exitcode == 0
+        elapsed = time.perf_counter() - start
+        assert "error" not in capfd.readouterr().out
+
+        with sqlite3.connect(db_path) as connection:
+            rows = connection.execute(
+                "SELECT EQUATION FROM history_results").fetchall()
+        expected = {f"{worker} + {index}" for worker in range(PROCESSES)
+                    for index in range(RECORDS)}
+        assert len(rows) == PROCESSES * RECORDS
+        assert {row[0] for row in rows} == expected
+        assert not (tmp_path / "shared.db.spill.jsonl").exists()
+        # Incluye el arranque de los procesos; el objetivo es detectar
+        # bloqueos, no medir con precisión (ver bench_concurrent_writers).
+        assert PROCESSES * RECORDS / elapsed > 50
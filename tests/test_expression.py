@@ -0,0 +1,91 @@
+# MODULO: test_expression.py
+"""
+Pruebas unitarias para el compilador de expresiones -> expression.py.
+"""
+from decimal import Decimal
+import pytest
+from core.calculator import Calculator
+from core.expression import (
+    CompiledPlan,
+    Number,
+    compile_expression,
+    evaluate,
+    fold_constants,
+    parse,
+)
+
+
+class TestExpression:
+    """
+    Pruebas unitarias para el análisis, plegado y evaluación de expresiones.
+    """
+
+    @pytest.mark.parametrize("text, expected", [
+        ("2 + 3 * 4", "14"),
+        ("(2 + 3) * 4", "20"),
+        ("12.5*(3+4)/7 - 10%", "11.25"),
+        ("200 + 16%", "232"),
+        ("50%", "0.5"),
+        ("-2 * -3", "6"),
+        ("10 / 4 - 1", "1.5"),
+    ])
+    def test_evaluate(self, text, expected):
+        """
+        Verifica la precedencia de operadores y la semántica del porcentaje.
+        """
+        assert evaluate(text) == Decimal(expected)
+
+    def test_uses_calculator_precision(self):
+        """
+        Verifica que la división usa la precisión de Calculator (28 dígitos).
+        """
+        assert evaluate("1 / 3") == Calculator.divide(Decimal(1), Decimal(3))
+
+    def test_constant_folding(self):
+        """
+        Verifica que los subárboles constantes se calculan al compilar.
+        """
+        assert fold_constants(parse("2 * (3 + 4)")) == Number(Decimal(14))
+        plan = compile_expression("x * (1 + 0.16)")
+        assert plan.instructions == (
+            ("load", "x"), ("push", Decimal("1.16")), ("binary", "*"))
+        assert plan.variables == ("x",)
+        assert plan.evaluate(x=Decimal(100)) == Decimal("116.00")
+
+    def test_float_variables_match_calculator(self):
+        """
+        Verifica que una variable float se convierte desde su texto, igual
+        que en los lotes de Calculator.
+        """
+        plan = compile_expression("x * 3")
+        assert plan.evaluate(x=0.1) == Decimal("0.3")
+        assert plan.evaluate(x=0.1) == \
+            Calculator.apply("*", [0.1], [3]).results[0]
+
+    def test_plan_cache(self):
+        """
+        Verifica que una expresión repetida reutiliza el plan compilado.
+        """
+        compile_expression.cache_clear()
+        first = compile_expression("7 * y - 3")
+        second = compile_expression("7 * y - 3")
+        assert isinstance(first, CompiledPlan)
+        assert first is second
+        assert compile_expression.cache_info().hits == 1
+
+    def test_division_by_zero_is_raised_on_evaluate(self):
+        """
+        Verifica que una división por cero no se pliega y falla al evaluar.
+        """
+        plan = compile_expression("1 / 0")
+        with pytest.raises(ZeroDivisionError,
+                           match="No se puede dividir por cero"):
+            plan.evaluate()
+
+    @pytest.mark.parametrize("text", ["1 +", "(1 + 2", "1 2", "3 $ 4", ""])
+    def test_invalid_expressions(self, text):
+        """
+        Verifica que las expresiones mal formadas lanzan ValueError.
+        """
+        with pytest.raises(ValueError, match="Expresión inválida"):
+            parse(text)
@@ -0,0 +1,119 @@
+# MODULO: test_fixed_point.py
+"""
+Pruebas unitarias para la clase FixedPointCalculator -> fixed_point.py.
+
+Verifican que el motor de punto fijo reproduce exactamente el resultado de
+``Calculator.<operación>(v1, v2).quantize(Decimal("0.00"))``.
+"""
+import random
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP, localcontext
+import pytest
+from core.fixed_point import FixedPointCalculator
+
+
+def decimal_reference(operator: str, value_1: Decimal, value_2: Decimal,
+                      rounding: str = "ROUND_HALF_EVEN") -> Decimal:
+    """
+    Calcula el resultado esperado con el camino Decimal de 28 dígitos.
+    """
+    with localcontext() as ctx:
+        ctx.prec = 28
+        ctx.rounding = rounding
+        if operator == "+":
+            result = value_1 + value_2
+        elif operator == "-":
+            result = value_1 - value_2
+        elif operator == "*":
+            result = value_1 * value_2
+        elif operator == "/":
+            result = value_1 / value_2
+        else:
+            result = (value_1 * value_2) / Decimal(100)
+        return result.quantize(Decimal("0.00"))
+
+
+class TestFixedPointCalculator:
+    """
+    Pruebas unitarias para la clase FixedPointCalculator.
+    """
+
+    engine: FixedPointCalculator = FixedPointCalculator()
+
+    @pytest.mark.parametrize("operator, value_1, value_2, expected", [
+        ("+", "2.5", "3.5", "6.00"),
+        ("-", "3.005", "0", "3.00"),
+        ("*", "3.5", "-2.5", "-8.75"),
+        ("/", "10", "3", "3.33"),
+        ("%", "250", "16", "40.00"),
+        ("*", "-0.001", "1", "-0.00"),
+        ("*", "0", "-3", "-0.00"),
+    ])
+    def test_known_results(self, operator, value_1, value_2, expected):
+        """
+        Verifica resultados conocidos, incluido el signo de los ceros.
+        """
+        result = self.engine.calculate(
+            operator, Decimal(value_1), Decimal(value_2))
+        assert str(result) == expected
+
+    def test_double_rounding_matches_decimal(self):
+        """
+        Verifica el doble redondeo: 28 dígitos y después dos decimales.
+        """
+        value = Decimal("0.01" + "4" + "9" * 30)
+        assert self.engine.add(value, Decimal(0)) == decimal_reference(
+            "+", value, Decimal(0))
+
+    def test_random_operands_match_decimal(self):
+        """
+        Compara el motor con el camino Decimal sobre operandos aleatorios.
+        """
+        rnd = random.Random(2024)
+        for _ in range(3000):
+            value_1 = Decimal(rnd.randint(-10**20, 10**20)).scaleb(
+                -rnd.randint(8, 25))
+            value_2 = Decimal(rnd.randint(-10**12, 10**12)).scaleb(
+                -rnd.randint(0, 12))
+            operator = rnd.choice("+-*/%")
+            if operator == "/" and value_2 == 0:
+                continue
+            assert str(self.engine.calculate(operator, value_1, value_2)) \
+                == str(decimal_reference(operator, value_1, value_2))
+
+    def test_rounding_mode(self):
+        """
+        Verifica que el modo de redondeo es configurable.
+        """
+        engine = FixedPointCalculator(rounding=ROUND_HALF_UP)
+        assert engine.add(Decimal("0.125"), Decimal(0)) == Decimal("0.13")
+        assert self.engine.add(Decimal("0.125"), Decimal(0)) \
+            == Decimal("0.12")
+
+    def test_errors_match_decimal(self):
+        """
+        Verifica la división por cero y el desbordamiento de precisión.
+        """
+        with pytest.raises(ZeroDivisionError,
+                           match="No se puede dividir por cero"):
+            self.engine.divide(Decimal(1), Decimal(0))
+        with pytest.raises(InvalidOperation):
+            self.engine.multiply(Decimal(10) ** 20, Decimal(10) ** 10)
+
+    def test_apply_scaled(self):
+        """
+        Verifica las operaciones sobre enteros escalados.
+        """
+        assert self.engine.apply_scaled("*", [150, -333], [250, 300]) \
+            == [375, -999]
+        assert self.engine.apply_scaled("/", [1000, 100], [300, 0]) \
+            == [333, None]
+        assert self.engine.to_scaled(Decimal("12.345")) == 1234
+        assert self.engine.from_scaled(1234) == Decimal("12.34")
+
+    def test_apply_reports_errors(self):
+        """
+        Verifica que apply informa los errores por posición.
+        """
+        batch = self.engine.apply("/", ["1", "1"], ["4", "0"])
+        assert batch.results == [Decimal("0.25"), None]
+        assert list(batch.errors) == [1]
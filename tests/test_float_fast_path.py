@@ -0,0 +1,67 @@
+# MODULO: test_float_fast_path.py
+"""
+Pruebas unitarias para la clase FloatFastPath -> float_fast_path.py.
+
+Se omiten si NumPy no está instalado (dependencia opcional ``fast``).
+"""
+import random
+from decimal import Decimal
+import pytest
+from core.calculator import Calculator
+
+np = pytest.importorskip("numpy")
+from core.float_fast_path import FloatFastPath  # noqa: E402
+
+CENT = Decimal("0.00")
+
+
+class TestFloatFastPath:
+    """
+    Pruebas unitarias para la clase FloatFastPath.
+    """
+
+    def test_matches_decimal_path(self):
+        """
+        Verifica que los resultados coinciden con Calculator + quantize.
+        """
+        rnd = random.Random(11)
+        values_1 = [Decimal(rnd.randint(-10**8, 10**8)).scaleb(-2)
+                    for _ in range(2000)]
+        values_2 = [Decimal(rnd.randint(1, 10**5)).scaleb(-2)
+                    for _ in range(2000)]
+        fast_path = FloatFastPath()
+        for operator, operation in (("+", Calculator.add),
+                                    ("*", Calculator.multiply),
+                                    ("/", Calculator.divide),
+                                    ("%", Calculator.percent)):
+            batch = fast_path.apply(operator, values_1, values_2)
+            assert batch.results == [
+                operation(v1, v2).quantize(CENT)
+                for v1, v2 in zip(values_1, values_2)
+            ]
+        assert fast_path.stats["fast"] > fast_path.stats["fallback"]
+
+    def test_ties_fall_back_to_decimal(self):
+        """
+        Verifica que los empates se resuelven con Decimal (ROUND_HALF_EVEN).
+        """
+        fast_path = FloatFastPath()
+        batch = fast_path.apply("+", ["1.005", "1.015"], ["0", "0"])
+        assert batch.results == [Decimal("1.00"), Decimal("1.02")]
+        assert fast_path.stats["fallback"] == 2
+
+    def test_float_arrays_and_errors(self):
+        """
+        Verifica la entrada como array y la división por cero por posición.
+        """
+        batch = FloatFastPath().apply(
+            "/", np.array([1.0, 10.0]), np.array([0.0, 4.0]))
+        assert batch.results == [None, Decimal("2.50")]
+        assert batch.errors == {0: "No se puede dividir por cero"}
+
+    def test_negative_zero(self):
+        """
+        Verifica que se conserva el signo de ``-0.00``.
+        """
+        batch = FloatFastPath().apply("*", ["-0.001"], ["1"])
+        assert str(batch.results[0]) == "-0.00"
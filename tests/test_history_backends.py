@@ -0,0 +1,222 @@
+# MODULO: test_history_backends.py
+"""
+Pruebas unitarias para los backends del historial -> history_backends.py y
+su selección en HistoryManager (storage, CALCULATOR_HISTORY_STORAGE).
+"""
+from decimal import Decimal
+import json
+import pytest
+from database.history_backends import AppendLogBackend, MemoryBackend
+from database.history_db import DailyStats
+from database.history_manager_db import (
+    STORAGE_ENV, STORAGES, SQLiteBackend
+)
+from database.retention import RetentionPolicy
+
+RECORDS = [("1 + 1", "2"), ("2 * 3", "6"), ("10 / 4", "2.5"),
+           ("7 - 9", "-2"), ("√-1", "NaN"), ("2 + 3", "5")]
+
+
+class TestHistoryBackends:
+    """
+    Pruebas del mismo comportamiento con los tres backends y de lo propio
+    del archivo de solo añadir.
+    """
+
+    @pytest.fixture(params=STORAGES)
+    def manager(self, request, open_manager):
+        """
+        HistoryManager con cada backend y los registros de ``RECORDS``.
+        """
+        manager = open_manager(request.param)
+        for equation, result in RECORDS:
+            manager.new_history(equation, Decimal(result))
+        return manager
+
+    def test_selection(self, open_manager, monkeypatch):
+        """
+        Verifica la elección del backend por atributo o por entorno.
+        """
+        assert isinstance(open_manager(None).backend, SQLiteBackend)
+        monkeypatch.setenv(STORAGE_ENV, "memory")
+        assert isinstance(open_manager(None).backend, MemoryBackend)
+        assert type(open_manager("log").backend) is AppendLogBackend
+        with pytest.raises(ValueError):
+            open_manager("otro")
+
+    def test_reads(self, manager):
+        """
+        Verifica los últimos registros, las páginas y el recorrido.
+        """
+        manager.queue_history("4 + 4", Decimal(8))
+        last = manager.get_last_records(3)
+        assert [record.equation for record in last] == \
+            ["4 + 4", "2 + 3", "√-1"]
+        assert [record.id for record in last] == [7, 6, 5]
+        page = manager.get_records_page(before_id=3, limit=5)
+        assert [record.equation for record in page] == ["2 * 3", "1 + 1"]
+        assert [entry.result for entry in manager.iter_history(
+            after_id=4, page_size=2)] == ["NaN", "5", "8"]
+
+    def test_queries(self, manager):
+        """
+        Verifica las consultas por valor, la suma y la búsqueda.
+        """
+        assert manager.get_result_values(2)[0]["result"] == Decimal(5)
+        assert [record["equation"] for record in manager.get_results_between(
+            Decimal(2), Decimal(5))] == ["1 + 1", "10 / 4", "2 + 3"]
+        assert manager.sum_results() == Decimal("13.5")
+        assert manager.sum_results("+") == Decimal(7)
+        assert [record.equation for record in manager.search_history(
+            "+")] == ["2 + 3", "1 + 1"]
+        assert [record.equation for record in manager.search_history(
+            "2", low=Decimal(0))] == ["2 + 3", "2 * 3"]
+
+    def test_bounds_outside_float_range(self, manager):
+        """
+        Verifica los filtros por valor con extremos que no caben en float,
+        también sobre resultados sin valor REAL.
+        """
+        manager.new_history("1E+400 * 1", Decimal("1E+400"))
+        manager.new_history("-1E+400 * 1", Decimal("-1E+400"))
+        huge, infinity = Decimal("1E+500"), Decimal("Infinity")
+        assert [record["equation"] for record in manager.get_results_between(
+            Decimal(5), huge)] == ["2 + 3", "2 * 3", "1E+400 * 1"]
+        assert [record["equation"] for record in manager.get_results_between(
+            -infinity, Decimal(-1), 2)] == ["-1E+400 * 1", "7 - 9"]
+        assert manager.get_results_between(huge, infinity) == []
+        assert [record.equation for record in manager.search_history(
+            "*", low=Decimal(6), high=huge)] == ["1E+400 * 1", "2 * 3"]
+
+    def test_stats(self, manager):
+        """
+        Verifica el resumen por operador.
+        """
+        assert manager.stats(by_day=False) == [
+            DailyStats(None, None, 1, 0, 0.0, None, None),
+            DailyStats(None, "*", 1, 1, 6.0, 6.0, 6.0),
+            DailyStats(None, "+", 2, 2, 7.0, 2.0, 5.0),
+            DailyStats(None, "-", 1, 1, -2.0, -2.0, -2.0),
+            DailyStats(None, "/", 1, 1, 2.5, 2.5, 2.5),
+        ]
+        assert len({row.day for row in manager.stats()}) == 1
+
+    def test_export_import_and_prune(self, manager, tmp_path):
+        """
+        Verifica la exportación, la importación con fecha y la retención.
+        """
+        path = tmp_path / "export.csv"
+        assert manager.export(path) == 6
+        manager.delete_history()
+        assert manager.get_last_records() == []
+        assert manager.import_(path) == 6
+        assert [entry.id for entry in manager.iter_history()] == \
+            list(range(7, 13))
+        assert manager.prune(RetentionPolicy(max_rows=2,
+                                             batch_size=3)) == 4
+        assert [record.equation for record in
+                manager.get_last_records()] == ["2 + 3", "√-1"]
+
+    def test_memory_stays_off_disk(self, open_manager, tmp_path):
+        """
+        Verifica que el backend en memoria no crea archivos, ni siquiera el
+        de desbordamiento, y que el del archivo lo pone a su lado.
+        """
+        manager = open_manager("memory")
+        assert manager.spill is None
+        manager.queue_history("1 + 1", Decimal(2))
+        manager.new_history("2 + 2", Decimal(4))
+        manager.close()
+        assert list(tmp_path.iterdir()) == []
+        assert open_manager("log").spill.path == \
+            tmp_path / "history.jsonl.spill.jsonl"
+
+    def test_log_survives_restart(self, open_manager):
+        """
+        Verifica que el archivo reconstruye el historial al arrancar,
+        incluidos borrados, y que los ID no se reutilizan.
+        """
+        manager = open_manager("log")
+        for equation, result in RECORDS:
+            manager.queue_history(equation, Decimal(result))
+        manager.prune(RetentionPolicy(max_rows=4))
+        manager.new_history("9 + 9", Decimal(18))
+        manager.close()
+
+        manager = open_manager("log")
+        assert [record.id for record in manager.get_last_records(10)] == \
+            [7, 6, 5, 4, 3]
+        manager.delete_history()
+        manager.close()
+
+        manager = open_manager("log")
+        assert manager.get_last_records() == []
+        manager.new_history("1 + 1", Decimal(2))
+        assert manager.get_last_records()[0].id == 8
+
+    def test_log_truncated_line(self, open_manager):
+        """
+        Verifica que una última línea incompleta se descarta y no estropea
+        la siguiente escritura.
+        """
+        manager = open_manager("log")
+        manager.new_history("1 + 1", Decimal(2))
+        manager.close()
+        with open(manager.backend.path, "a", encoding="utf-8") as file:
+            file.write('{"id": 2, "equation": "2 +')
+
+        manager = open_manager("log")
+        manager.new_history("3 + 3", Decimal(6))
+        manager.close()
+        manager = open_manager("log")
+        assert [record.equation for record in
+                manager.get_last_records()] == ["3 + 3", "1 + 1"]
+
+    def test_log_compaction(self, open_manager):
+        """
+        Verifica que ``vacuum`` reescribe el archivo solo con los registros
+        vivos y conserva el siguiente ID.
+        """
+        manager = open_manager("log")
+        for index in range(10):
+            manager.queue_history(f"{index} + 0", Decimal(index))
+        manager.prune(RetentionPolicy(max_rows=3))
+        lines = manager.backend.path.read_text().splitlines()
+        assert len(lines) == 4
+        assert json.loads(lines[0]) == {"next_id": 11}
+        manager.close()
+
+        manager = open_manager("log")
+        manager.new_history("x + 1", Decimal(1))
+        assert [record.id for record in manager.get_last_records()] == \
+            [11, 10, 9, 8]
+
+    def test_log_housekeeping_settles(self, open_manager):
+        """
+        Verifica que ``housekeeping`` no indica trabajo pendiente cuando
+        sobran líneas pero aún no toca compactar.
+        """
+        manager = open_manager("log")
+        for index in range(10):
+            manager.new_history(f"{index} + 0", Decimal(index))
+        manager.set_retention(RetentionPolicy(max_rows=8))
+        assert manager.housekeeping()
+        assert not manager.housekeeping()
+        assert manager.backend.vacuum(100) == 0
+        assert len(manager.backend.path.read_text().splitlines()) == 11
+
+    def test_log_max_bytes(self, open_manager):
+        """
+        Verifica que ``max_bytes`` mide los registros vivos del archivo.
+        """
+        manager = open_manager("log")
+        for index in range(10):
+            manager.queue_history(f"{index} + 0", Decimal(index))
+        manager.writer.flush()
+        size = manager.backend.path.stat().st_size
+        manager.prune(RetentionPolicy(max_bytes=size // 2, batch_size=1))
+        # Compactado: la primera línea es {"next_id": 11}.
+        lines = manager.backend.path.read_bytes().splitlines(keepends=True)
+        assert sum(map(len, lines[1:])) <= size // 2
+        assert [record.id for record in manager.get_last_records(10)] == \
+            [10, 9, 8, 7]
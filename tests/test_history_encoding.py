@@ -0,0 +1,92 @@
+# MODULO: test_history_encoding.py
+"""
+Pruebas unitarias para la codificación exacta de resultados ->
+history_db.encode_decimal / decode_decimal y su uso en HistoryManager.
+"""
+from decimal import Decimal
+import pytest
+from database.history_db import decode_decimal, encode_decimal
+
+VALUES = [
+    "0", "5.00", "-6.00", "0.001", "123456789.123456789",
+    "9223372036854775807", "-9223372036854775808",
+    "1E+999999", "-1E-999999", "1.5E+400000", "7E-400000",
+    "1.000000000000000000000E+30",
+    "0.3333333333333333333333333333",
+    "92233720368547758080000",
+    "-0.00",
+]
+
+
+class TestHistoryEncoding:
+    """
+    Pruebas de ida y vuelta sin pérdida de valores muy grandes y muy
+    pequeños, en memoria y a través de la base de datos.
+    """
+
+    @pytest.mark.parametrize("text", VALUES)
+    def test_round_trip(self, text):
+        """
+        Verifica que decode(encode(x)) == x, con el mismo exponente si el
+        coeficiente cabe en 64 bits.
+        """
+        value = Decimal(text)
+        coefficient, exponent = encode_decimal(value)
+        result = decode_decimal(coefficient, exponent, text)
+        assert result == value
+        assert result.is_signed() == value.is_signed()
+        if coefficient is not None and abs(coefficient) < 2 ** 63 and \
+                len(value.as_tuple().digits) <= 19:
+            assert str(result) == str(value)
+
+    def test_encoding(self):
+        """
+        Verifica la codificación (coeficiente, exponente).
+        """
+        assert encode_decimal(Decimal("5.00")) == (500, -2)
+        assert encode_decimal(Decimal("1E+999999")) == (1, 999999)
+        assert encode_decimal(Decimal("1.000000000000000000000E+30")) == \
+            (1, 30)
+        assert encode_decimal(Decimal("9223372036854775808")) == (None, None)
+        assert encode_decimal(Decimal("NaN")) == (None, None)
+        assert encode_decimal(None) == (None, None)
+
+    def test_database_round_trip(self, memory_manager):
+        """
+        Verifica que los resultados guardados se leen como Decimal
+        idénticos.
+        """
+        for text in VALUES:
+            memory_manager.new_history(f"{text} + 0", Decimal(text))
+        records = memory_manager.get_result_values(len(VALUES))
+        assert [record["result"] for record in reversed(records)] == \
+            [Decimal(text) for text in VALUES]
+        stored = memory_manager.pool.connection().execute(
+            "SELECT OPERAND_1_COEF, OPERAND_1_EXP FROM history_results "
+            "ORDER BY ID LIMIT 2").fetchall()
+        assert stored == [(0, 0), (500, -2)]
+
+    def test_sum_and_range(self, memory_manager):
+        """
+        Verifica la suma exacta y el filtro por rango.
+        """
+        values = ["0.10", "0.20", "0.30", "1E+30", "-1E+30", "5",
+                  "0.3333333333333333333333333333"]
+        for text in values:
+            memory_manager.queue_history(f"{text} * 1", Decimal(text))
+        assert memory_manager.sum_results() == \
+            Decimal("5.9333333333333333333333333333")
+        assert memory_manager.sum_results("+") == 0
+        between = memory_manager.get_results_between(
+            Decimal("0.2"), Decimal("0.3"))
+        assert [record["result"] for record in between] == \
+            [Decimal("0.20"), Decimal("0.30")]
+
+    def test_sum_overflow_falls_back(self, memory_manager):
+        """
+        Verifica que la suma es exacta aunque SUM desborde los 64 bits.
+        """
+        big = Decimal(2 ** 62)
+        for _ in range(4):
+            memory_manager.new_history("2 ^ 62", big)
+        assert memory_manager.sum_results() == 4 * big
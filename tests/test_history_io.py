@@ -0,0 +1,138 @@
+# MODULO: test_history_io.py
+"""
+Pruebas unitarias para la exportación e importación del historial ->
+history_io.py y HistoryManager.export/import_.
+"""
+from decimal import Decimal
+import gzip
+import json
+import pytest
+from database.history_io import detect_format
+
+
+class TestHistoryIO:
+    """
+    Pruebas de export/import: formatos, compresión, bloques, progreso y
+    errores.
+    """
+
+    def rows(self, manager) -> list:
+        """
+        Columnas exportables de la tabla, en orden.
+        """
+        with manager.pool.connection() as connection:
+            return connection.execute("""
+                SELECT EQUATION, RESULT, CREATED_AT, RESULT_COEF,
+                       RESULT_EXP, OPERATOR
+                FROM history_results ORDER BY ID
+            """).fetchall()
+
+    def fill(self, manager) -> None:
+        """
+        Registros con resultados exactos, texto no numérico y caracteres no
+        ASCII; uno sin fecha (como los migrados).
+        """
+        manager.new_history("2 + 3", Decimal(5))
+        manager.new_history("1 / 3", Decimal("0.3333333333"))
+        manager.new_history("5 * 1.00", Decimal("5.00"))
+        manager.insert_many([("√2, \"x\"", "Error", None, None, None, None,
+                              None, None, None, None, None, None)])
+        with manager.pool.connection() as connection:
+            connection.execute(
+                "UPDATE history_results SET CREATED_AT = NULL WHERE ID = 2")
+
+    @pytest.mark.parametrize("name", [
+        "history.csv", "history.jsonl", "history.csv.gz", "history.jsonl.gz"
+    ])
+    def test_round_trip(self, manager, tmp_path, name):
+        """
+        Verifica que exportar, vaciar e importar conserva los registros.
+        """
+        self.fill(manager)
+        expected = self.rows(manager)
+        path = tmp_path / name
+        assert manager.export(path) == 4
+        manager.delete_history()
+        assert manager.import_(path) == 4
+        assert self.rows(manager) == expected
+        assert manager.get_last_records(1)[0].equation == "√2, \"x\""
+
+    def test_gzip_output(self, manager, tmp_path):
+        """
+        Verifica que un ``.gz`` se escribe comprimido.
+        """
+        self.fill(manager)
+        path = tmp_path / "history.jsonl.gz"
+        manager.export(path)
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            first = json.loads(file.readline())
+        assert first["equation"] == "2 + 3"
+        assert first["result"] == "5"
+
+    def test_chunks_and_progress(self, manager, tmp_path, mocker):
+        """
+        Verifica que se exporta e importa por bloques y se informa del
+        progreso tras cada uno.
+        """
+        manager.insert_many([(f"{n} + 0", str(n), "+", n, 0.0, n, n, 0, n,
+                              0, 0, 0) for n in range(25)])
+        path = tmp_path / "history.csv"
+        reads = mocker.spy(manager.backend, "read_after")
+        exported = []
+        assert manager.export(path, chunk_size=10,
+                              progress=exported.append) == 25
+        assert exported == [10, 20, 25]
+        assert reads.call_count == 4
+
+        writes = mocker.spy(manager.backend, "import_rows")
+        imported = []
+        assert manager.import_(path, batch_size=10,
+                               progress=imported.append) == 25
+        assert imported == [10, 20, 25]
+        assert writes.call_count == 3
+        assert len(self.rows(manager)) == 50
+
+    def test_explicit_format(self, manager, tmp_path):
+        """
+        Verifica que ``fmt`` sustituye a la extensión.
+        """
+        self.fill(manager)
+        path = tmp_path / "history.txt"
+        manager.export(path, fmt="jsonl")
+        assert json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+        assert manager.import_(path, fmt="jsonl") == 4
+
+    def test_detect_format(self):
+        """
+        Verifica la deducción del formato y la compresión.
+        """
+        assert detect_format("a.CSV") == ("csv", False)
+        assert detect_format("a.b.jsonl.gz") == ("jsonl", True)
+        assert detect_format("a.gz", "csv") == ("csv", True)
+        with pytest.raises(ValueError):
+            detect_format("a.xml")
+        with pytest.raises(ValueError):
+            detect_format("a")
+
+    def test_incomplete_record(self, manager, tmp_path):
+        """
+        Verifica que un registro sin ``result`` detiene la importación con
+        ``ValueError`` tras guardar los bloques anteriores.
+        """
+        path = tmp_path / "history.jsonl"
+        path.write_text(
+            '{"equation": "1 + 1", "result": "2"}\n'
+            '\n'
+            '{"equation": "2 + 2"}\n', encoding="utf-8")
+        with pytest.raises(ValueError, match="Registro 2"):
+            manager.import_(path, batch_size=1)
+        assert [row[0] for row in self.rows(manager)] == ["1 + 1"]
+
+    def test_invalid_chunk_size(self, manager, tmp_path):
+        """
+        Verifica que los tamaños de bloque deben ser positivos.
+        """
+        with pytest.raises(ValueError):
+            manager.export(tmp_path / "history.csv", chunk_size=0)
+        with pytest.raises(ValueError):
+            manager.import_(tmp_path / "history.csv", batch_size=0)
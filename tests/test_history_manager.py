@@ -4,7 +4,10 @@ Pruebas unitarias para la clase HistoryManager -> history_manager_db.
 Test totales => 4/41
 """
 from decimal import Decimal
+import threading
+import tracemalloc
 import pytest
+from database.connection_pool import ConnectionPool
 from database.history_manager_db import HistoryManager
 
 
@@ -83,8 +86,8 @@ class TestHistoryManager:
         records = history_manager.get_last_records(1)
         
         assert len(records) == 1
-        assert records[0]['equation'] == test_equation
-        assert records[0]['result'] == str(test_result)
+        assert records[0].equation == test_equation
+        assert records[0].result == str(test_result)
 
     def test_get_last_records(
             self,
@@ -121,8 +124,8 @@ class TestHistoryManager:
         assert len(last_five) == 5
 
         # TEST: el último registro es el esperado (10+10=20).
-        assert last_five[0]['equation'] == "10+10"
-        assert last_five[0]['result'] == "20"
+        assert last_five[0].equation == "10+10"
+        assert last_five[0].result == "20"
 
     def test_delete_history(
         self,
@@ -193,3 +196,108 @@ class TestHistoryManager:
         assert instance1 is instance2
         # TEST: verifica que posee el mismo ID.
         assert id(instance1) == id(instance2)
+
+    def test_connection_is_reused(self, history_manager):
+        """
+        Verifica que las operaciones de un mismo hilo comparten conexión y
+        que cada hilo tiene la suya.
+        """
+        connection = history_manager.pool.connection()
+        history_manager.new_history("1+1", Decimal("2"))
+        assert history_manager.pool.connection() is connection
+
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(history_manager.pool.connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not connection
+        assert len(history_manager.pool) == 2
+
+    def test_memory_database_is_shared(self, memory_manager):
+        """
+        Verifica que con ``:memory:`` todos los hilos (el escritor en
+        segundo plano incluido) usan la misma base de datos, distinta de la
+        de otros pools, y que no se escribe nada en disco.
+        """
+        memory_manager.queue_history("1+1", Decimal("2"))
+        memory_manager.writer.flush()
+        thread = threading.Thread(
+            target=memory_manager.new_history, args=("2+2", Decimal("4")))
+        thread.start()
+        thread.join()
+        assert [record.equation for record in
+                memory_manager.get_last_records()] == ["2+2", "1+1"]
+        assert memory_manager.recent._only_change(0, [1, 2])
+        assert memory_manager.spill is None
+
+        other = ConnectionPool(":memory:")
+        assert other.database != memory_manager.pool.database
+        assert other.connection().execute(
+            "SELECT name FROM sqlite_master").fetchall() == []
+        other.close_all()
+
+    def test_wal_and_close(self, manager):
+        """
+        Verifica el modo WAL en un archivo y que close() cierra las
+        conexiones sin impedir usos posteriores.
+        """
+        mode = manager.pool.connection().execute(
+            "PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+        manager.new_history("2*3", Decimal("6"))
+        manager.close()
+        assert len(manager.pool) == 0
+        assert manager.get_last_records(1)[0].result == "6"
+
+    def test_iter_history(self, history_manager):
+        """
+        Verifica el recorrido por páginas: orden por ID, after_id, páginas
+        parciales y registros encolados.
+        """
+        for i in range(1, 8):
+            history_manager.new_history(f"{i}+0", Decimal(i))
+        history_manager.queue_history("8+0", Decimal(8))
+
+        entries = list(history_manager.iter_history(page_size=3))
+        assert [entry.equation for entry in entries] == \
+            [f"{i}+0" for i in range(1, 9)]
+        assert entries[0].result == "1"
+
+        after = list(history_manager.iter_history(after_id=entries[5].id,
+                                                  page_size=3))
+        assert [entry.id for entry in after] == \
+            [entry.id for entry in entries[6:]]
+
+        with pytest.raises(ValueError):
+            next(history_manager.iter_history(page_size=0))
+
+    def test_iter_history_million_rows(self, manager):
+        """
+        Verifica que recorrer un millón de registros usa memoria constante
+        (el pico no depende del tamaño de la tabla).
+        """
+        with manager.pool.connection() as connection:
+            connection.execute("""
+                WITH RECURSIVE n(i) AS (
+                    SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000
+                )
+                INSERT INTO history_results (EQUATION, RESULT)
+                SELECT i || '+1', CAST(i + 1 AS TEXT) FROM n
+            """)
+
+        tracemalloc.start()
+        count = 0
+        last_id = 0
+        for entry in manager.iter_history(page_size=1000):
+            assert entry.id > last_id
+            last_id = entry.id
+            count += 1
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert count == 1_000_000
+        # Una página de 1000 filas ocupa unos cientos de KiB; la tabla
+        # completa como lista de diccionarios, cientos de MiB.
+        assert peak < 5 * 1024 * 1024
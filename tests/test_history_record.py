@@ -0,0 +1,89 @@
+# MODULO: test_history_record.py
+"""
+Pruebas unitarias para los registros ligeros del historial -> HistoryEntry
+y to_history_row (history_db.py).
+"""
+from decimal import Decimal
+import pydantic
+import pytest
+from database.history_db import (
+    HistoryEntry, HistoryTableDB, to_history_row
+)
+from database.history_manager_db import HistoryManager
+
+
+class TestHistoryRecord:
+    """
+    Pruebas del registro inmutable y de la validación en la entrada
+    (normal y estricta).
+    """
+
+    def test_record_access(self):
+        """
+        Verifica el acceso por nombre y por posición, que el registro es una
+        tupla sin diccionario y su conversión con ``_asdict``.
+        """
+        record = HistoryEntry(7, "2 + 2", "4")
+        assert record.equation == record[1] == "2 + 2"
+        assert record == (7, "2 + 2", "4")
+        assert record._asdict() == {"id": 7, "equation": "2 + 2",
+                                    "result": "4"}
+        assert len({record, HistoryEntry(7, "2 + 2", "4")}) == 1
+        assert not hasattr(record, "__dict__")
+
+    def test_fast_path_matches_model(self):
+        """
+        Verifica que la conversión directa da la misma fila que el modelo.
+        """
+        for equation, result in [("2 + 3", Decimal("5.00")),
+                                 ("1 / 3", Decimal("0.3333")),
+                                 ("texto", Decimal("NaN"))]:
+            assert to_history_row(equation, result) == \
+                HistoryTableDB(equation=equation, result=result).to_row()
+
+    def test_coercion_outside_fast_path(self):
+        """
+        Verifica que otros tipos se siguen convirtiendo o rechazando con el
+        modelo.
+        """
+        assert to_history_row("2 + 2", 4)[1] == "4"
+        with pytest.raises(pydantic.ValidationError):
+            to_history_row("2 + 2", "cuatro")
+
+    def test_strict(self):
+        """
+        Verifica que el modo estricto rechaza conversiones, ecuaciones sin
+        formato y resultados no finitos.
+        """
+        assert to_history_row("2 + 2", Decimal(4), strict=True)[1] == "4"
+        for equation, result in [("2 + 2", 4), ("2 + 2", "4"),
+                                 ("texto", Decimal(4)),
+                                 ("1 / 0", Decimal("Infinity"))]:
+            with pytest.raises(pydantic.ValidationError):
+                to_history_row(equation, result, strict=True)
+
+    def test_manager_strict(self, memory_manager, mocker):
+        """
+        Verifica que ``HistoryManager.strict`` se aplica en ``new_history``
+        y ``queue_history``.
+        """
+        mocker.patch.object(HistoryManager, "strict", True)
+        with pytest.raises(pydantic.ValidationError):
+            memory_manager.new_history("texto", Decimal(1))
+        with pytest.raises(pydantic.ValidationError):
+            memory_manager.queue_history("2 + 2", 4)
+        assert memory_manager.get_last_records() == []
+
+    def test_recent_ids_match_database(self, memory_manager):
+        """
+        Verifica que los registros en memoria llevan los ID de la base de
+        datos.
+        """
+        memory_manager.get_last_records()
+        memory_manager.new_history("1 + 1", Decimal(2))
+        for n in range(3):
+            memory_manager.queue_history(f"{n} + 0", Decimal(n))
+        from_memory = memory_manager.get_last_records(4)
+        memory_manager.recent.invalidate()
+        assert memory_manager.get_last_records(4) == from_memory
+        assert [record.id for record in from_memory] == [4, 3, 2, 1]
@@ -0,0 +1,123 @@
+# MODULO: test_history_stats.py
+"""
+Pruebas unitarias para el resumen del historial -> tabla history_stats
+(migrations.py) y HistoryManager.stats/rebuild_stats.
+"""
+from datetime import date
+from decimal import Decimal
+from database.history_db import DailyStats
+
+
+class TestHistoryStats:
+    """
+    Pruebas del resumen por día y operador: inserciones, borrados,
+    actualizaciones, filtros y reconstrucción.
+    """
+
+    def execute(self, memory_manager, sql: str, params=()) -> list:
+        """
+        Ejecuta una sentencia en la conexión del gestor.
+        """
+        with memory_manager.pool.connection() as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def fill(self, memory_manager) -> None:
+        """
+        Registros de dos días: tres sumas, una multiplicación y una
+        ecuación sin operador con resultado no numérico.
+        """
+        for equation, result in [("1 + 1", 2), ("2 + 3", 5), ("4 + 4", 8),
+                                 ("2 * 3", 6)]:
+            memory_manager.new_history(equation, Decimal(result))
+        memory_manager.new_history("√-1", Decimal("NaN"))
+        self.execute(memory_manager, """
+            UPDATE history_results SET CREATED_AT = '2024-01-01 10:00:00.000'
+            WHERE ID IN (1, 4)
+        """)
+        self.execute(memory_manager, """
+            UPDATE history_results SET CREATED_AT = '2024-01-02 09:30:00.000'
+            WHERE ID IN (2, 3, 5)
+        """)
+
+    def test_stats_by_day(self, memory_manager):
+        """
+        Verifica el resumen por día y operador.
+        """
+        self.fill(memory_manager)
+        assert memory_manager.stats() == [
+            DailyStats("2024-01-01", "*", 1, 1, 6.0, 6.0, 6.0),
+            DailyStats("2024-01-01", "+", 1, 1, 2.0, 2.0, 2.0),
+            DailyStats("2024-01-02", None, 1, 0, 0.0, None, None),
+            DailyStats("2024-01-02", "+", 2, 2, 13.0, 5.0, 8.0),
+        ]
+
+    def test_stats_filters(self, memory_manager):
+        """
+        Verifica los filtros por operador y fechas y los totales.
+        """
+        self.fill(memory_manager)
+        assert memory_manager.stats(operator="+", by_day=False) == [
+            DailyStats(None, "+", 3, 3, 15.0, 2.0, 8.0)]
+        assert [row.operator for row in memory_manager.stats(
+            start=date(2024, 1, 2))] == [None, "+"]
+        assert [row.day for row in memory_manager.stats(
+            operator="+", end="2024-01-01")] == ["2024-01-01"]
+
+    def test_stats_from_summary(self, memory_manager):
+        """
+        Verifica que ``stats`` lee el resumen y no ``history_results``.
+        """
+        self.fill(memory_manager)
+        expected = memory_manager.stats()
+        self.execute(memory_manager, "DROP TRIGGER history_stats_delete")
+        self.execute(memory_manager, "DELETE FROM history_results")
+        assert memory_manager.stats() == expected
+
+    def test_delete_updates_extremes(self, memory_manager):
+        """
+        Verifica que borrar el mínimo o el máximo de un grupo los recalcula.
+        """
+        self.fill(memory_manager)
+        self.execute(memory_manager,
+                     "DELETE FROM history_results WHERE ID = 3")
+        assert memory_manager.stats(operator="+", start="2024-01-02") == [
+            DailyStats("2024-01-02", "+", 1, 1, 5.0, 5.0, 5.0)]
+        self.execute(memory_manager,
+                     "DELETE FROM history_results WHERE ID = 2")
+        assert memory_manager.stats(start="2024-01-02") == [
+            DailyStats("2024-01-02", None, 1, 0, 0.0, None, None)]
+
+    def test_update_moves_group(self, memory_manager):
+        """
+        Verifica que cambiar la fecha de un registro lo cambia de grupo.
+        """
+        self.fill(memory_manager)
+        self.execute(memory_manager, """
+            UPDATE history_results SET CREATED_AT = '2024-01-01 23:59:59.999'
+            WHERE ID = 3
+        """)
+        assert memory_manager.stats(operator="+") == [
+            DailyStats("2024-01-01", "+", 2, 2, 10.0, 2.0, 8.0),
+            DailyStats("2024-01-02", "+", 1, 1, 5.0, 5.0, 5.0),
+        ]
+
+    def test_queued_and_deleted(self, memory_manager):
+        """
+        Verifica que el resumen incluye lo encolado y se vacía con
+        ``delete_history``.
+        """
+        memory_manager.queue_history("1 + 2", Decimal(3))
+        assert [row.count for row in memory_manager.stats()] == [1]
+        memory_manager.delete_history()
+        assert memory_manager.stats() == []
+
+    def test_rebuild_stats(self, memory_manager):
+        """
+        Verifica que ``rebuild_stats`` recalcula el resumen desde cero.
+        """
+        self.fill(memory_manager)
+        expected = memory_manager.stats()
+        self.execute(memory_manager, "DELETE FROM history_stats")
+        assert memory_manager.stats() == []
+        memory_manager.rebuild_stats()
+        assert memory_manager.stats() == expected
@@ -0,0 +1,137 @@
+# MODULO: test_history_worker.py
+"""
+Pruebas unitarias para HistoryWorker -> ui_history_worker.py.
+
+Miden la latencia entre pulsar "=" y mostrar el resultado con la base de
+datos ralentizada artificialmente. Requieren PyQt5.
+"""
+from decimal import Decimal
+import time
+import pytest
+
+QtCore = pytest.importorskip("PyQt5.QtCore")
+
+from database.history_db import HistoryEntry  # noqa: E402
+from src.ui.ui_buttons_creator import ButtonsCreator  # noqa: E402
+
+# Retardo simulado de cada operación de la base de datos (segundos).
+DB_DELAY = 0.5
+# Latencia máxima aceptable para mostrar el resultado (segundos).
+MAX_LATENCY = 0.1
+
+
+# -------------------------------------------------------- class -> MockDisplay
+class MockDisplay:
+    """
+    Mock simple para simular el comportamiento de un QLabel.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el mock con un texto vacío.
+        """
+        self.text = ""
+
+    def setText(self, text: str):
+        """
+        Simula el método setText de QLabel.
+        """
+        self.text = text
+
+
+class TestHistoryWorker:
+    """
+    Pruebas unitarias para HistoryWorker y su uso desde ButtonsCreator.
+    """
+
+    @pytest.fixture
+    def app(self):
+        """
+        Aplicación Qt mínima para entregar las señales.
+        """
+        return (QtCore.QCoreApplication.instance()
+                or QtCore.QCoreApplication([]))
+
+    @pytest.fixture
+    def slow_db(self, mocker, manager):
+        """
+        HistoryManager sobre un archivo temporal cuyas operaciones tardan
+        DB_DELAY segundos.
+        """
+        queue_history = manager.queue_history
+        get_last_records = manager.get_last_records
+
+        def slow_queue(*args):
+            time.sleep(DB_DELAY)
+            return queue_history(*args)
+
+        def slow_read(*args):
+            time.sleep(DB_DELAY)
+            return get_last_records(*args)
+
+        mocker.patch.object(manager, "queue_history", side_effect=slow_queue)
+        mocker.patch.object(manager, "get_last_records",
+                            side_effect=slow_read)
+        return manager
+
+    @pytest.fixture
+    def buttons(self, app, slow_db):
+        """
+        ButtonsCreator con pantallas simuladas.
+        """
+        return ButtonsCreator(None, MockDisplay(), MockDisplay(),
+                              MockDisplay(), MockDisplay())
+
+    def test_click_to_display_latency(self, app, buttons, slow_db):
+        """
+        Verifica que el resultado se muestra sin esperar a la base de datos
+        y que el registro se guarda después en el hilo de trabajo.
+        """
+        saved = []
+        buttons.history_worker.signals.saved.connect(saved.append)
+        buttons.insert_value("7")
+        buttons.insert_operator("*")
+        buttons.insert_value("6")
+
+        start = time.perf_counter()
+        buttons.calculate_result("=")
+        latency = time.perf_counter() - start
+
+        assert buttons.display_result.text == "42.00"
+        assert latency < MAX_LATENCY
+        assert buttons.history_worker.wait_for_done(5000)
+        app.processEvents()
+        assert saved == ["7 * 6"]
+        assert slow_db.queue_history.call_count == 1
+
+    def test_load_last_records_signal(self, app, buttons):
+        """
+        Verifica que la lectura no bloquea y entrega los registros con
+        records_loaded.
+        """
+        worker = buttons.history_worker
+        loaded = []
+        worker.signals.records_loaded.connect(loaded.append)
+        worker.save("2 + 2", Decimal(4))
+
+        start = time.perf_counter()
+        worker.load_last_records()
+        assert time.perf_counter() - start < MAX_LATENCY
+
+        assert worker.wait_for_done(5000)
+        app.processEvents()
+        assert loaded == [[HistoryEntry(1, "2 + 2", "4")]]
+
+    def test_failed_signal(self, app, buttons, mocker):
+        """
+        Verifica que un error de la tarea se entrega con failed.
+        """
+        worker = buttons.history_worker
+        errors = []
+        worker.signals.failed.connect(errors.append)
+        mocker.patch.object(worker.history_manager, "get_last_records",
+                            return_value=None)
+        worker.load_last_records()
+        assert worker.wait_for_done(5000)
+        app.processEvents()
+        assert errors == ["No se pudo leer el historial"]
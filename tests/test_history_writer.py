@@ -0,0 +1,101 @@
+# MODULO: test_history_writer.py
+"""
+Pruebas unitarias para la escritura por lotes -> history_writer.py.
+"""
+from decimal import Decimal
+import time
+import pytest
+from database.history_writer import HistoryWriter
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    """
+    Espera a que ``condition()`` sea verdadera o venza ``timeout``.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestHistoryWriter:
+    """
+    Pruebas unitarias para HistoryWriter: umbrales de tamaño y de tiempo,
+    escritura al cerrar y lectura de lo recién encolado.
+    """
+
+    def count(self, manager) -> int:
+        """
+        Registros escritos en la tabla.
+        """
+        with manager.pool.connection() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM history_results").fetchone()[0]
+
+    def test_batch_size_flush(self, manager, mocker):
+        """
+        Verifica que al llegar a batch_size se escribe un lote con una sola
+        llamada a insert_many.
+        """
+        spy = mocker.spy(manager, "insert_many")
+        writer = HistoryWriter(manager, batch_size=10, max_delay=60)
+        for index in range(10):
+            writer.append(f"{index} + 1", Decimal(index + 1))
+        assert wait_until(lambda: self.count(manager) == 10)
+        assert spy.call_count == 1
+        assert len(writer) == 0
+        writer.close()
+
+    def test_max_delay_flush(self, manager):
+        """
+        Verifica que un lote incompleto se escribe tras max_delay.
+        """
+        writer = HistoryWriter(manager, batch_size=100, max_delay=0.05)
+        writer.append("2 + 2", Decimal(4))
+        assert self.count(manager) == 0
+        assert wait_until(lambda: self.count(manager) == 1)
+        writer.close()
+
+    def test_close_flushes(self, manager):
+        """
+        Verifica que close escribe los registros pendientes.
+        """
+        writer = HistoryWriter(manager, batch_size=100, max_delay=60)
+        writer.append("2 * 3", Decimal(6))
+        writer.close()
+        assert self.count(manager) == 1
+        assert len(writer) == 0
+
+    def test_queue_history_read_your_writes(self, manager):
+        """
+        Verifica que get_last_records incluye lo encolado y que
+        delete_history descarta lo pendiente.
+        """
+        manager.queue_history("1 + 1", Decimal(2))
+        manager.queue_history("2 + 2", Decimal(4))
+        records = manager.get_last_records()
+        assert [row.equation for row in records] == ["2 + 2", "1 + 1"]
+        manager.queue_history("3 + 3", Decimal(6))
+        manager.delete_history()
+        assert manager.get_last_records() == []
+
+    def test_failed_write_is_requeued(self, manager, mocker):
+        """
+        Verifica que si insert_many falla, los registros vuelven a la cola.
+        """
+        writer = HistoryWriter(manager, batch_size=100, max_delay=60)
+        writer.append("1 / 3", Decimal("0.33"))
+        mocker.patch.object(manager, "insert_many", return_value=None)
+        assert writer.flush() == 0
+        assert len(writer) == 1
+        mocker.stopall()
+        assert writer.flush() == 1
+
+    def test_invalid_thresholds(self, manager):
+        """
+        Verifica que los umbrales deben ser positivos.
+        """
+        with pytest.raises(ValueError):
+            HistoryWriter(manager, batch_size=0)
@@ -0,0 +1,159 @@
+# MODULO: test_memo_store.py
+"""
+Pruebas unitarias para la clase MemoStore -> memo_store.py.
+"""
+import sqlite3
+from decimal import Decimal
+import pytest
+from core.calculator import Calculator
+from core.result_cache import ResultCache, cached_operation
+from database.history_manager_db import STORAGES
+from database.memo_store import MemoStore
+
+
+def key(number: int, precision=None) -> tuple:
+    """
+    Clave de prueba para la operación ``number / 3``.
+    """
+    return ResultCache().make_key(
+        "/", Decimal(number), Decimal(3), precision)
+
+
+class TestMemoStore:
+    """
+    Pruebas unitarias para el almacén persistente de resultados.
+    """
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        """
+        Ruta de una base de datos temporal para cada prueba.
+        """
+        return tmp_path / "memo.db"
+
+    def test_queries_stay_in_memory(self, db_path, mocker):
+        """
+        Verifica que crear el almacén, consultarlo y guardar en él no toca
+        la base de datos; solo load y flush lo hacen.
+        """
+        store = MemoStore(db_path)
+        connection = mocker.spy(store.pool, "connection")
+        store.put(key(1), Decimal(1))
+        assert store.get(key(1)) == Decimal(1)
+        assert store.get(key(2)) is None
+        assert connection.call_count == 0
+        assert not db_path.exists()
+        store.flush()
+        assert db_path.exists()
+
+    def test_preload_merges_with_memory(self, db_path):
+        """
+        Verifica que la carga en segundo plano añade los resultados del
+        disco sin pisar los de la sesión, que cuentan como más recientes.
+        """
+        first = MemoStore(db_path, max_entries=3)
+        for number in range(3):
+            first.put(key(number), Decimal(number))
+        first.close()
+
+        store = MemoStore(db_path, max_entries=3)
+        store.put(key(2), Decimal(20))
+        store.put(key(3), Decimal(3))
+        store.preload().join()
+        assert store.load() == 0
+        assert len(store) == 3
+        assert store.get(key(0)) is None
+        assert [store.get(key(n)) for n in (1, 2, 3)] == [
+            Decimal(1), Decimal(20), Decimal(3)]
+
+    def test_results_survive_restart(self, db_path):
+        """
+        Verifica que los resultados guardados se leen en otra instancia,
+        con su exponente y su signo.
+        """
+        store = MemoStore(db_path)
+        store.put(key(1), Decimal("0.3333"))
+        store.put(key(2, precision=50), Decimal("-0.00"))
+        assert store.flush() == 2
+        assert store.flush() == 0
+
+        restarted = MemoStore(db_path)
+        assert restarted.get(key(1)) is None
+        assert restarted.load() == 2
+        assert str(restarted.get(key(1))) == "0.3333"
+        assert str(restarted.get(key(2, precision=50))) == "-0.00"
+        assert restarted.get(key(2)) is None
+
+    def test_size_cap(self, db_path):
+        """
+        Verifica que el límite desaloja los resultados usados hace más
+        tiempo, en memoria y en disco.
+        """
+        store = MemoStore(db_path, max_entries=3)
+        for number in range(5):
+            store.put(key(number), Decimal(number))
+        store.get(key(2))
+        store.put(key(5), Decimal(5))
+        store.flush()
+
+        with sqlite3.connect(db_path) as connection:
+            rows = connection.execute(
+                "SELECT COUNT(*) FROM memo_results").fetchone()[0]
+        assert rows == 3
+        restarted = MemoStore(db_path, max_entries=3)
+        restarted.load()
+        assert restarted.get(key(3)) is None
+        assert [restarted.get(key(n)) for n in (2, 4, 5)] == [
+            Decimal(2), Decimal(4), Decimal(5)]
+
+    def test_warm_start_result_cache(self, db_path):
+        """
+        Verifica que una caché vacía con el almacén conectado resuelve las
+        operaciones de una ejecución anterior sin calcularlas.
+        """
+        calls = []
+
+        def divide(value_1, value_2, precision=None):
+            calls.append((value_1, value_2))
+            return Calculator.divide.__wrapped__(value_1, value_2, precision)
+
+        first_run = ResultCache()
+        first_run.attach_store(MemoStore(db_path))
+        cached_operation("/", first_run)(divide)(Decimal(1), Decimal(3))
+        first_run.store.flush()
+
+        second_run = ResultCache()
+        second_run.attach_store(MemoStore(db_path))
+        second_run.store.load()
+        result = cached_operation("/", second_run)(divide)(
+            Decimal(1), Decimal(3))
+        assert result == Calculator.divide(Decimal(1), Decimal(3))
+        assert len(calls) == 1
+        assert second_run.stats().hits == 1
+        assert len(second_run) == 1
+
+    @pytest.mark.parametrize("storage", STORAGES)
+    def test_history_storage(self, storage, open_manager, tmp_path):
+        """
+        Verifica que el almacén sin ruta comparte la base de datos del
+        historial con SQLite y queda en memoria, sin tocar la base de
+        datos, con los demás backends. Cerrar el almacén no cierra las
+        conexiones del historial.
+        """
+        manager = open_manager(storage)
+        store = MemoStore()
+        store.put(key(1), Decimal("0.3333"))
+        assert store.get(key(1)) == Decimal("0.3333")
+        store.close()
+        if manager.pool is not None:
+            assert len(manager.pool) == 1
+        restarted = MemoStore()
+        restarted.load()
+        if storage == "sqlite":
+            assert restarted.get(key(1)) == Decimal("0.3333")
+        else:
+            assert restarted.db_path is None
+            assert restarted.get(key(1)) is None
+            assert list(tmp_path.glob("history.db*")) == []
+        restarted.clear()
+        assert len(restarted) == 0
@@ -0,0 +1,161 @@
+# MODULO: test_migrations.py
+"""
+Pruebas unitarias para las migraciones del historial -> migrations.py.
+"""
+from decimal import Decimal
+import sqlite3
+import pytest
+from database import migrations
+
+LEGACY_ROWS = [
+    ("2 + 3", "5.00"),
+    ("-1.5 * 4", "-6.00"),
+    ("10 / 0", "Infinity"),
+    ("texto libre", "abc"),
+    ("7 % 50", "3.50"),
+]
+
+
+def columns(connection) -> set:
+    """
+    Columnas de history_results.
+    """
+    return {row[1] for row in
+            connection.execute("PRAGMA table_info(history_results)")}
+
+
+def query_plan(connection, sql: str, params=()) -> str:
+    """
+    Plan de consulta de SQLite en una sola cadena.
+    """
+    return " ".join(row[-1] for row in connection.execute(
+        f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+class TestMigrations:
+    """
+    Pruebas unitarias para las migraciones versionadas con
+    PRAGMA user_version.
+    """
+
+    @pytest.fixture
+    def legacy(self):
+        """
+        Base de datos en memoria con el esquema original (versión 0).
+        """
+        connection = sqlite3.connect(":memory:")
+        connection.execute("""
+            CREATE TABLE history_results (
+                ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                EQUATION CHAR(50),
+                RESULT CHAR(50)
+            );
+        """)
+        connection.executemany(
+            "INSERT INTO history_results (EQUATION, RESULT) VALUES (?,?)",
+            LEGACY_ROWS)
+        connection.commit()
+        yield connection
+        connection.close()
+
+    def test_new_database(self):
+        """
+        Verifica que una base de datos nueva queda en la última versión.
+        """
+        connection = sqlite3.connect(":memory:")
+        assert migrations.migrate(connection) == migrations.LATEST_VERSION
+        assert migrations.schema_version(connection) == \
+            migrations.LATEST_VERSION
+        assert {"CREATED_AT", "OPERATOR", "OPERAND_1", "OPERAND_2",
+                "RESULT_NUM", "RESULT_COEF", "RESULT_EXP", "OPERAND_1_COEF",
+                "OPERAND_1_EXP", "OPERAND_2_COEF",
+                "OPERAND_2_EXP"} <= columns(connection)
+
+    def test_legacy_backfill_in_batches(self, legacy):
+        """
+        Verifica que las filas existentes se completan por lotes y que
+        las filas sin formato reconocible quedan en NULL.
+        """
+        migrations.migrate(legacy, batch_size=2)
+        rows = legacy.execute("""
+            SELECT EQUATION, RESULT, OPERATOR, OPERAND_1, OPERAND_2,
+                   RESULT_NUM, CREATED_AT
+            FROM history_results ORDER BY ID
+        """).fetchall()
+        assert rows == [
+            ("2 + 3", "5.00", "+", 2.0, 3.0, 5.0, None),
+            ("-1.5 * 4", "-6.00", "*", -1.5, 4.0, -6.0, None),
+            ("10 / 0", "Infinity", "/", 10.0, 0.0, None, None),
+            ("texto libre", "abc", None, None, None, None, None),
+            ("7 % 50", "3.50", "%", 7.0, 50.0, 3.5, None),
+        ]
+        encoded = legacy.execute("""
+            SELECT RESULT_COEF, RESULT_EXP, OPERAND_1_COEF, OPERAND_1_EXP,
+                   OPERAND_2_COEF, OPERAND_2_EXP
+            FROM history_results ORDER BY ID
+        """).fetchall()
+        assert encoded == [
+            (500, -2, 2, 0, 3, 0),
+            (-600, -2, -15, -1, 4, 0),
+            (None, None, 10, 0, 0, 0),
+            (None, None, None, None, None, None),
+            (350, -2, 7, 0, 50, 0),
+        ]
+        # El resumen de v6 incluye las filas migradas (sin fecha).
+        assert legacy.execute("""
+            SELECT DAY, OPERATOR, COUNT, RESULT_SUM FROM history_stats
+            ORDER BY OPERATOR
+        """).fetchall() == [("", "", 1, 0.0), ("", "%", 1, 3.5),
+                            ("", "*", 1, -6.0), ("", "+", 1, 5.0),
+                            ("", "/", 1, 0.0)]
+
+    def test_interrupted_migration_resumes(self, legacy):
+        """
+        Verifica que una migración interrumpida se retoma.
+        """
+        migrations.migrate(legacy, target=1)
+        legacy.execute("ALTER TABLE history_results ADD COLUMN OPERATOR TEXT")
+        legacy.commit()
+        assert migrations.migrate(legacy) == migrations.LATEST_VERSION
+        assert legacy.execute(
+            "SELECT COUNT(*) FROM history_results WHERE OPERATOR IS NOT NULL"
+        ).fetchone()[0] == 4
+        # Ejecutarla de nuevo no cambia nada.
+        assert migrations.migrate(legacy) == migrations.LATEST_VERSION
+
+    def test_unknown_version(self):
+        """
+        Verifica que no se toca una base de datos de una versión futura.
+        """
+        connection = sqlite3.connect(":memory:")
+        connection.execute(
+            f"PRAGMA user_version = {migrations.LATEST_VERSION + 1}")
+        with pytest.raises(ValueError, match="Versión de esquema"):
+            migrations.migrate(connection)
+
+    def test_history_manager_fills_columns(self, memory_manager):
+        """
+        Verifica que los registros nuevos guardan fecha y columnas
+        numéricas, y que las consultas por fecha y por operador usan los
+        índices.
+        """
+        manager = memory_manager
+        manager.new_history("6 / 4", Decimal("1.50"))
+        manager.queue_history("2 - 3", Decimal("-1.00"))
+        manager.writer.flush()
+        connection = manager.pool.connection()
+        rows = connection.execute("""
+            SELECT OPERATOR, OPERAND_1, OPERAND_2, RESULT_NUM, CREATED_AT
+            FROM history_results ORDER BY ID
+        """).fetchall()
+        assert [row[:4] for row in rows] == [("/", 6.0, 4.0, 1.5),
+                                             ("-", 2.0, 3.0, -1.0)]
+        assert all(row[4] is not None for row in rows)
+        assert "history_results_operator" in query_plan(
+            connection,
+            "SELECT * FROM history_results WHERE OPERATOR = ? "
+            "AND CREATED_AT >= ?", ("+", "2024-01-01"))
+        assert "history_results_created_at" in query_plan(
+            connection,
+            "SELECT * FROM history_results WHERE CREATED_AT BETWEEN ? AND ?",
+            ("2024-01-01", "2024-02-01"))
@@ -0,0 +1,179 @@
+# MODULO: test_recent_history.py
+"""
+Pruebas unitarias para los registros recientes en memoria ->
+recent_history.py y su uso en HistoryManager.get_last_records.
+"""
+from decimal import Decimal
+import sqlite3
+import threading
+import pytest
+
+
+class TestRecentHistory:
+    """
+    Pruebas del búfer circular: lecturas desde memoria, coherencia con
+    delete_history y con escrituras de otras conexiones.
+    """
+
+    @pytest.fixture
+    def other(self, manager):
+        """
+        Conexión independiente, como la de otro proceso.
+        """
+        connection = sqlite3.connect(manager.db_path)
+        yield connection
+        connection.close()
+
+    def equations(self, records) -> list:
+        """
+        Ecuaciones de una lista de registros.
+        """
+        return [record.equation for record in records]
+
+    def test_reads_from_memory_after_write(self, manager, mocker):
+        """
+        Verifica que, tras la primera lectura, las escrituras propias se
+        leen sin consultar la base de datos.
+        """
+        manager.new_history("1 + 1", Decimal(2))
+        spy = mocker.spy(manager.backend, "read_last")
+        assert self.equations(manager.get_last_records()) == ["1 + 1"]
+        assert spy.call_count == 1
+
+        manager.new_history("2 + 2", Decimal(4))
+        manager.queue_history("3 + 3", Decimal(6))
+        records = manager.get_last_records(2)
+        assert self.equations(records) == ["3 + 3", "2 + 2"]
+        assert spy.call_count == 1
+
+        # Los registros devueltos son inmutables: no alteran el búfer.
+        with pytest.raises(AttributeError):
+            records[0].equation = "modificado"
+        assert manager.get_last_records(1)[0].equation == "3 + 3"
+
+    def test_ring_buffer_is_bounded(self, manager, mocker):
+        """
+        Verifica el límite del búfer y que un limit mayor lee de disco.
+        """
+        manager.recent.maxlen = 3
+        manager.get_last_records()
+        for i in range(5):
+            manager.new_history(f"{i} + 0", Decimal(i))
+        assert len(manager.recent) == 3
+
+        spy = mocker.spy(manager.backend, "read_last")
+        assert self.equations(manager.get_last_records(3)) == \
+            ["4 + 0", "3 + 0", "2 + 0"]
+        assert spy.call_count == 0
+        assert len(manager.get_last_records(10)) == 5
+        assert spy.call_count == 1
+
+    @pytest.mark.parametrize("storage", ["sqlite", "memory"])
+    def test_negative_limit_reads_all(self, open_manager, storage):
+        """
+        Verifica que un limit negativo devuelve todos los registros, como
+        ``LIMIT -1``, esté o no completo el búfer.
+        """
+        manager = open_manager(storage)
+        manager.recent.maxlen = 3
+        for i in range(5):
+            manager.new_history(f"{i} + 0", Decimal(i))
+        assert len(manager.get_last_records(-1)) == 5
+
+        manager.recent.maxlen = 10
+        manager.recent.invalidate()
+        assert self.equations(manager.get_last_records(-1)) == \
+            [f"{i} + 0" for i in reversed(range(5))]
+
+    def test_delete_history(self, manager, mocker):
+        """
+        Verifica que delete_history vacía el búfer.
+        """
+        manager.new_history("1 + 1", Decimal(2))
+        manager.get_last_records()
+        manager.delete_history()
+        spy = mocker.spy(manager.backend, "read_last")
+        assert manager.get_last_records() == []
+        manager.new_history("5 + 5", Decimal(10))
+        assert self.equations(manager.get_last_records()) == ["5 + 5"]
+        assert spy.call_count == 0
+
+    def test_external_write_invalidates(self, manager, other):
+        """
+        Verifica que una escritura de otra conexión (data_version) recarga
+        el búfer, también si ocurre entre dos escrituras propias.
+        """
+        manager.new_history("1 + 1", Decimal(2))
+        manager.get_last_records()
+        with other:
+            other.execute("INSERT INTO history_results (EQUATION, RESULT) "
+                          "VALUES ('externa', '0')")
+        assert self.equations(manager.get_last_records()) == \
+            ["externa", "1 + 1"]
+
+        with other:
+            other.execute("INSERT INTO history_results (EQUATION, RESULT) "
+                          "VALUES ('externa 2', '0')")
+        manager.new_history("2 + 2", Decimal(4))
+        assert self.equations(manager.get_last_records()) == \
+            ["2 + 2", "externa 2", "externa", "1 + 1"]
+
+        with other:
+            other.execute("DELETE FROM history_results")
+        assert manager.get_last_records() == []
+
+    def test_external_write_during_write(self, manager, other, mocker):
+        """
+        Verifica que una escritura de otra conexión confirmada durante una
+        escritura propia (sin cambiar data_version antes) no se pierde.
+        """
+        manager.new_history("1 + 1", Decimal(2))
+        manager.get_last_records()
+        insert = manager.backend.insert
+
+        def insert_with_external(rows):
+            with other:
+                other.execute("INSERT INTO history_results "
+                              "(EQUATION, RESULT) VALUES ('9 + 9', '18')")
+            return insert(rows)
+
+        mocker.patch.object(manager.backend, "insert",
+                            side_effect=insert_with_external)
+        manager.new_history("2 + 2", Decimal(4))
+        assert self.equations(manager.get_last_records()) == \
+            ["2 + 2", "9 + 9", "1 + 1"]
+
+        # También si la otra conexión escribe justo después.
+        def insert_then_external(rows):
+            last_id = insert(rows)
+            with other:
+                other.execute("INSERT INTO history_results "
+                              "(EQUATION, RESULT) VALUES ('8 + 8', '16')")
+            return last_id
+
+        manager.backend.insert.side_effect = insert_then_external
+        manager.new_history("3 + 3", Decimal(6))
+        assert self.equations(manager.get_last_records(2)) == \
+            ["8 + 8", "3 + 3"]
+
+    def test_concurrent_writes(self, manager):
+        """
+        Verifica que el búfer coincide con la base de datos tras
+        escrituras desde varios hilos.
+        """
+        manager.get_last_records()
+
+        def write(thread: int) -> None:
+            for i in range(20):
+                manager.new_history(f"{thread} + {i}", Decimal(thread + i))
+
+        threads = [threading.Thread(target=write, args=(n,))
+                   for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        from_memory = manager.get_last_records(50)
+        from_disk = manager.backend.read_last(50)
+        assert from_memory == from_disk
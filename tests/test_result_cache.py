@@ -0,0 +1,170 @@
+# MODULO: test_result_cache.py
+"""
+Pruebas unitarias para la clase ResultCache -> result_cache.py.
+"""
+from decimal import Decimal
+import pytest
+from core.calculator import Calculator
+from core.result_cache import ResultCache, cached_operation
+
+
+def key(number: int) -> tuple:
+    """
+    Clave de prueba para la operación ``number + 0``.
+    """
+    return ResultCache().make_key("+", Decimal(number), Decimal(0))
+
+
+class TestResultCache:
+    """
+    Pruebas unitarias para la caché compartida de resultados.
+    """
+
+    @pytest.fixture
+    def shared_cache(self):
+        """
+        Vacía la caché compartida de Calculator antes de cada prueba.
+        """
+        Calculator.result_cache.clear()
+        Calculator.result_cache.reset_stats()
+        return Calculator.result_cache
+
+    def test_keys_keep_exponent(self, shared_cache):
+        """
+        Verifica que ``2.50`` y ``2.5`` no comparten entrada.
+        """
+        first = Calculator.add(Decimal('2.50'), Decimal('1.5'))
+        second = Calculator.add(Decimal('2.5'), Decimal('1.5'))
+        assert str(first) == "4.00"
+        assert str(second) == "4.0"
+        assert shared_cache.stats().misses == 2
+
+    def test_keys_keep_zero_sign(self, shared_cache):
+        """
+        Verifica que ``-0`` y ``0`` no comparten entrada.
+        """
+        Calculator.multiply(Decimal('0.0'), Decimal('3'))
+        assert str(Calculator.multiply(Decimal('-0.0'), Decimal('3'))) \
+            == "-0.0"
+
+    def test_counters(self, shared_cache):
+        """
+        Verifica los contadores de aciertos y fallos.
+        """
+        for _ in range(3):
+            Calculator.divide(Decimal('10'), Decimal('4'))
+        stats = shared_cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (2, 1, 1)
+        assert stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_commutative_keys(self, shared_cache):
+        """
+        Verifica que ``a+b`` y ``b+a`` comparten entrada y ``a-b`` no.
+        """
+        Calculator.add(Decimal('1.5'), Decimal('2'))
+        Calculator.add(Decimal('2'), Decimal('1.5'))
+        Calculator.multiply(Decimal('-0.0'), Decimal('3'))
+        assert str(Calculator.multiply(Decimal('3'), Decimal('-0.0'))) \
+            == "-0.0"
+        Calculator.subtract(Decimal('1.5'), Decimal('2'))
+        assert Calculator.subtract(Decimal('2'), Decimal('1.5')) \
+            == Decimal('0.5')
+        stats = shared_cache.stats()
+        assert (stats.hits, stats.entries) == (2, 4)
+
+    def test_commutative_normalization_can_be_disabled(self):
+        """
+        Verifica que sin normalización el orden forma parte de la clave.
+        """
+        cache = ResultCache(normalize_commutative=False)
+        assert cache.make_key("+", Decimal(1), Decimal(2)) \
+            != cache.make_key("+", Decimal(2), Decimal(1))
+
+    def test_errors_are_not_cached(self, shared_cache):
+        """
+        Verifica que una división por cero no se guarda en la caché.
+        """
+        with pytest.raises(ZeroDivisionError):
+            Calculator.divide(Decimal('1'), Decimal('0'))
+        assert len(shared_cache) == 0
+
+    @pytest.mark.parametrize("policy, survivor, evicted", [
+        ("lru", 1, 2),
+        ("fifo", 2, 1),
+        ("lfu", 1, 2),
+    ])
+    def test_eviction_policies(self, policy, survivor, evicted):
+        """
+        Verifica qué entrada se desaloja con cada política.
+        """
+        cache = ResultCache(max_entries=2, policy=policy)
+        cache.put(key(1), Decimal(1))
+        cache.put(key(2), Decimal(2))
+        cache.get(key(1))
+        cache.put(key(3), Decimal(3))
+
+        assert cache.get(key(survivor)) is not None
+        assert cache.get(key(evicted)) is None
+        assert cache.stats().evictions == 1
+
+    def test_lfu_frequency_order(self):
+        """
+        Verifica que LFU desaloja por frecuencia y, a igualdad, la más
+        antigua, también tras cambiar de política.
+        """
+        cache = ResultCache(max_entries=3, policy="lfu")
+        for number in range(3):
+            cache.put(key(number), Decimal(number))
+        for _ in range(2):
+            cache.get(key(0))
+        cache.get(key(1))
+        cache.put(key(3), Decimal(3))
+        assert cache.get(key(2)) is None
+        cache.put(key(4), Decimal(4))
+        assert cache.get(key(3)) is None
+        assert all(cache.get(key(number)) is not None
+                   for number in (0, 1, 4))
+
+        cache.configure(policy="lru")
+        cache.configure(policy="lfu", max_entries=2)
+        assert len(cache) == 2
+        assert cache.get(key(0)) is None
+
+    def test_byte_limit(self):
+        """
+        Verifica que el límite en bytes desaloja y descarta valores enormes.
+        """
+        cache = ResultCache(max_bytes=2000)
+        huge = Decimal("1" + "0" * 5000 + "1")
+        cache.put(cache.make_key("+", huge, huge), huge + huge)
+        assert len(cache) == 0
+
+        for number in range(20):
+            cache.put(key(number), Decimal(number))
+        assert cache.stats().bytes <= 2000
+        assert cache.stats().evictions > 0
+
+    def test_configure_shrinks_cache(self):
+        """
+        Verifica que reducir los límites en caliente desaloja entradas.
+        """
+        cache = ResultCache()
+        for number in range(10):
+            cache.put(key(number), Decimal(number))
+        cache.configure(max_entries=3)
+        assert len(cache) == 3
+        with pytest.raises(ValueError, match="Política de caché"):
+            cache.configure(policy="random")
+
+    def test_non_decimal_operands_bypass_cache(self):
+        """
+        Verifica que los operandos que no son Decimal no se cachean.
+        """
+        cache = ResultCache()
+
+        @cached_operation("+", cache)
+        def add(value_1, value_2, precision=None):
+            return value_1 + value_2
+
+        assert add(2, 3) == 5
+        assert len(cache) == 0
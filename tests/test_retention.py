@@ -0,0 +1,165 @@
+# MODULO: test_retention.py
+"""
+Pruebas unitarias para la retención del historial -> retention.py y
+HistoryManager.prune/housekeeping.
+"""
+from decimal import Decimal
+import time
+import pydantic
+import pytest
+from database.history_writer import HistoryWriter
+from database.retention import RetentionPolicy
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    """
+    Espera a que ``condition()`` sea verdadera o venza ``timeout``.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestRetention:
+    """
+    Pruebas de la poda por número, antigüedad y tamaño, del vacuum
+    incremental y del mantenimiento en el hilo de escritura.
+    """
+
+    def fill(self, manager, count: int) -> None:
+        """
+        Inserta ``count`` registros ``"n + 0"``.
+        """
+        manager.insert_many([
+            (f"{n} + 0", str(n), "+", n, 0.0, n, n, 0, n, 0, 0, 0)
+            for n in range(count)])
+
+    def ids(self, manager) -> list:
+        """
+        IDs de la tabla, en orden.
+        """
+        with manager.pool.connection() as connection:
+            return [row[0] for row in connection.execute(
+                "SELECT ID FROM history_results ORDER BY ID")]
+
+    def pragma(self, manager, name: str) -> int:
+        """
+        Valor de un PRAGMA numérico.
+        """
+        with manager.pool.connection() as connection:
+            return connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_policy_validation(self):
+        """
+        Verifica que los límites deben ser positivos.
+        """
+        with pytest.raises(pydantic.ValidationError):
+            RetentionPolicy(max_rows=0)
+        with pytest.raises(pydantic.ValidationError):
+            RetentionPolicy(batch_size=-1)
+        assert RetentionPolicy().max_rows is None
+
+    def test_prune_without_policy(self, manager):
+        """
+        Verifica que sin política no se borra nada.
+        """
+        self.fill(manager, 5)
+        assert manager.prune() == 0
+        assert manager.housekeeping() is False
+        assert len(self.ids(manager)) == 5
+
+    def test_prune_max_rows(self, manager):
+        """
+        Verifica que se conservan los ``max_rows`` registros más recientes.
+        """
+        self.fill(manager, 30)
+        assert manager.prune(RetentionPolicy(max_rows=10)) == 20
+        assert self.ids(manager) == list(range(21, 31))
+        assert manager.prune(RetentionPolicy(max_rows=10)) == 0
+
+    def test_prune_in_batches(self, manager, mocker):
+        """
+        Verifica que cada lote borra como mucho ``batch_size`` registros y
+        que ``max_batches`` limita el trabajo.
+        """
+        self.fill(manager, 30)
+        spy = mocker.spy(manager.backend, "prune_batch")
+        policy = RetentionPolicy(max_rows=5, batch_size=7)
+        assert manager.prune(policy, max_batches=2) == 14
+        assert spy.spy_return == 7
+        assert manager.prune(policy) == 11
+        assert len(self.ids(manager)) == 5
+
+    def test_prune_max_age(self, manager):
+        """
+        Verifica que se borran los registros caducados y no los migrados
+        sin fecha.
+        """
+        self.fill(manager, 6)
+        with manager.pool.connection() as connection:
+            connection.execute("""
+                UPDATE history_results
+                SET CREATED_AT = datetime('now', '-10 days') WHERE ID <= 3
+            """)
+            connection.execute(
+                "UPDATE history_results SET CREATED_AT = NULL WHERE ID = 4")
+        assert manager.prune(RetentionPolicy(max_age_days=1)) == 3
+        assert self.ids(manager) == [4, 5, 6]
+
+    def test_prune_max_bytes_and_vacuum(self, manager):
+        """
+        Verifica que la base de datos usa ``auto_vacuum=INCREMENTAL`` y que
+        la poda por tamaño devuelve las páginas libres.
+        """
+        assert self.pragma(manager, "auto_vacuum") == 2
+        self.fill(manager, 5000)
+        page_size = self.pragma(manager, "page_size")
+        before = self.pragma(manager, "page_count")
+        max_bytes = before * page_size // 2
+        deleted = manager.prune(RetentionPolicy(max_bytes=max_bytes))
+        assert 0 < deleted < 5000
+        after = self.pragma(manager, "page_count")
+        assert after * page_size <= max_bytes
+        assert self.pragma(manager, "freelist_count") == 0
+
+    def test_prune_refreshes_recent(self, manager):
+        """
+        Verifica que los registros en memoria no muestran los podados.
+        """
+        self.fill(manager, 10)
+        assert len(manager.get_last_records(50)) == 10
+        manager.prune(RetentionPolicy(max_rows=3))
+        assert len(manager.get_last_records(50)) == 3
+
+    def test_idle_housekeeping(self, manager, mocker):
+        """
+        Verifica que el hilo de escritura aplica la política cuando lleva
+        ``idle_delay`` segundos inactivo, lote a lote.
+        """
+        manager.writer.close()
+        manager.writer = HistoryWriter(manager, idle_delay=0.05)
+        spy = mocker.spy(manager, "housekeeping")
+        self.fill(manager, 40)
+        manager.set_retention(RetentionPolicy(max_rows=4, batch_size=10))
+        assert wait_until(lambda: len(self.ids(manager)) == 4)
+        assert spy.call_count >= 4
+        # Sin trabajo pendiente, el hilo deja de hacer mantenimiento.
+        assert wait_until(lambda: not manager.writer._idle_work)
+        calls = spy.call_count
+        time.sleep(0.2)
+        assert spy.call_count == calls
+
+    def test_idle_housekeeping_after_writes(self, manager):
+        """
+        Verifica que las escrituras encoladas reanudan el mantenimiento.
+        """
+        manager.writer.close()
+        manager.writer = HistoryWriter(
+            manager, max_delay=0.01, idle_delay=0.05)
+        manager.retention = RetentionPolicy(max_rows=2)
+        for n in range(5):
+            manager.queue_history(f"{n} + 0", Decimal(n))
+        assert wait_until(lambda: len(self.ids(manager)) == 2)
@@ -0,0 +1,120 @@
+# MODULO: test_search_history.py
+"""
+Pruebas unitarias para la búsqueda en el historial ->
+HistoryManager.search_history y el índice FTS5 de migrations.py.
+"""
+from decimal import Decimal
+import time
+import pytest
+from database import history_manager_db
+
+EQUATIONS = [
+    ("100 * 1.16", "116.00"),
+    ("250 % 20", "50.00"),
+    ("3 + 4", "7.00"),
+    ("2000 * 1.16", "2320.00"),
+    ("250 / 5", "50.00"),
+    ("1.5 - 0.5", "1.00"),
+]
+
+
+class TestSearchHistory:
+    """
+    Pruebas de búsqueda por fragmento y por rango de resultado.
+    """
+
+    @pytest.fixture
+    def manager(self, memory_manager):
+        """
+        HistoryManager en memoria con algunas ecuaciones.
+        """
+        for equation, result in EQUATIONS:
+            memory_manager.new_history(equation, Decimal(result))
+        return memory_manager
+
+    def equations(self, records) -> list:
+        """
+        Ecuaciones de una lista de registros.
+        """
+        return [record.equation for record in records]
+
+    def test_fragment_search(self, manager):
+        """
+        Verifica la búsqueda de fragmentos con operadores y números.
+        """
+        assert sorted(self.equations(manager.search_history("* 1.16"))) == \
+            ["100 * 1.16", "2000 * 1.16"]
+        assert self.equations(manager.search_history("250 %")) == \
+            ["250 % 20"]
+        assert manager.search_history("no existe") == []
+
+    def test_short_fragment_and_limit(self, manager):
+        """
+        Verifica los fragmentos de menos de 3 caracteres (LIKE), que los
+        comodines de LIKE se buscan literalmente y el límite.
+        """
+        assert self.equations(manager.search_history("%")) == ["250 % 20"]
+        assert self.equations(manager.search_history("/")) == ["250 / 5"]
+        assert len(manager.search_history("", limit=4)) == 4
+        assert self.equations(manager.search_history("", limit=1)) == \
+            ["1.5 - 0.5"]
+
+    def test_result_range(self, manager):
+        """
+        Verifica el filtro por rango del resultado, con extremos exactos.
+        """
+        assert sorted(self.equations(manager.search_history(
+            "250", low=Decimal(50), high=Decimal(50)))) == \
+            ["250 % 20", "250 / 5"]
+        assert self.equations(manager.search_history(
+            "1.16", low=Decimal("116.01"))) == ["2000 * 1.16"]
+        assert sorted(self.equations(manager.search_history(
+            high=Decimal(7)))) == ["1.5 - 0.5", "3 + 4"]
+
+    def test_index_follows_changes(self, manager):
+        """
+        Verifica que los disparadores mantienen el índice al insertar,
+        actualizar y borrar.
+        """
+        manager.queue_history("42 * 1.16", Decimal("48.72"))
+        assert "42 * 1.16" in self.equations(manager.search_history("1.16"))
+        with manager.pool.connection() as connection:
+            connection.execute(
+                "UPDATE history_results SET EQUATION = '3 + 5' "
+                "WHERE EQUATION = '3 + 4'")
+        assert manager.search_history("3 + 4") == []
+        assert self.equations(manager.search_history("3 + 5")) == ["3 + 5"]
+        manager.delete_history()
+        assert manager.search_history("1.16") == []
+
+    def test_like_fallback(self, manager, mocker):
+        """
+        Verifica que sin FTS5 la búsqueda da los mismos resultados.
+        """
+        expected = sorted(self.equations(manager.search_history("* 1.16")))
+        mocker.patch.object(history_manager_db, "has_full_text_index",
+                            return_value=False)
+        assert sorted(self.equations(manager.search_history("* 1.16"))) == \
+            expected
+
+    def test_search_is_fast_on_large_history(self, manager):
+        """
+        Verifica que buscar un fragmento en 200 000 registros tarda
+        milisegundos.
+        """
+        with manager.pool.connection() as connection:
+            connection.execute("""
+                WITH RECURSIVE n(i) AS (
+                    SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 200000
+                )
+                INSERT INTO history_results (EQUATION, RESULT, RESULT_NUM)
+                SELECT i || ' + ' || (i % 97), CAST(i + i % 97 AS TEXT),
+                       i + i % 97
+                FROM n
+            """)
+        start = time.perf_counter()
+        records = manager.search_history("12345 +")
+        elapsed = time.perf_counter() - start
+        assert sorted(record.equation for record in records) == \
+            ["112345 + 19", "12345 + 26"]
+        assert elapsed < 0.1
@@ -0,0 +1,134 @@
+# MODULO: test_transcendental.py
+"""
+Pruebas unitarias para las funciones trascendentes -> transcendental.py.
+"""
+from decimal import Context, Decimal
+import pytest
+from core import transcendental
+from core.calculator import Calculator
+
+# Por encima de LIBMPDEC_PRECISION se usan los algoritmos propios.
+HIGH = transcendental.LIBMPDEC_PRECISION + 100
+
+PI_50 = "3.1415926535897932384626433832795028841971693993751"
+
+
+def reference(precision: int) -> Context:
+    """
+    Contexto de referencia con más dígitos que la prueba.
+    """
+    return Context(prec=precision + 20)
+
+
+def assert_close(result: Decimal, expected: Decimal, precision: int) -> None:
+    """
+    Verifica que el error relativo no supera una unidad en la última cifra.
+    """
+    error = abs(result - expected) / abs(expected)
+    assert error <= Decimal(10) ** (1 - precision)
+    assert len(result.as_tuple().digits) <= precision
+
+
+class TestTranscendental:
+    """
+    Pruebas unitarias para raíz, potencia, exponencial, logaritmos y
+    trigonometría con precisión arbitraria.
+    """
+
+    def test_constants(self):
+        """
+        Verifica las constantes y que se calculan una vez por precisión.
+        """
+        assert str(transcendental.pi(50)) == PI_50
+        assert transcendental.pi(50) is transcendental.pi(50)
+        assert transcendental.ln2(HIGH) == Context(prec=HIGH).ln(2)
+        assert transcendental.ln10(HIGH) == Context(prec=HIGH).ln(10)
+
+    @pytest.mark.parametrize("name", ["exp", "ln", "log10"])
+    def test_default_precision_matches_decimal(self, name):
+        """
+        Verifica que a 28 dígitos se obtiene el resultado de decimal.
+        """
+        value = Decimal("2.5")
+        expected = getattr(Context(prec=28), name)(value)
+        assert getattr(Calculator, name)(value) == expected
+
+    @pytest.mark.parametrize("value", ["0.5", "-3.7", "123.456", "1E-30"])
+    def test_exp_high_precision(self, value):
+        """
+        Verifica la exponencial por encima de LIBMPDEC_PRECISION.
+        """
+        value = Decimal(value)
+        expected = reference(HIGH).exp(value)
+        assert_close(transcendental.exp(value, HIGH), expected, HIGH)
+
+    @pytest.mark.parametrize("value", ["0.5", "1.0000000001", "7E+5"])
+    def test_logarithms_high_precision(self, value):
+        """
+        Verifica ln y log10 por encima de LIBMPDEC_PRECISION.
+        """
+        value = Decimal(value)
+        assert_close(transcendental.ln(value, HIGH),
+                     reference(HIGH).ln(value), HIGH)
+        assert_close(transcendental.log10(value, HIGH),
+                     reference(HIGH).log10(value), HIGH)
+
+    def test_log10_of_power_of_ten_is_exact(self):
+        """
+        Verifica que log10 de una potencia de 10 es un entero exacto.
+        """
+        assert transcendental.log10(Decimal("1000"), HIGH) == 3
+        assert transcendental.log10(Decimal("0.01"), HIGH) == -2
+
+    def test_power(self):
+        """
+        Verifica exponentes enteros y decimales.
+        """
+        assert Calculator.power(Decimal(2), Decimal(10)) == 1024
+        assert Calculator.power(Decimal(-2), Decimal(3)) == -8
+        base, exponent = Decimal("123.456"), Decimal("2.5")
+        assert_close(transcendental.power(base, exponent, HIGH),
+                     reference(HIGH).power(base, exponent), HIGH)
+
+    def test_trigonometry(self):
+        """
+        Verifica valores conocidos y la identidad sin² + cos² = 1.
+        """
+        precision = HIGH
+        context = Context(prec=precision)
+        sixth = context.divide(transcendental.pi(precision + 10), 6)
+        assert_close(transcendental.sin(sixth, precision), Decimal("0.5"),
+                     precision)
+        assert_close(transcendental.tan(
+            context.divide(transcendental.pi(precision + 10), 4),
+            precision), Decimal(1), precision)
+        for value in (Decimal("355"), Decimal("-3.7"), Decimal("1E+20")):
+            sine = transcendental.sin(value, precision)
+            cosine = transcendental.cos(value, precision)
+            identity = context.fma(sine, sine, context.multiply(cosine,
+                                                                cosine))
+            assert abs(identity - 1) <= Decimal(10) ** (2 - precision)
+
+    def test_near_multiple_of_pi(self):
+        """
+        Verifica que sin(355) conserva sus dígitos aunque 355 esté cerca de
+        113·pi.
+        """
+        low = transcendental.sin(Decimal(355), 28)
+        high = transcendental.sin(Decimal(355), 60)
+        assert low == Context(prec=28).plus(high)
+
+    def test_domain_errors(self):
+        """
+        Verifica los errores fuera del dominio de cada función.
+        """
+        with pytest.raises(ValueError, match="raíz cuadrada"):
+            Calculator.sqrt(Decimal(-4))
+        with pytest.raises(ValueError, match="logaritmo"):
+            Calculator.ln(Decimal(0))
+        with pytest.raises(ValueError, match="base negativa"):
+            Calculator.power(Decimal(-8), Decimal("0.5"))
+        with pytest.raises(ZeroDivisionError):
+            Calculator.power(Decimal(0), Decimal(-1))
+        with pytest.raises(ValueError, match="finito"):
+            Calculator.sin(Decimal("Infinity"))